@@ -0,0 +1,126 @@
+import numpy as np
+import pandas as pd
+
+
+def make_dataset(n_rows: int = 100_000,
+                 n_continuous: int = 20,
+                 n_categorical: int = 5,
+                 missing_rate: float = 0.05,
+                 cardinality: int = 10,
+                 outlier_rate: float = 0.01,
+                 duplicate_rate: float = 0.0,
+                 seed: int = 0):
+  """Ölçüm için yapay bir veri seti üretir. Aynı parametreler ve seed ile
+  her zaman aynı veri seti elde edilir.
+
+  Sütunlar:
+    * c_0 ... c_{n_continuous-1} : sürekli değişkenler (float64)
+    * k_0 ... k_{n_categorical-1} : kategorik değişkenler (metin)
+    * target : sürekli hedef değişken
+    * target_class : kategorik hedef değişken (0/1)
+
+  Parameters
+  ----------
+  n_rows : int
+      satır sayısı
+  n_continuous : int
+      sürekli değişken sayısı
+  n_categorical : int
+      kategorik değişken sayısı
+  missing_rate : float
+      hedefler dışındaki hücrelerde kayıp değer oranı
+  cardinality : int
+      kategorik değişkenlerin sınıf sayısı
+  outlier_rate : float
+      sürekli değişkenlerde aykırı değer oranı
+  duplicate_rate : float
+      diğer satırların kopyası olan satır oranı
+  seed : int
+      rastgele sayı üreticisi tohumu
+
+  Returns
+  -------
+  pd.core.frame.DataFrame
+      üretilen veri seti
+  """
+
+  rng = np.random.default_rng(seed)
+
+  continuous = rng.normal(size=(n_rows, n_continuous))
+
+  outliers = rng.random(size=continuous.shape) < outlier_rate
+  continuous[outliers] *= rng.uniform(5, 20, size=outliers.sum())
+
+  # kategoriler Zipf benzeri dağılır, böylece seyrek sınıflar da oluşur
+  weights = 1 / np.arange(1, cardinality + 1)
+  codes = rng.choice(cardinality, size=(n_rows, n_categorical), p=weights / weights.sum())
+
+  df = pd.DataFrame(continuous, columns=[f"c_{i}" for i in range(n_continuous)])
+
+  for j in range(n_categorical):
+    labels = np.array([f"k{j}_{code}" for code in range(cardinality)], dtype=object)
+    df[f"k_{j}"] = labels[codes[:, j]]
+
+  signal = continuous[:, :min(3, n_continuous)].sum(axis=1)
+
+  if n_categorical:
+    signal = signal + codes[:, 0] * 0.5
+
+  df["target"] = signal + rng.normal(size=n_rows)
+  df["target_class"] = (df["target"] > np.median(df["target"])).astype(np.int64)
+
+  features = [column for column in df.columns if column not in ("target", "target_class")]
+
+  for column in features:
+    missing = rng.random(n_rows) < missing_rate
+    df.loc[missing, column] = np.nan
+
+  n_duplicates = int(n_rows * duplicate_rate)
+
+  if n_duplicates:
+    source = rng.choice(n_rows, size=n_duplicates)
+    target = rng.choice(n_rows, size=n_duplicates, replace=False)
+    df.iloc[target] = df.iloc[source].to_numpy()
+
+  return df
+
+
+def make_dates(n_rows: int = 100_000, missing_rate: float = 0.05, seed: int = 0):
+  """Ölçüm için "%Y-%m-%d %H:%M" biçiminde tarih metinleri üretir
+  (datetime_features gibi tarih çözümleyen metodlar için). Değerler iki
+  yıla ve saat başlarına dağılır, böylece gerçek verilerdeki gibi tekrar
+  ederler.
+
+  Returns
+  -------
+  pd.core.series.Series
+      tarih metinleri; kayıp değerler None
+  """
+
+  rng = np.random.default_rng(seed)
+
+  hours = rng.integers(0, 2 * 365 * 24, size=n_rows)
+
+  dates = (np.datetime64("2020-01-01T00:00") + hours.astype("timedelta64[h]")).astype("datetime64[m]")
+
+  dates = pd.Series(np.datetime_as_string(dates).astype(object)).str.replace("T", " ", regex=False)
+
+  dates[rng.random(n_rows) < missing_rate] = None
+
+  return dates
+
+
+def train_test_split(df: pd.core.frame.DataFrame = None, test_size: float = 0.25, seed: int = 0):
+  """Veri setini rastgele eğitim ve test kümelerine ayırır.
+
+  Returns
+  -------
+  tuple
+      (df_train, df_test)
+  """
+
+  rng = np.random.default_rng(seed)
+
+  is_test = rng.random(len(df)) < test_size
+
+  return df.loc[~is_test].reset_index(drop=True), df.loc[is_test].reset_index(drop=True)
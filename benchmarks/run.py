@@ -0,0 +1,443 @@
+"""
+helpers sınıflarının herkese açık metodları için süre ve bellek ölçümü.
+
+Kullanım (depo kök dizininden):
+
+  python -m benchmarks.run --rows 100000 --continuous 20 --label v1
+  python -m benchmarks.run --rows 1000000 --only "FeatureSelection" --label v2
+  python -m benchmarks.run --compare benchmarks/results/v1.json benchmarks/results/v2.json
+
+Sonuçlar benchmarks/results/<label>.json dosyasına yazılır. Hata veren
+durumlar sonuç dosyasında "errors" altında listelenir ve çıkış kodu 1 olur;
+karşılaştırmada yeni ölçümde hata veren durumlar gerileme sayılır.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import platform
+import re
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+from benchmarks.datagen import make_dataset, make_dates, train_test_split
+from helpers.aio import AsyncExecutor, awaitable
+from helpers.clean_eda import ProfillingReport as CleanProfillingReport
+from helpers.columnstore import csv_to_column_store, load_column_store, save_column_store
+from helpers.datacleaning import DataCleaning
+from helpers.eda import ProfillingReport
+from helpers.featurecreation import FeatureCreation
+from helpers.featureselection import FeatureSelection
+from helpers.memo import clear_cache
+
+
+RESULTS_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+
+def _cleaning(data):
+  return DataCleaning(data["train"], data["test"])
+
+
+def _numeric_cleaning(data):
+  return DataCleaning(data["train"][data["numeric"]], data["test"][data["numeric"]])
+
+
+def _report(data):
+  return ProfillingReport(data["df"], data["continuous"], data["categorical"], data["targets"])
+
+
+def _numeric_report(data):
+  return ProfillingReport(data["df"][data["numeric"]].fillna(0), data["continuous"], [], data["targets"])
+
+
+def _clean_report(data):
+  return CleanProfillingReport(data["df"], data["continuous"], data["categorical"], data["targets"])
+
+
+def _clean_numeric_report(data):
+  return CleanProfillingReport(data["df"][data["numeric"]].fillna(0), data["continuous"], [], data["targets"])
+
+
+def _chunks(data, chunk_size=20000):
+  return (data["df"].iloc[start:start + chunk_size] for start in range(0, len(data["df"]), chunk_size))
+
+
+def _snapshot(data):
+  return _report(data).snapshot()
+
+
+def _none(data):
+  return None
+
+
+def _selection(data):
+  return FeatureSelection(data["df"], data["continuous"], data["categorical"], "target")
+
+
+def _class_selection(data):
+  return FeatureSelection(data["df"], data["continuous"], data["categorical"], "target_class")
+
+
+def _creation(data):
+  return FeatureCreation(data["df"], "target")
+
+
+def _dated_creation(data):
+  return FeatureCreation(data["df"].assign(date=data["dates"]), "target")
+
+
+def _typed_dated_creation(data):
+  return FeatureCreation(data["df"].assign(date=pd.to_datetime(data["dates"], format="%Y-%m-%d %H:%M")), "target")
+
+
+def _sparse_creation(data):
+  creation = _creation(data)
+  for feature in data["categorical"]:
+    creation.fit_sparse_classes(feature, min_frequency=0.1)
+  return creation
+
+
+def _threshold_creation(data):
+  creation = _creation(data)
+  for feature in data["continuous"]:
+    creation.fit_threshold_rule(feature, [-1.0, 0.0, 1.0], ["low", "mid_low", "mid_high", "high"])
+  return creation
+
+
+def _detected_cleaning(data):
+  cleaning = _cleaning(data)
+  for feature in data["continuous"]:
+    cleaning.outlier_detection(feature=feature)
+  return cleaning
+
+
+# (ad, kurulum, ölçülen çağrı, yavaş mı). Kurulum süresi ölçüme dahil edilmez.
+CASES = [
+  ("DataCleaning.show_duplicate_observations", _cleaning, lambda o, d: o.show_duplicate_observations(), False),
+  ("DataCleaning.remove_duplicate_observations", _cleaning, lambda o, d: o.remove_duplicate_observations(), False),
+  ("DataCleaning.show_missing_values", _cleaning, lambda o, d: o.show_missing_values(), False),
+  ("DataCleaning.missingness_patterns", _cleaning, lambda o, d: o.missingness_patterns(), False),
+  ("DataCleaning.missing_values_treatment[delete]", _cleaning, lambda o, d: o.missing_values_treatment(d["continuous"][0], "delete"), False),
+  ("DataCleaning.missing_values_treatment[mean]", _cleaning, lambda o, d: o.missing_values_treatment(d["continuous"][0], "mean"), False),
+  ("DataCleaning.missing_values_treatment[median]", _cleaning, lambda o, d: o.missing_values_treatment(d["continuous"][0], "median"), False),
+  ("DataCleaning.missing_values_treatment[mode]", _cleaning, lambda o, d: o.missing_values_treatment(d["categorical"][0], "mode"), False),
+  ("DataCleaning.missing_values_treatment[mode, all categorical]", _cleaning, lambda o, d: o.missing_values_treatment(d["categorical"], "mode", verbose=False), False),
+  ("DataCleaning.group_missing_values_treatment", _cleaning, lambda o, d: o.group_missing_values_treatment(d["continuous"], d["categorical"][0], verbose=False), False),
+  ("DataCleaning.missing_values_treatment[KNN]", _numeric_cleaning, lambda o, d: o.missing_values_treatment(strategy="KNN"), True),
+  ("DataCleaning.model_missing_values_treatment", _numeric_cleaning, lambda o, d: o.model_missing_values_treatment(max_iter=3, max_samples=20000, verbose=False), True),
+  ("DataCleaning.outlier_detection[inter_quartile_range]", _cleaning, lambda o, d: o.outlier_detection(d["continuous"][0]), False),
+  ("DataCleaning.outlier_detection[isolation_forest]", _numeric_cleaning, lambda o, d: o.outlier_detection(d["continuous"][0], "isolation_forest"), True),
+  ("DataCleaning.outlier_treatment[cut_off]", _detected_cleaning, lambda o, d: o.outlier_treatment(strategy="cut_off"), False),
+  ("DataCleaning.outlier_treatment[median]", _detected_cleaning, lambda o, d: o.outlier_treatment(strategy="median"), False),
+  ("DataCleaning.data_drift", _cleaning, lambda o, d: o.data_drift(), False),
+  ("DataCleaning.from_arrow", _none, lambda o, d: DataCleaning.from_arrow(d["files"]["train"], d["files"]["test"]), False),
+  ("ProfillingReport.data_types", _report, lambda o, d: o.data_types(), False),
+  ("ProfillingReport.missing_cell_count", _report, lambda o, d: o.missing_cell_count(), False),
+  ("ProfillingReport.duplicate_row_count", _report, lambda o, d: o.duplicate_row_count(), False),
+  ("ProfillingReport.visualize_distribution", _report, lambda o, d: o.visualize_distribution(), True),
+  ("ProfillingReport.dispersion_measures_of_a_feature", _report, lambda o, d: o.dispersion_measures_of_a_feature(d["continuous"][0]), False),
+  ("ProfillingReport.central_tendency_measures_of_a_feature", _report, lambda o, d: o.central_tendency_measures_of_a_feature(d["continuous"][0]), False),
+  ("ProfillingReport.covariance_matrix", _report, lambda o, d: o.covariance_matrix(), False),
+  ("ProfillingReport.correlation_analysis", _report, lambda o, d: o.correlation_analysis(), False),
+  ("ProfillingReport.principal_component_analysis_2d", _numeric_report, lambda o, d: o.principal_component_analysis_2d(), False),
+  ("ProfillingReport.sampled_statistics", _report, lambda o, d: o.sampled_statistics(), False),
+  ("ProfillingReport.progressive_profile", _report, lambda o, d: o.progressive_profile(chunk_size=20000), False),
+  ("ProfillingReport.jointplot", _report, lambda o, d: o.jointplot(d["continuous"][0], d["continuous"][1]), True),
+  ("ProfillingReport.snapshot", _report, lambda o, d: o.snapshot(), False),
+  ("ProfillingReport.snapshot[update]", _snapshot, lambda o, d: _report(d).snapshot(o), False),
+  ("ProfillingReport.from_chunks", _none, lambda o, d: ProfillingReport.from_chunks(_chunks(d), d["continuous"], d["categorical"], d["targets"], sample_size=10000), False),
+  ("ProfillingReport.from_arrow", _none, lambda o, d: ProfillingReport.from_arrow(d["files"]["df"], d["continuous"], d["categorical"], d["targets"]), False),
+  ("clean_eda.ProfillingReport.understand_variable_types", _clean_report, lambda o, d: o.understand_variable_types(), False),
+  ("clean_eda.ProfillingReport.cardinality_profile", _clean_report, lambda o, d: o.cardinality_profile(), False),
+  ("clean_eda.ProfillingReport.general_data_statistics", _clean_report, lambda o, d: o.general_data_statistics(), True),
+  ("clean_eda.ProfillingReport.data_types", _clean_report, lambda o, d: o.data_types(), False),
+  ("clean_eda.ProfillingReport.missing_cell_count", _clean_report, lambda o, d: o.missing_cell_count(), False),
+  ("clean_eda.ProfillingReport.duplicate_row_count", _clean_report, lambda o, d: o.duplicate_row_count(), False),
+  ("clean_eda.ProfillingReport.visualize_distribution", _clean_report, lambda o, d: o.visualize_distribution(), True),
+  ("clean_eda.ProfillingReport.dispersion_measures_of_a_feature", _clean_report, lambda o, d: o.dispersion_measures_of_a_feature(d["continuous"][0]), False),
+  ("clean_eda.ProfillingReport.central_tendency_measures_of_a_feature", _clean_report, lambda o, d: o.central_tendency_measures_of_a_feature(d["continuous"][0]), False),
+  ("clean_eda.ProfillingReport.covariance_matrix", _clean_report, lambda o, d: o.covariance_matrix(), False),
+  ("clean_eda.ProfillingReport.correlation_analysis", _clean_report, lambda o, d: o.correlation_analysis(), False),
+  ("clean_eda.ProfillingReport.principal_component_analysis_2d", _clean_numeric_report, lambda o, d: o.principal_component_analysis_2d(np.array([])), False),
+  ("clean_eda.ProfillingReport.hierarchical_clustering", _clean_numeric_report, lambda o, d: o.hierarchical_clustering(), True),
+  ("clean_eda.ProfillingReport.interaction_plot", _clean_report, lambda o, d: o.interaction_plot(d["continuous"][0], d["continuous"][1]), True),
+  ("clean_eda.ProfillingReport.sampled_statistics", _clean_report, lambda o, d: o.sampled_statistics(), False),
+  ("clean_eda.ProfillingReport.progressive_profile", _clean_report, lambda o, d: o.progressive_profile(chunk_size=20000), False),
+  ("clean_eda.ProfillingReport.snapshot", _clean_report, lambda o, d: o.snapshot(), False),
+  ("clean_eda.ProfillingReport.from_chunks", _none, lambda o, d: CleanProfillingReport.from_chunks(_chunks(d), d["continuous"], d["categorical"], d["targets"], sample_size=10000), False),
+  ("clean_eda.ProfillingReport.from_arrow", _none, lambda o, d: CleanProfillingReport.from_arrow(d["files"]["df"], d["continuous"], d["categorical"], d["targets"]), False),
+  ("FeatureSelection.correlation", _selection, lambda o, d: o.correlation(), False),
+  ("FeatureSelection.ANOVA_test", _selection, lambda o, d: o.ANOVA_test(d["categorical"][0]), False),
+  ("FeatureSelection.chi2_contingency", _class_selection, lambda o, d: o.chi2_contingency(d["categorical"][0]), False),
+  ("FeatureSelection.redundant_features", _selection, lambda o, d: o.redundant_features(), False),
+  ("FeatureSelection.mutual_information", _selection, lambda o, d: o.mutual_information(), False),
+  ("FeatureSelection.screen[anova]", _selection, lambda o, d: o.screen(test="anova"), False),
+  ("FeatureSelection.screen[chi2]", _class_selection, lambda o, d: o.screen(test="chi2"), False),
+  ("FeatureSelection.from_arrow+correlation", _none, lambda o, d: FeatureSelection.from_arrow(d["files"]["df"], d["continuous"], d["categorical"], "target").correlation(), False),
+  ("aio.AsyncExecutor.map[ANOVA_test]", _selection, lambda o, d: asyncio.run(_async_map(o, d)), False),
+  ("aio.awaitable.correlation", _selection, lambda o, d: asyncio.run(awaitable(o).correlation()), False),
+  ("FeatureCreation.interaction_features", _creation, lambda o, d: o.interaction_features(d["continuous"]), False),
+  ("FeatureCreation.conjunctive_features", _creation, lambda o, d: o.conjunctive_features(d["continuous"]), False),
+  ("FeatureCreation.datetime_features[text]", _dated_creation, lambda o, d: o.datetime_features("date"), False),
+  ("FeatureCreation.datetime_features[datetime64]", _typed_dated_creation, lambda o, d: o.datetime_features("date"), False),
+  ("FeatureCreation.fit_sparse_classes", _creation, lambda o, d: [o.fit_sparse_classes(feature, min_frequency=0.1) for feature in d["categorical"]], False),
+  ("FeatureCreation.representation_features", _sparse_creation, lambda o, d: o.representation_features(), False),
+  ("FeatureCreation.fit_threshold_rule", _creation, lambda o, d: [o.fit_threshold_rule(feature, [1.0, -1.0, 0.0]) for feature in d["continuous"]], False),
+  ("FeatureCreation.indicator_features", _threshold_creation, lambda o, d: o.indicator_features(), False),
+  ("columnstore.save_column_store", _none, lambda o, d: save_column_store(d["df"], os.path.join(d["files"]["directory"], "saved")), False),
+  ("columnstore.csv_to_column_store", _none, lambda o, d: csv_to_column_store(d["files"]["csv"], os.path.join(d["files"]["directory"], "converted"), chunksize=20000), False),
+  ("columnstore.load_column_store", _none, lambda o, d: load_column_store(d["files"]["store"]).sum(numeric_only=True), False),
+]
+
+
+async def _async_map(selection, data):
+  async with AsyncExecutor("thread") as executor:
+    return await executor.map(selection.ANOVA_test, data["categorical"])
+
+
+def _write_files(data, directory):
+  """from_arrow ve sütun deposu durumlarının okuyacağı dosyaları bir kez yazar."""
+
+  files = {"directory": directory}
+
+  for name in ("df", "train", "test"):
+    files[name] = os.path.join(directory, f"{name}.parquet")
+    data[name].to_parquet(files[name])
+
+  files["csv"] = os.path.join(directory, "df.csv")
+  data["df"].to_csv(files["csv"], index=False)
+
+  files["store"] = os.path.join(directory, "store")
+  save_column_store(data["df"], files["store"])
+
+  return files
+
+
+def _measure(setup, call, data, repeat):
+  """Bir çağrının en iyi süresini ve (ayrı bir çalıştırmada) tepe bellek
+  kullanımını ölçer. Metodların print çıktıları bastırılır. Her ölçümden
+  önce sonuç önbelleği boşaltılır, böylece ilk çağrının maliyeti ölçülür.
+  """
+
+  seconds = []
+
+  with contextlib.redirect_stdout(io.StringIO()):
+
+    for _ in range(repeat):
+      target = setup(data)
+      clear_cache()
+      start = time.perf_counter()
+      call(target, data)
+      seconds.append(time.perf_counter() - start)
+      plt.close("all")
+
+    target = setup(data)
+    clear_cache()
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    call(target, data)
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    plt.close("all")
+
+  return {"seconds": min(seconds), "seconds_all": seconds, "peak_bytes": peak_bytes}
+
+
+def _git_revision():
+
+  try:
+    return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"],
+                                   stderr=subprocess.DEVNULL, text=True).strip()
+  except (OSError, subprocess.CalledProcessError):
+    return None
+
+
+def run(rows, continuous, categorical, missing_rate, cardinality, outlier_rate,
+        duplicate_rate, seed, repeat, only=None, skip=None, include_slow=False):
+  """Seçilen ölçüm durumlarını çalıştırır ve sonuçları sözlük olarak dönderir."""
+
+  df = make_dataset(rows, continuous, categorical, missing_rate, cardinality,
+                    outlier_rate, duplicate_rate, seed)
+  train, test = train_test_split(df, seed=seed)
+
+  continuous_variables = [column for column in df.columns if column.startswith("c_")]
+  categorical_variables = [column for column in df.columns if column.startswith("k_")]
+
+  data = {
+    "df": df,
+    "train": train,
+    "test": test,
+    "continuous": continuous_variables,
+    "categorical": categorical_variables,
+    "targets": ["target", "target_class"],
+    "numeric": continuous_variables + ["target", "target_class"],
+    "dates": make_dates(rows, missing_rate, seed),
+  }
+
+  parameters = {"rows": rows, "continuous": continuous, "categorical": categorical,
+                "missing_rate": missing_rate, "cardinality": cardinality,
+                "outlier_rate": outlier_rate, "duplicate_rate": duplicate_rate,
+                "seed": seed, "repeat": repeat}
+
+  results = {}
+
+  with tempfile.TemporaryDirectory(prefix="helpers-benchmark-") as directory:
+
+    data["files"] = _write_files(data, directory)
+
+    for name, setup, call, slow in CASES:
+
+      if slow and not include_slow:
+        continue
+      if only and not re.search(only, name):
+        continue
+      if skip and re.search(skip, name):
+        continue
+
+      try:
+        results[name] = _measure(setup, call, data, repeat)
+      except Exception as error:  # bir durumun hatası diğer ölçümleri durdurmasın
+        results[name] = {"error": f"{type(error).__name__}: {error}"}
+
+      result = results[name]
+      if "error" in result:
+        print(f"{name:<65} HATA {result['error']}")
+      else:
+        print(f"{name:<65} {result['seconds']:>10.4f} s {result['peak_bytes'] / 2**20:>10.1f} MiB")
+
+  errors = sorted(name for name, result in results.items() if "error" in result)
+
+  if errors:
+    print(f"\n{len(errors)} durum hata verdi: {', '.join(errors)}")
+
+  return {
+    "meta": {
+      "revision": _git_revision(),
+      "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+      "python": platform.python_version(),
+      "numpy": np.__version__,
+      "pandas": pd.__version__,
+      "machine": platform.machine(),
+      "cpu_count": os.cpu_count(),
+    },
+    "parameters": parameters,
+    "errors": errors,
+    "results": results,
+  }
+
+
+def compare(baseline_path, candidate_path, threshold=0.10):
+  """İki sonuç dosyasını karşılaştırır. Süresi ya da tepe belleği threshold
+  oranından fazla artan durumlar ile önceki ölçümde çalışıp yenisinde hata
+  veren durumlar gerileme olarak işaretlenir. Yalnızca bir dosyada bulunan
+  durumlar ayrıca listelenir.
+
+  Returns
+  -------
+  list
+      gerileyen durumların isimleri
+  """
+
+  with open(baseline_path) as file:
+    baseline = json.load(file)
+  with open(candidate_path) as file:
+    candidate = json.load(file)
+
+  if baseline["parameters"] != candidate["parameters"]:
+    print("UYARI: iki ölçüm farklı parametrelerle alınmış, karşılaştırma yanıltıcı olabilir.")
+
+  regressions = []
+
+  print(f"{'durum':<65} {'süre oranı':>12} {'bellek oranı':>14}")
+
+  for name in sorted(set(baseline["results"]) & set(candidate["results"])):
+
+    old, new = baseline["results"][name], candidate["results"][name]
+
+    if "error" in new:
+      if "error" not in old:
+        regressions.append(name)
+      note = "  GERİLEME (yeni hata)" if "error" not in old else "  (iki ölçümde de hata)"
+      print(f"{name:<65} {'-':>12} {'-':>14}{note}: {new['error']}")
+      continue
+
+    if "error" in old:
+      print(f"{name:<65} {'-':>12} {'-':>14}  (önceki ölçümdeki hata giderilmiş)")
+      continue
+
+    time_ratio = new["seconds"] / old["seconds"] if old["seconds"] else float("inf")
+    memory_ratio = new["peak_bytes"] / old["peak_bytes"] if old["peak_bytes"] else float("inf")
+
+    regressed = time_ratio > 1 + threshold or memory_ratio > 1 + threshold
+    if regressed:
+      regressions.append(name)
+
+    print(f"{name:<65} {time_ratio:>12.2f} {memory_ratio:>14.2f}{'  GERİLEME' if regressed else ''}")
+
+  only_baseline = sorted(set(baseline["results"]) - set(candidate["results"]))
+  only_candidate = sorted(set(candidate["results"]) - set(baseline["results"]))
+
+  if only_baseline:
+    print(f"\nYalnızca {baseline_path} içinde: {', '.join(only_baseline)}")
+  if only_candidate:
+    print(f"\nYalnızca {candidate_path} içinde: {', '.join(only_candidate)}")
+
+  return regressions
+
+
+def main(argv=None):
+
+  parser = argparse.ArgumentParser(description="helpers sınıfları için süre ve bellek ölçümü")
+  parser.add_argument("--rows", type=int, default=100_000)
+  parser.add_argument("--continuous", type=int, default=20)
+  parser.add_argument("--categorical", type=int, default=5)
+  parser.add_argument("--missing-rate", type=float, default=0.05)
+  parser.add_argument("--cardinality", type=int, default=10)
+  parser.add_argument("--outlier-rate", type=float, default=0.01)
+  parser.add_argument("--duplicate-rate", type=float, default=0.01)
+  parser.add_argument("--seed", type=int, default=0)
+  parser.add_argument("--repeat", type=int, default=3)
+  parser.add_argument("--only", help="yalnızca adı bu düzenli ifadeye uyan durumlar")
+  parser.add_argument("--skip", help="adı bu düzenli ifadeye uyan durumlar atlanır")
+  parser.add_argument("--include-slow", action="store_true", help="KNN, izolasyon ormanı ve grafik yoğun durumları da çalıştırır")
+  parser.add_argument("--label", help="sonuç dosyasının adı (benchmarks/results/<label>.json)")
+  parser.add_argument("--compare", nargs=2, metavar=("BASELINE", "CANDIDATE"))
+  parser.add_argument("--threshold", type=float, default=0.10)
+  args = parser.parse_args(argv)
+
+  if args.compare:
+    return 1 if compare(*args.compare, threshold=args.threshold) else 0
+
+  output = run(args.rows, args.continuous, args.categorical, args.missing_rate,
+               args.cardinality, args.outlier_rate, args.duplicate_rate, args.seed,
+               args.repeat, args.only, args.skip, args.include_slow)
+
+  label = args.label or output["meta"]["revision"] or time.strftime("%Y%m%d%H%M%S")
+
+  os.makedirs(RESULTS_DIRECTORY, exist_ok=True)
+  path = os.path.join(RESULTS_DIRECTORY, f"{label}.json")
+
+  with open(path, "w") as file:
+    json.dump(output, file, indent=2)
+
+  print(f"\nSonuçlar: {path}")
+
+  return 1 if output["errors"] else 0
+
+
+if __name__ == "__main__":
+  sys.exit(main())
@@ -0,0 +1,222 @@
+"""
+asyncio uygulamalarında (ör. web servisleri) helpers sınıflarının olay
+döngüsünü (event loop) bloklamadan kullanılması.
+
+helpers sınıflarındaki metotlar eşzamanlı (senkron) ve işlemci yoğundur.
+AsyncExecutor bu metotları yönetilen bir iş parçacığı (thread) ya da süreç
+(process) havuzunda çalıştırır ve beklenebilir (awaitable) olarak dönderir:
+
+  async with AsyncExecutor("thread", max_workers=4) as executor:
+
+    selection = executor.wrap(FeatureSelection(df, cont, cat, "target"))
+
+    # tüm kategorik değişkenler için ANOVA testleri aynı anda çalışır
+    results = await executor.map(selection.ANOVA_test, cat, timeout=30)
+
+    # tek bir çağrı, zaman aşımı ile
+    await selection.correlation(0.5, timeout=10)
+
+Notlar:
+  * Zaman aşımı ya da iptal durumunda henüz başlamamış işler havuzdan
+    çıkarılır. Başlamış bir iş Python'da dışarıdan durdurulamaz; sonucu
+    beklenmez ve iş arka planda tamamlanır.
+  * "process" havuzunda nesne çağrı başına kopyalanarak (pickle) işçiye
+    gönderilir. Yalnızca dönen değer geri gelir; nesnede yapılan
+    değişiklikler (ör. DataCleaning'in veri üzerinde yaptığı işlemler)
+    çağırana yansımaz. Bu nedenle durumu değiştiren metotlar "thread"
+    havuzuyla çalıştırılmalıdır.
+  * Grafik çizen metotlar ana iş parçacığı dışında çalışacağı için
+    lazy.set_headless() ile birlikte kullanılmalıdır.
+"""
+
+import asyncio
+import concurrent.futures
+import functools
+import inspect
+
+
+def _call_method(obj, name, args, kwargs):
+  """Süreç havuzunda bir nesnenin metodunu çağırır (pickle edilebilir)."""
+
+  return getattr(obj, name)(*args, **kwargs)
+
+
+class AsyncExecutor:
+  """
+  helpers metotlarını iş parçacığı ya da süreç havuzunda çalıştıran,
+  beklenebilir sonuçlar dönderen yürütücü
+
+  """
+
+  def __init__(self, kind: str = "thread", max_workers: int = None):
+    """
+    Parameters
+    ----------
+    kind : str
+        "thread" ya da "process"
+    max_workers : int
+        havuzdaki en fazla işçi sayısı. Verilmezse concurrent.futures
+        varsayılanı kullanılır.
+    """
+
+    assert kind in ("thread", "process"), "kind değeri thread ya da process olmalıdır."
+
+    self.kind = kind
+
+    self.max_workers = max_workers
+
+    self.__pool = None
+
+  def __get_pool(self):
+
+    if self.__pool is None:
+      if self.kind == "thread":
+        self.__pool = concurrent.futures.ThreadPoolExecutor(self.max_workers, thread_name_prefix="helpers")
+      else:
+        self.__pool = concurrent.futures.ProcessPoolExecutor(self.max_workers)
+
+    return self.__pool
+
+  async def run(self, function=None, *args, timeout: float = None, **kwargs):
+    """Bir fonksiyonu havuzda çalıştırır ve sonucunu bekler.
+
+    Parameters
+    ----------
+    function : callable
+        çalıştırılacak fonksiyon ya da metot
+    timeout : float
+        saniye cinsinden zaman aşımı. Aşılırsa asyncio.TimeoutError
+        (Python 3.11+ : TimeoutError) yükseltilir.
+    args, kwargs
+        fonksiyona aktarılacak parametreler
+
+    Returns
+    -------
+    fonksiyonun dönderdiği değer
+    """
+
+    # yerleşik fonksiyonların __self__'i modüldür; yalnızca gerçek metotlar nesne ve isimle gönderilir
+    if self.kind == "process" and inspect.ismethod(function):
+      future = self.__get_pool().submit(_call_method, function.__self__, function.__name__, args, kwargs)
+    else:
+      future = self.__get_pool().submit(functools.partial(function, *args, **kwargs))
+
+    # wrap_future, beklemenin iptalini havuzdaki işe (henüz başlamadıysa) aktarır
+    return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+
+  async def map(self, function=None, iterable=None, timeout: float = None, return_exceptions: bool = False):
+    """Bir fonksiyonu her eleman için aynı anda çalıştırır.
+
+    Parameters
+    ----------
+    function : callable
+        her eleman ile çağrılacak fonksiyon ya da metot
+    iterable : iterable
+        elemanlar
+    timeout : float
+        tüm çağrılar için toplam zaman aşımı (saniye). Aşılırsa bitmemiş
+        çağrılar iptal edilir.
+    return_exceptions : bool
+        True ise hata veren çağrıların hataları sonuç listesinde dönderilir.
+
+    Returns
+    -------
+    list
+        elemanlarla aynı sırada sonuçlar
+    """
+
+    calls = asyncio.gather(*(self.run(function, item) for item in iterable), return_exceptions=return_exceptions)
+
+    return await asyncio.wait_for(calls, timeout)
+
+  def wrap(self, obj=None):
+    """Bir nesnenin tüm metotlarını bu havuzda çalışan beklenebilir
+    metotlar olarak sunan bir vekil dönderir. Vekilin metotları ek olarak
+    timeout parametresi alır.
+
+    Returns
+    -------
+    AsyncProxy
+    """
+
+    return AsyncProxy(obj, self)
+
+  def shutdown(self, wait: bool = True):
+    """Havuzu kapatır; bekleyen (başlamamış) işleri iptal eder."""
+
+    if self.__pool is not None:
+      self.__pool.shutdown(wait=wait, cancel_futures=True)
+      self.__pool = None
+
+  async def __aenter__(self):
+
+    return self
+
+  async def __aexit__(self, *exc_info):
+
+    self.shutdown(wait=False)
+
+
+class AsyncProxy:
+  """
+  Bir nesnenin metotlarını AsyncExecutor üzerinden beklenebilir olarak
+  çağıran vekil
+
+  """
+
+  def __init__(self, obj=None, executor: AsyncExecutor = None):
+
+    self.obj = obj
+
+    self.executor = executor
+
+  def __getattr__(self, name):
+
+    attribute = getattr(self.obj, name)
+
+    if not callable(attribute):
+      return attribute
+
+    async def method(*args, timeout: float = None, **kwargs):
+      return await self.executor.run(attribute, *args, timeout=timeout, **kwargs)
+
+    method.__name__ = name
+    method.__doc__ = attribute.__doc__
+
+    return method
+
+
+_default_executor = None
+
+
+def get_executor():
+  """Paylaşılan varsayılan (iş parçacığı havuzlu) yürütücüyü dönderir."""
+
+  global _default_executor
+
+  if _default_executor is None:
+    _default_executor = AsyncExecutor("thread")
+
+  return _default_executor
+
+
+async def run_async(function=None, *args, timeout: float = None, **kwargs):
+  """Bir fonksiyonu paylaşılan iş parçacığı havuzunda çalıştırır.
+
+  Returns
+  -------
+  fonksiyonun dönderdiği değer
+  """
+
+  return await get_executor().run(function, *args, timeout=timeout, **kwargs)
+
+
+def awaitable(obj=None):
+  """Bir nesneyi paylaşılan havuzda çalışan beklenebilir bir vekile sarar.
+
+  Returns
+  -------
+  AsyncProxy
+  """
+
+  return get_executor().wrap(obj)
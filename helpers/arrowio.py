@@ -0,0 +1,161 @@
+"""
+Parquet / Arrow veri setlerinden sütun seçimli (projection) ve satır
+filtreli (predicate pushdown) okuma.
+
+pyarrow isteğe bağlı bir bağımlılıktır; yalnızca bu modüldeki fonksiyonlar
+çağrıldığında yüklenir.
+
+Filtreler pandas.read_parquet ile aynı biçimde verilir:
+
+  [("year", ">=", 2020), ("country", "in", ["TR", "DE"])]
+
+ya da VEYA ile bağlanmış VE grupları olarak:
+
+  [[("year", "=", 2020)], [("year", "=", 2021), ("month", "<", 6)]]
+"""
+
+import pandas as pd
+
+
+def _pyarrow_dataset():
+
+  try:
+    import pyarrow.dataset
+  except ImportError as error:
+    raise ImportError("Parquet/Arrow okuması için pyarrow kurulmalıdır : pip install pyarrow") from error
+
+  return pyarrow.dataset
+
+
+def _filter_expression(filters=None):
+
+  if filters is None or isinstance(filters, _pyarrow_dataset().Expression):
+    return filters
+
+  import pyarrow.parquet
+
+  return pyarrow.parquet.filters_to_expression(filters)
+
+
+def open_dataset(source=None, format: str = "parquet", partitioning: str = "hive"):
+  """Bir dosya/dizin yolunu, yol listesini, pyarrow.Table'ı ya da hazır
+  bir pyarrow.dataset.Dataset'i veri seti olarak açar. Veri okunmaz,
+  yalnızca şema ve dosya listesi çıkarılır. Dizinlerde "year=2021" gibi
+  (hive) bölümlemeler sütun olarak tanınır ve bu sütunlara verilen
+  filtreler ilgisiz dosyaların hiç açılmamasını sağlar.
+  """
+
+  dataset = _pyarrow_dataset()
+
+  if isinstance(source, dataset.Dataset):
+    return source
+
+  import pyarrow
+
+  if isinstance(source, (pyarrow.Table, pyarrow.RecordBatch)):
+    return dataset.dataset(source)
+
+  return dataset.dataset(source, format=format, partitioning=partitioning)
+
+
+def table_to_pandas(table=None):
+  """Bir pyarrow.Table'ı mümkün olan en az kopya ile pandas'a çevirir.
+  Kayıp değeri olmayan sayısal sütunlar NumPy'a kopyasız aktarılır; blok
+  birleştirme yapılmaz ve Arrow tamponları dönüştürme sırasında serbest
+  bırakılır.
+  """
+
+  return table.to_pandas(split_blocks=True, self_destruct=True)
+
+
+def read_frame(source=None, columns: list = None, filters=None):
+  """Bir Parquet/Arrow veri setinden yalnızca istenen sütunları, filtreye
+  uyan satırlarla birlikte okur.
+
+  Parameters
+  ----------
+  source : str, list, pyarrow.Table ya da pyarrow.dataset.Dataset
+      veri seti
+  columns : list
+      okunacak sütunlar. Verilmezse tüm sütunlar okunur.
+  filters : list ya da pyarrow.dataset.Expression
+      satır filtreleri (okuma sırasında uygulanır)
+
+  Returns
+  -------
+  pd.core.frame.DataFrame
+  """
+
+  table = open_dataset(source).to_table(columns=columns, filter=_filter_expression(filters))
+
+  return table_to_pandas(table)
+
+
+class ArrowFrame:
+  """
+  Parquet/Arrow veri seti üzerinde tembel (lazy) okunan bir Veri Çerçevesi
+
+  Sütunlar ilk ihtiyaç duyulduklarında, filtreler okuma sırasında
+  uygulanarak yüklenir ve saklanır. Böylece bir analiz yalnızca kullandığı
+  sütunların okunmasına neden olur.
+  """
+
+  def __init__(self, source=None, filters=None, columns: list = None):
+    """
+    Parameters
+    ----------
+    source : str, list, pyarrow.Table ya da pyarrow.dataset.Dataset
+        veri seti
+    filters : list ya da pyarrow.dataset.Expression
+        satır filtreleri
+    columns : list
+        kullanılacak sütunlar. Verilmezse veri setindeki tüm sütunlar.
+    """
+
+    self.dataset = open_dataset(source)
+
+    self.filters = _filter_expression(filters)
+
+    self.columns = pd.Index(columns if columns is not None else self.dataset.schema.names)
+
+    self.__loaded = None
+
+  def load(self, columns: list = None):
+    """İstenen sütunları Veri Çerçevesi olarak dönderir. Daha önce
+    okunmamış sütunlar tek bir okuma ile yüklenir.
+
+    Parameters
+    ----------
+    columns : list
+        sütunlar. Verilmezse tüm sütunlar.
+
+    Returns
+    -------
+    pd.core.frame.DataFrame
+    """
+
+    columns = list(self.columns) if columns is None else list(dict.fromkeys(columns))
+
+    missing = columns if self.__loaded is None else [column for column in columns if column not in self.__loaded.columns]
+
+    if missing:
+
+      table = self.dataset.to_table(columns=missing, filter=self.filters)
+      new_columns = table_to_pandas(table)
+
+      if self.__loaded is None:
+        self.__loaded = new_columns
+      else:
+        self.__loaded = pd.concat([self.__loaded, new_columns.set_axis(self.__loaded.index)], axis=1)
+
+    return self.__loaded.loc[:, columns]
+
+  def to_numpy(self, column: str = None):
+    """Bir sütunu NumPy dizisi olarak dönderir (mümkünse kopyasız)."""
+
+    return self.load([column])[column].to_numpy()
+
+  def to_pandas(self):
+    """Tüm sütunları Veri Çerçevesi olarak dönderir."""
+
+    return self.load()
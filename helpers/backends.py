@@ -0,0 +1,294 @@
+"""
+Sütun bazlı testlerin (ör. FeatureSelection.screen) işçilere dağıtılması
+için takılabilir yürütme arka uçları.
+
+Her arka uç aynı arayüzü sunar:
+
+  backend.map(function, chunks, arrays)
+
+arrays, tüm işlerin okuyacağı NumPy dizilerinden oluşan bir sözlüktür ve
+her işçiye bir kez aktarılır; function(arrays, chunk) her parça (chunk)
+için bir işçide çağrılır ve sonuçlar parçalarla aynı sırada dönderilir.
+
+  * SerialBackend  : aynı süreçte, sırayla çalışır.
+  * ProcessBackend : yerel süreç havuzu (varsayılan). Diziler paylaşımlı
+                     belleğe (multiprocessing.shared_memory) bir kez
+                     yazılır; işçiler kopyalamadan okur.
+  * DaskBackend    : dask.distributed istemcisi. Verilmezse paylaşılan
+                     yerel bir küme bir kez açılır. Diziler işçilere bir
+                     kez dağıtılır (scatter). dask isteğe bağlı bir
+                     bağımlılıktır.
+
+function ve dizilerin pickle edilebilir olması gerekir; bu nedenle
+function bir modülün en üst düzeyinde tanımlanmalıdır.
+
+Aynı dizilerle art arda birçok map çağrısı yapan yinelemeli algoritmalar
+(ör. modelimpute) open_session ile havuzu ve paylaşımlı belleği bir kez
+açar:
+
+  with open_session(backend, arrays) as session:
+    for _ in range(rounds):
+      session.arrays["values"][...] = ...   # işçiler güncel diziyi görür
+      results = session.map(function, chunks)
+"""
+
+import atexit
+import concurrent.futures
+import contextlib
+import os
+from multiprocessing import shared_memory
+
+import numpy as np
+
+
+class SerialBackend:
+  """
+  İşleri aynı süreçte sırayla çalıştıran arka uç
+
+  """
+
+  def map(self, function=None, chunks: list = None, arrays: dict = None):
+
+    return [function(arrays, chunk) for chunk in chunks]
+
+
+class _Session:
+  """
+  Her map çağrısında dizileri arka uca yeniden aktaran oturum (paylaşımlı
+  belleği olmayan arka uçlar için)
+
+  """
+
+  def __init__(self, backend=None, arrays: dict = None):
+
+    self.backend = backend
+
+    # yerinde güncellenebilen diziler; her map çağrısında güncel halleri aktarılır
+    self.arrays = arrays
+
+  def map(self, function=None, chunks: list = None):
+
+    return self.backend.map(function, chunks, self.arrays)
+
+
+class _SharedMemorySession:
+  """
+  Süreç havuzunu ve paylaşımlı bellek bloklarını map çağrıları arasında
+  açık tutan oturum
+
+  """
+
+  def __init__(self, pool=None, arrays: dict = None):
+
+    self.__pool = pool
+
+    # paylaşımlı bellek üzerindeki diziler; yerinde yapılan değişiklikleri
+    # işçiler sonraki map çağrısında görür
+    self.arrays = arrays
+
+  def map(self, function=None, chunks: list = None):
+
+    chunks = list(chunks)
+
+    return list(self.__pool.map(_run_attached, [function] * len(chunks), chunks))
+
+
+@contextlib.contextmanager
+def _shared_arrays(arrays: dict = None):
+  """Dizileri paylaşımlı belleğe kopyalar; (işçi tanımları, paylaşımlı
+  bellek üzerindeki diziler) verir ve çıkışta blokları siler.
+  """
+
+  blocks = []
+
+  try:
+
+    specs = {}
+    views = {}
+
+    for name, array in arrays.items():
+      order = "F" if array.flags.f_contiguous and not array.flags.c_contiguous else "C"
+      block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+      blocks.append(block)
+      views[name] = np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf, order=order)
+      views[name][...] = array
+      specs[name] = (block.name, array.shape, array.dtype.str, order)
+
+    yield specs, views
+
+  finally:
+
+    for block in blocks:
+      block.close()
+      block.unlink()
+
+
+# işçi süreçte paylaşımlı bellekten açılmış diziler
+_worker_arrays = None
+
+_worker_blocks = None
+
+
+def _attach(specs: dict = None):
+  """Süreç havuzu işçisi başlarken paylaşımlı bellek bloklarını açar."""
+
+  global _worker_arrays, _worker_blocks
+
+  _worker_blocks = {}
+  _worker_arrays = {}
+
+  for name, (block_name, shape, dtype, order) in specs.items():
+    block = shared_memory.SharedMemory(name=block_name)
+    _worker_blocks[name] = block
+    _worker_arrays[name] = np.ndarray(shape, dtype=dtype, buffer=block.buf, order=order)
+
+
+def _run_attached(function, chunk):
+
+  return function(_worker_arrays, chunk)
+
+
+class ProcessBackend:
+  """
+  Yerel süreç havuzu arka ucu; diziler paylaşımlı bellek üzerinden aktarılır
+
+  """
+
+  def __init__(self, max_workers: int = None):
+    """
+    Parameters
+    ----------
+    max_workers : int
+        süreç sayısı. Verilmezse işlemci çekirdeği sayısı.
+    """
+
+    self.max_workers = max_workers or os.cpu_count() or 1
+
+  def map(self, function=None, chunks: list = None, arrays: dict = None):
+
+    chunks = list(chunks)
+
+    # tek işçi ya da tek parça için süreç başlatmanın maliyetine değmez
+    if self.max_workers == 1 or len(chunks) <= 1:
+      return SerialBackend().map(function, chunks, arrays)
+
+    with self.session(arrays, len(chunks)) as session:
+      return session.map(function, chunks)
+
+  @contextlib.contextmanager
+  def session(self, arrays: dict = None, n_chunks: int = None):
+    """Dizileri paylaşımlı belleğe bir kez yazar ve süreç havuzunu bir kez
+    açar; oturum boyunca yapılan map çağrıları aynı havuzu kullanır.
+    Oturumun arrays dizileri paylaşımlı bellektedir ve yalnızca oturum
+    içinde geçerlidir. n_chunks verilirse havuz parça sayısından büyük
+    açılmaz.
+    """
+
+    max_workers = min(self.max_workers, n_chunks or self.max_workers)
+
+    if max_workers == 1:
+      yield _Session(SerialBackend(), arrays)
+      return
+
+    with _shared_arrays(arrays) as (specs, views):
+      with concurrent.futures.ProcessPoolExecutor(max_workers, initializer=_attach, initargs=(specs,)) as pool:
+        yield _SharedMemorySession(pool, views)
+
+
+# istemci verilmeyen DaskBackend nesnelerinin paylaştığı yerel küme istemcisi
+_default_client = None
+
+
+def _get_default_client():
+  """Yerel kümeyi ilk kullanımda bir kez açar ve süreç sonunda kapatır."""
+
+  global _default_client
+
+  if _default_client is None:
+
+    try:
+      from dask.distributed import Client
+    except ImportError as error:
+      raise ImportError("Dask arka ucu için dask[distributed] kurulmalıdır : pip install \"dask[distributed]\"") from error
+
+    _default_client = Client(processes=True)
+
+    atexit.register(_close_default_client)
+
+  return _default_client
+
+
+def _close_default_client():
+
+  global _default_client
+
+  if _default_client is not None:
+    _default_client.close()
+    _default_client = None
+
+
+class DaskBackend:
+  """
+  dask.distributed arka ucu
+
+  """
+
+  def __init__(self, client=None):
+    """
+    Parameters
+    ----------
+    client : dask.distributed.Client
+        kullanılacak istemci. Verilmezse tüm DaskBackend nesnelerinin
+        paylaştığı yerel bir küme (LocalCluster) ilk kullanımda bir kez
+        açılır ve süreç sonunda kapatılır.
+    """
+
+    self.client = client
+
+  def __get_client(self):
+
+    return self.client if self.client is not None else _get_default_client()
+
+  def map(self, function=None, chunks: list = None, arrays: dict = None):
+
+    client = self.__get_client()
+
+    shared = client.scatter(arrays, broadcast=True)
+
+    futures = [client.submit(function, shared, chunk, pure=False) for chunk in chunks]
+
+    return client.gather(futures)
+
+
+def open_session(backend=None, arrays: dict = None):
+  """Aynı dizilerle art arda map çağrıları yapmak için bir oturum açar
+  (with ile kullanılır). session metodu olan arka uçlar (ProcessBackend)
+  havuzu ve paylaşımlı belleği oturum boyunca açık tutar; diğerleri her
+  map çağrısında dizilerin güncel hallerini aktarır.
+  """
+
+  backend = get_backend(backend)
+
+  if hasattr(backend, "session"):
+    return backend.session(arrays)
+
+  return contextlib.nullcontext(_Session(backend, arrays))
+
+
+def get_backend(backend=None):
+  """Bir arka uç adını ("serial", "process", "dask") ya da nesnesini arka
+  uç nesnesine çevirir.
+  """
+
+  if backend is None or backend == "process":
+    return ProcessBackend()
+
+  if backend == "serial":
+    return SerialBackend()
+
+  if backend == "dask":
+    return DaskBackend()
+
+  assert hasattr(backend, "map"), "backend serial, process, dask ya da map metodu olan bir nesne olmalıdır."
+
+  return backend
@@ -1,10 +1,21 @@
 
 import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 
+from .arrowio import read_frame
+from .correlation import correlated_pairs
+from .instrumentation import instrument_class
+from .lazy import pyplot as plt, seaborn as sns
+from .memo import memoize, pairwise_matrix
+from .missingness import MissingnessBitmap
+from .modes import column_modes
+from .progressive import ProgressiveProfile
+from .sampling import ReservoirSampler
+from .sketches import cardinality_profile
+from .snapshot import ProfileSnapshot
 
+
+@instrument_class
 class ProfillingReport:
 
   """
@@ -33,7 +44,10 @@ class ProfillingReport:
   def __init__(self,df:pd.core.frame.DataFrame=None,
                continuous_variables:list=None,
                categorical_variables:list=None,
-               target_variables:list=None):
+               target_variables:list=None,
+               sample_size:int=100_000,
+               stratify:str=None,
+               random_state:int=0):
     """
     Parameters
     ----------
@@ -45,10 +59,26 @@ class ProfillingReport:
         kategorik değişkenler
     target_variables : list
         hedef değişkenler
+    sample_size : int
+        veri seti bu sayıdan fazla satır içeriyorsa grafikler bu boyutta
+        bir örneklemle çizilir. None ise her zaman tüm veri kullanılır.
+    stratify : str
+        örneklemin tabakalanacağı sütun (ör. hedef ya da kategorik bir
+        değişken)
+    random_state : int
+        örneklem için tohum
     """
 
     self.df = df
 
+    self.sample_size = sample_size
+
+    self.stratify = stratify
+
+    self.random_state = random_state
+
+    self.__sampler = None
+
     self.variables = df.columns.to_list()
 
     self.__continuous_variables = self.set_continuous_variables(continuous_variables)
@@ -57,6 +87,38 @@ class ProfillingReport:
 
     self.__target_variables= self.set_target_variables(target_variables)
 
+  @classmethod
+  def from_arrow(cls,source=None,
+                 continuous_variables:list=None,
+                 categorical_variables:list=None,
+                 target_variables:list=None,
+                 filters=None):
+    """Parquet/Arrow veri setinden bir ProfillingReport oluşturur. Yalnızca
+    sürekli, kategorik ve hedef değişkenlerin sütunları okunur ve filtreler
+    okuma sırasında uygulanır.
+
+    Parameters
+    ----------
+    source : str, list, pyarrow.Table ya da pyarrow.dataset.Dataset
+         veri seti
+    continuous_variables : list
+         sürekli değişkenler
+    categorical_variables : list
+         kategorik değişkenler
+    target_variables : list
+         hedef değişkenler
+    filters : list ya da pyarrow.dataset.Expression
+         satır filtreleri (ör. [("year", ">=", 2020)])
+
+    Returns
+    -------
+    ProfillingReport
+    """
+
+    columns=list(dict.fromkeys(continuous_variables+categorical_variables+target_variables))
+
+    return cls(read_frame(source,columns,filters),continuous_variables,categorical_variables,target_variables)
+
 
   
   def set_continuous_variables(self,continuous_variables):
@@ -174,6 +236,76 @@ class ProfillingReport:
 
     return self.__target_variables
 
+  @classmethod
+  def from_chunks(cls,chunks=None,
+                  continuous_variables:list=None,
+                  categorical_variables:list=None,
+                  target_variables:list=None,
+                  sample_size:int=100_000,
+                  stratify:str=None,
+                  random_state:int=0):
+    """Veri Çerçevesi parçalarından (ör. pd.read_csv(..., chunksize=...))
+    tüm veriyi belleğe almadan, rezervuar örneklemi üzerinde bir
+    ProfillingReport oluşturur. df örneklemdir; sampled_statistics
+    tüm akışa ait güven aralıklı tahminler dönderir.
+
+    Returns
+    -------
+    ProfillingReport
+    """
+
+    sampler = ReservoirSampler.from_chunks(chunks, size=sample_size, by=stratify, random_state=random_state)
+
+    report = cls(sampler.sample(),continuous_variables,categorical_variables,target_variables,
+                 sample_size,stratify,random_state)
+
+    report.__sampler = sampler
+
+    return report
+
+  def sampler(self,refit:bool=False):
+    """Veri setinin örneklemini (bkz. sampling.ReservoirSampler) dönderir.
+    Örneklem ilk çağrıda bir kez çıkarılır; df değiştiyse refit ile
+    yeniden çıkarılır.
+
+    Returns
+    -------
+    ReservoirSampler
+    """
+
+    if self.__sampler is None or refit:
+      self.__sampler = ReservoirSampler.from_frame(self.df, size=self.sample_size or len(self.df),
+                                                   by=self.stratify, random_state=self.random_state)
+
+    return self.__sampler
+
+  def __is_sampled(self):
+
+    return self.sample_size is not None and len(self.df) > self.sample_size
+
+  def __plot_frame(self):
+    """Grafikler için kullanılacak veri: büyük veri setlerinde örneklem."""
+
+    return self.sampler().sample() if self.__is_sampled() else self.df
+
+  def sampled_statistics(self,confidence:float=0.95):
+    """Sürekli değişkenler için örneklemden kayıp oranı, ortalama, standart
+    sapma ve medyan tahminlerini güven aralıklarıyla dönderir. Veri seti
+    sample_size'dan küçükse örneklem tüm veridir ve aralıkların genişliği
+    sıfırdır.
+
+    Parameters
+    ----------
+    confidence : float
+         güven düzeyi
+
+    Returns
+    -------
+    pd.core.frame.DataFrame
+    """
+
+    return self.sampler().estimates(self.__continuous_variables, confidence)
+
   def __check_it_includes(self,main_list:list=None,sub_list:list=None):
   
     """ Bir alt listede yer alan bütün elemanların, ana listede olup
@@ -208,6 +340,10 @@ class ProfillingReport:
     değişkenin bir kategori olması, aksi takdirde sürekli olması
     muhtemeldir.
 
+    Benzersiz değer sayıları cardinality_profile ile veri bir kez
+    taranarak bulunur. Eşiğin çevresindeki sayımlar kesindir; çok sayıda
+    benzersiz değeri olan sütunlarda HyperLogLog tahmini kullanılır.
+
     Parameters
     ----------
     numer_of_unique_values : int
@@ -221,12 +357,39 @@ class ProfillingReport:
          sürekli olan değişkenlerin listesi      
     """
 
-    categorical_variables=self.df.nunique()[self.df.nunique()<numer_of_unique_values].index.tolist()
+    # Space-Saving özeti eşikten büyük tutulduğu için eşiğin altındaki sayımlar kesindir
+    distinct = self.cardinality_profile(capacity=max(64, numer_of_unique_values + 1))["distinct"]
+
+    categorical_variables=distinct[distinct<numer_of_unique_values].index.tolist()
 
-    continuous_variables=self.df.nunique()[self.df.nunique()>numer_of_unique_values].index.tolist()
+    continuous_variables=distinct[distinct>=numer_of_unique_values].index.tolist()
 
     return categorical_variables,continuous_variables
 
+  def cardinality_profile(self, top_k: int = 5, capacity: int = 64, precision: int = 14):
+    """Her sütunun benzersiz değer sayısını ve en sık değerlerini veriyi bir
+    kez tarayarak bulur (bkz. sketches.cardinality_profile).
+
+    Parameters
+    ----------
+    top_k : int
+        her sütun için raporlanacak en sık değer sayısı
+    capacity : int
+        sütun başına tutulacak en fazla sık değer sayısı; benzersiz değer
+        sayısı bundan küçük olan sütunlarda sayımlar kesindir
+    precision : int
+        HyperLogLog hassasiyeti
+
+    Returns
+    -------
+    pd.core.frame.DataFrame
+        distinct, exact, missing, top_values ve top_share
+    """
+
+    return memoize(self.df, self.df.columns.tolist(), "cardinality_profile",
+                   lambda: cardinality_profile(self.df, precision=precision, capacity=capacity, top_k=top_k),
+                   top_k=top_k, capacity=capacity, precision=precision)
+
 
   
 
@@ -248,8 +411,8 @@ class ProfillingReport:
   def missing_cell_count(self):
     """Veri setindeki kayıp hücre miktarını gösteriyor.
     """
-    missing_cell_count = self.df.isna().sum().sum()
-    filled_cell_count = self.df.size-self.df.isnull().sum().sum()
+    missing_cell_count = int(MissingnessBitmap.from_frame(self.df).missing_counts().sum())
+    filled_cell_count = self.df.size-missing_cell_count
 
     self.__pie_plot_and_table(names=['Kayıp hücreler', 'Dolu hücreler'],
                               values=[missing_cell_count, filled_cell_count])
@@ -290,7 +453,7 @@ class ProfillingReport:
     """Veri setindeki değişkenlerinin dağılım grafiğini oluştur
     """
     len_cont = len(self.df.columns)
-    fig = self.df.hist(figsize=(4*len_cont,2*len_cont))
+    fig = self.__plot_frame().hist(figsize=(4*len_cont,2*len_cont))
     [x.title.set_size(32) for x in fig.ravel()]
 
   
@@ -348,11 +511,13 @@ class ProfillingReport:
     f, (ax_box, ax_hist) = plt.subplots(2, sharex=True, gridspec_kw={"height_ratios": ( .30, .70)})
     
 
-    sns.boxplot(self.df[feature], ax=ax_box)
+    df_plot = self.__plot_frame()
+
+    sns.boxplot(df_plot[feature], ax=ax_box)
 
     ax_box.set(xlabel='')
 
-    sns.histplot(data=self.df, x=feature, ax=ax_hist,kde=True)
+    sns.histplot(data=df_plot, x=feature, ax=ax_hist,kde=True)
 
     table = self.__create_dispersion_measures(feature)
 
@@ -387,7 +552,7 @@ class ProfillingReport:
 
     df_ct=pd.DataFrame()
 
-    df_ct["mode"]=self.df.loc[:,[feature]].mode().iloc[0,:]
+    df_ct["mode"]=column_modes(self.df,[feature])
     df_ct["median"]=self.df.loc[:,[feature]].median()
     df_ct["mean"]=self.df.loc[:,[feature]].mean()
 
@@ -402,12 +567,33 @@ class ProfillingReport:
     table.set_fontsize(8)
 
                 
-  def covariance_matrix(self):
+  def covariance_matrix(self, max_features: int = 50, top_k: int = 5):
     """Veri setindeki sürekli olan değişkenlerin kovaryans grafiğini oluştur
+
+    Sürekli değişken sayısı max_features'ı aşarsa p x p matris ve grafik
+    oluşturulmaz; her değişken için mutlak kovaryansı en yüksek top_k çift
+    tablo olarak dönderilir.
+
+    Parameters
+    ----------
+    max_features : int
+        grafiğin çizileceği en fazla sürekli değişken sayısı
+    top_k : int
+        büyük veri setlerinde her değişken için saklanacak çift sayısı
+
+    Returns
+    -------
+    pd.core.frame.DataFrame
+        yalnızca büyük veri setlerinde; feature_1, feature_2, value
     """
 
+    if len(self.__continuous_variables) > max_features:
+      return memoize(self.df, self.__continuous_variables, "correlated_pairs",
+                     lambda: correlated_pairs(self.df, self.__continuous_variables, top_k=top_k, kind="cov"),
+                     top_k=top_k, kind="cov")
+
    
-    df_cov = self.df.loc[:,self.__continuous_variables].cov()
+    df_cov = pairwise_matrix(self.df, self.__continuous_variables, "cov")
 
     
     mask_cov = np.triu(np.ones_like(df_cov, dtype=bool))
@@ -421,12 +607,35 @@ class ProfillingReport:
     plt.show()
   
 
-  def correlation_analysis(self):
+  def correlation_analysis(self, max_features: int = 50, threshold: float = 0.8, top_k: int = None):
     """Veri setindeki  sürekli olan değişkenlerin korelasyon grafiğini oluştur
+
+    Sürekli değişken sayısı max_features'ı aşarsa p x p matris ve grafik
+    oluşturulmaz; matris bloklar halinde dolaşılarak yalnızca yüksek
+    korelasyonlu çiftler bulunur ve tablo olarak dönderilir.
+
+    Parameters
+    ----------
+    max_features : int
+        grafiğin çizileceği en fazla sürekli değişken sayısı
+    threshold : float
+        büyük veri setlerinde saklanacak çiftler için mutlak korelasyon eşiği
+    top_k : int
+        büyük veri setlerinde her değişken için saklanacak en yüksek çift sayısı
+
+    Returns
+    -------
+    pd.core.frame.DataFrame
+        yalnızca büyük veri setlerinde; feature_1, feature_2, value
     """
 
+    if len(self.__continuous_variables) > max_features:
+      return memoize(self.df, self.__continuous_variables, "correlated_pairs",
+                     lambda: correlated_pairs(self.df, self.__continuous_variables, threshold=threshold, top_k=top_k),
+                     threshold=threshold, top_k=top_k, kind="corr")
+
    
-    df_corr = self.df.loc[:,self.__continuous_variables].corr()
+    df_corr = pairwise_matrix(self.df, self.__continuous_variables, "corr")
     
     mask_corr = np.triu(np.ones_like(df_corr, dtype=bool))
 
@@ -439,15 +648,24 @@ class ProfillingReport:
   
   def principal_component_analysis_2d(self,feature_color:np.array=None):
 
+    df_plot = self.__plot_frame()
+
     if feature_color.size==0:
 
-      feature_color=self.df.loc[:,self.__target_variables[0]].values.reshape(1,-1)
+      feature_color=df_plot.loc[:,self.__target_variables[0]].values.reshape(1,-1)
+
+    elif self.__is_sampled():
+
+      feature_color=np.asarray(feature_color).reshape(-1)[self.sampler().sample_positions()]
 
     from sklearn.decomposition import PCA
 
-    pca = PCA(2)  
-    data = self.df.drop(columns=self.__target_variables)
-    projected = pca.fit_transform(data)
+    def fit_pca():
+      data = df_plot.drop(columns=self.__target_variables)
+      return PCA(2).fit_transform(data), np.cumsum(PCA().fit(data).explained_variance_ratio_)
+
+    columns = df_plot.columns.drop(self.__target_variables).tolist()
+    projected, cumulative_ratios = memoize(df_plot, columns, "principal_component_analysis_2d_cumulative", fit_pca)
 
     plt.scatter(projected[:, 0], projected[:, 1],c=feature_color)
     plt.xlabel('Bileşen 1')
@@ -455,20 +673,84 @@ class ProfillingReport:
     plt.colorbar();
     plt.show()
 
-    plt.plot(np.cumsum(PCA().fit(data).explained_variance_ratio_))
+    plt.plot(cumulative_ratios)
     plt.xlabel('Bileşen sayıları')
     plt.ylabel('Kümülatif açıklanan varyans')
     plt.show()
 
   def hierarchical_clustering (self,**kwargs):
 
-    sns.clustermap(self.df.loc[:,self.__continuous_variables],**kwargs)
+    sns.clustermap(self.__plot_frame().loc[:,self.__continuous_variables],**kwargs)
 
 
   def interaction_plot(self,x_axis,y_axis):
 
     assert (x_axis in self.variables and y_axis in self.variables), "x_axis ve y_axis  veri setinde tanımlanmalıdır."
 
-    _=sns.jointplot(x=x_axis, y=y_axis, data=self.df,
+    _=sns.jointplot(x=x_axis, y=y_axis, data=self.__plot_frame(),
                     kind="reg", truncate=True,
                     color="g", height=7)
+
+  def progressive_profile(self,chunk_size:int=100_000,tol:float=0.01,patience:int=2,
+                          time_budget:float=None,callback=None,shuffle:bool=True):
+    """Veri setini parçalar halinde işleyerek dağılım ölçülerini, kayıp
+    hücre sayılarını, histogramları ve korelasyonları her parçadan sonra
+    günceller (bkz. progressive). Tahminler durulduğunda ya da süre
+    dolduğunda tüm veri taranmadan durur.
+
+    Parameters
+    ----------
+    chunk_size : int
+         bir parçadaki satır sayısı
+    tol : float
+         durmak için tahminlerdeki en büyük değişimin üst sınırı
+    patience : int
+         değişimin art arda kaç parça boyunca tol'un altında kalması gerektiği
+    time_budget : float
+         saniye cinsinden süre sınırı
+    callback : callable
+         her parçadan sonra güncel profil ile çağrılacak fonksiyon
+    shuffle : bool
+         parçaların rastgele sırayla işlenip işlenmeyeceği. Sıralı verilerde
+         (ör. tarihe göre) erken durmanın yanıltıcı olmaması için True
+         bırakılmalıdır.
+
+    Returns
+    -------
+    ProgressiveProfile
+         güncel tahminler, standart hatalar, değişim geçmişi (progress) ve
+         durma sebebi (stop_reason)
+    """
+
+    starts = np.arange(0, len(self.df), chunk_size)
+
+    if shuffle:
+      starts = np.random.default_rng(self.random_state).permutation(starts)
+
+    profile = ProgressiveProfile(self.__continuous_variables, self.__categorical_variables,
+                                 tol=tol, patience=patience, time_budget=time_budget)
+
+    return profile.run((self.df.iloc[start:start+chunk_size] for start in starts), callback)
+
+  def snapshot(self,previous:ProfileSnapshot=None):
+    """Veri setinin istatistiklerini (sayılar, momentler, çeyreklik ve
+    farklı değer özetleri, kayıp hücreler, kovaryans toplamları) saklanabilir
+    ve birleştirilebilir bir özet olarak çıkarır. previous verilirse veri
+    seti yeni bir parça kabul edilir ve önceki özete eklenir; böylece
+    yalnızca yeni veri taranır.
+
+    Parameters
+    ----------
+    previous : ProfileSnapshot
+         önceki günlerin özeti (yerinde güncellenir)
+
+    Returns
+    -------
+    ProfileSnapshot
+         güncel özet. Hata sınırları için helpers/snapshot.py'ye bakınız.
+    """
+
+    if previous is None:
+      return ProfileSnapshot.from_frame(self.df, self.__continuous_variables, self.__categorical_variables)
+
+    return previous.update(self.df)
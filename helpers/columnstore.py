@@ -0,0 +1,245 @@
+"""
+Bellek eşlemeli (memory-mapped) sütun deposu.
+
+Bir veri seti bir kez diske, her sütun ayrı bir ham ikili dosya (.bin)
+olacak şekilde yazılır; sütunların tipi ve satır sayısı manifest.json
+dosyasında tutulur. load_column_store veriyi okumaz, dosyaları bellek
+eşlemeli NumPy dizileri olarak açar ve bunlardan kopyasız bir Veri
+Çerçevesi oluşturur. Böylece büyük bir veri seti milisaniyeler içinde
+açılır, yalnızca kullanılan sayfalar diskten okunur ve aynı depoyu açan
+süreçler işletim sisteminin sayfa önbelleğini paylaşır.
+
+  save_column_store(df, "/data/cache/sales")          # ya da csv_to_column_store
+  df = load_column_store("/data/cache/sales")
+  report = ProfillingReport(df, continuous_variables, ...)
+
+Metin (object/string) ve kategorik sütunlar tamsayı kodlar ve kategori
+listesi olarak saklanır, kategorik sütun olarak açılır. Saat dilimli
+tarih sütunları UTC olarak saklanır. Açılan diziler
+salt okunurdur; yerinde değişiklik yapan işlemler (ör. DataCleaning)
+önce bir kopya almalıdır.
+"""
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+
+MANIFEST = "manifest.json"
+
+
+def _code_dtype(n_categories: int = None):
+  """pandas'ın bu kadar kategori için kullandığı kod tipi. Kodlar bu tipte
+  saklanmazsa pandas açılışta kopyalayarak dönüştürür.
+  """
+
+  for dtype in (np.int8, np.int16, np.int32):
+    if n_categories < np.iinfo(dtype).max:
+      return np.dtype(dtype)
+
+  return np.dtype(np.int64)
+
+
+def _column_kind(series: pd.core.series.Series = None):
+
+  if isinstance(series.dtype, pd.CategoricalDtype):
+    return "category"
+  if pd.api.types.is_datetime64_any_dtype(series.dtype):
+    return "datetime"
+  if pd.api.types.is_bool_dtype(series.dtype) and not series.hasnans:
+    return "bool"
+  if pd.api.types.is_numeric_dtype(series.dtype) and not pd.api.types.is_extension_array_dtype(series.dtype):
+    return "numeric"
+  if pd.api.types.is_numeric_dtype(series.dtype):
+    return "numeric_float"
+  return "category"
+
+
+def _column_path(directory: str = None, position: int = None):
+
+  return os.path.join(directory, f"column_{position}.bin")
+
+
+class _ColumnWriter:
+  """Bir sütunu parça parça ham dosyaya yazar. Metin sütunlarında
+  kategoriler parçalar boyunca birikir ve kodlar yazılırken küresel kodlara
+  çevrilir.
+  """
+
+  def __init__(self, directory, position, name, kind):
+
+    self.path = _column_path(directory, position)
+    self.name = name
+    self.kind = kind
+    self.dtype = None
+    self.categories = {}
+    self.file = open(self.path, "wb")
+
+  def write(self, series: pd.core.series.Series = None):
+
+    if self.kind == "category":
+
+      codes, uniques = pd.factorize(series, use_na_sentinel=True)
+
+      # yalnızca parçadaki benzersiz değerler için sözlük araması yapılır
+      global_codes = np.empty(len(uniques) + 1, dtype=np.int64)
+      global_codes[-1] = -1
+      for position, value in enumerate(uniques):
+        global_codes[position] = self.categories.setdefault(value, len(self.categories))
+
+      values = global_codes.take(codes).astype(np.int32)
+      self.dtype = np.dtype(np.int32)
+
+    elif self.kind == "datetime":
+
+      values = series.to_numpy(dtype="datetime64[ns]").view(np.int64)
+      self.dtype = np.dtype(np.int64)
+
+    elif self.kind == "numeric_float":
+
+      values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+      self.dtype = np.dtype(np.float64)
+
+    else:
+
+      values = series.to_numpy()
+      if self.dtype is not None and values.dtype != self.dtype:
+        values = values.astype(self.dtype)
+      self.dtype = values.dtype
+
+    self.file.write(np.ascontiguousarray(values).tobytes())
+
+  def close(self, n_rows):
+
+    self.file.close()
+
+    entry = {"name": self.name, "kind": self.kind, "dtype": self.dtype.str if self.dtype is not None else "<f8"}
+
+    if self.kind == "category":
+
+      categories = list(self.categories)
+      code_dtype = _code_dtype(len(categories))
+
+      # kodlar en küçük uygun tipe indirilir, böylece açılışta kopya gerekmez
+      if code_dtype != np.int32 and n_rows:
+        codes = np.fromfile(self.path, dtype=np.int32).astype(code_dtype)
+        codes.tofile(self.path)
+
+      entry["dtype"] = code_dtype.str
+      entry["categories"] = [category.item() if isinstance(category, np.generic) else category
+                             for category in categories]
+
+    return entry
+
+
+def _write(chunks, directory):
+
+  os.makedirs(directory, exist_ok=True)
+
+  writers = None
+  n_rows = 0
+
+  for chunk in chunks:
+
+    if writers is None:
+      writers = [_ColumnWriter(directory, position, str(name), _column_kind(chunk[name]))
+                 for position, name in enumerate(chunk.columns)]
+
+    for writer, name in zip(writers, chunk.columns):
+      writer.write(chunk[name])
+
+    n_rows += chunk.shape[0]
+
+  columns = [writer.close(n_rows) for writer in writers or []]
+
+  with open(os.path.join(directory, MANIFEST), "w") as file:
+    json.dump({"rows": n_rows, "columns": columns}, file, default=str)
+
+
+def save_column_store(df: pd.core.frame.DataFrame = None, directory: str = None):
+  """Bir Veri Çerçevesini bellek eşlemeli sütun deposu olarak yazar.
+
+  Parameters
+  ----------
+  df : pd.core.frame.DataFrame
+      saklanacak veri seti
+  directory : str
+      deponun yazılacağı dizin
+  """
+
+  _write([df], directory)
+
+
+def csv_to_column_store(path: str = None, directory: str = None, chunksize: int = 1_000_000, **read_csv_kwargs):
+  """Bir CSV dosyasını bellekte tamamını tutmadan, parça parça okuyarak
+  sütun deposuna yazar. Sayısal sütunlar, parçalar arasında tipleri
+  değişebileceği için float64 olarak saklanır.
+
+  Parameters
+  ----------
+  path : str
+      CSV dosyası
+  directory : str
+      deponun yazılacağı dizin
+  chunksize : int
+      tek seferde okunacak satır sayısı
+  read_csv_kwargs
+      pandas.read_csv'ye aktarılacak diğer parametreler
+  """
+
+  def float_chunks():
+    for chunk in pd.read_csv(path, chunksize=chunksize, **read_csv_kwargs):
+      numeric = chunk.select_dtypes(include="number").columns
+      yield chunk.astype({column: np.float64 for column in numeric})
+
+  _write(float_chunks(), directory)
+
+
+def load_column_store(directory: str = None, columns: list = None):
+  """Sütun deposunu bellek eşlemeli, kopyasız bir Veri Çerçevesi olarak açar.
+
+  Parameters
+  ----------
+  directory : str
+      deponun dizini
+  columns : list
+      açılacak sütunlar. Verilmezse tüm sütunlar.
+
+  Returns
+  -------
+  pd.core.frame.DataFrame
+      salt okunur dizilere dayanan Veri Çerçevesi
+  """
+
+  with open(os.path.join(directory, MANIFEST)) as file:
+    manifest = json.load(file)
+
+  n_rows = manifest["rows"]
+
+  entries = {entry["name"]: (position, entry) for position, entry in enumerate(manifest["columns"])}
+
+  if columns is None:
+    columns = list(entries)
+
+  data = {}
+
+  for name in columns:
+
+    position, entry = entries[name]
+    dtype = np.dtype(entry["dtype"])
+
+    if n_rows:
+      values = np.memmap(_column_path(directory, position), dtype=dtype, mode="r", shape=(n_rows,))
+    else:
+      values = np.empty(0, dtype=dtype)
+
+    if entry["kind"] == "category":
+      values = pd.Categorical.from_codes(values, dtype=pd.CategoricalDtype(entry["categories"]), validate=False)
+    elif entry["kind"] == "datetime":
+      values = values.view("datetime64[ns]")
+
+    data[name] = values
+
+  return pd.DataFrame(data, copy=False)
@@ -0,0 +1,501 @@
+"""
+Çok sayıda sütun için, p x p matrisin tamamını bellekte tutmadan
+korelasyon (ya da kovaryans) çiftlerinin bulunması.
+
+Sütunlar bloklar halinde merkezlenir (ve korelasyonda ölçeklenir); matris
+blok-blok (tile) matris çarpımlarıyla üst üçgen üzerinde dolaşılır. Her
+bloktan yalnızca eşiği aşan çiftler ya da her sütun için en yüksek top_k
+çift saklanır. Bellek kullanımı veri (float32 olarak) ile
+block_size x block_size büyüklüğünde bir blok kadardır.
+
+Kayıp değer içermeyen verilerde her blok tek bir matris çarpımıdır. Kayıp
+değer varsa pandas.DataFrame.corr ile aynı şekilde ikili (pairwise) dolu
+satırlar kullanılır; bu durumda blok başına altı matris çarpımı yapılır.
+
+Sıra korelasyonları:
+  * spearman : her sütun bir kez sıralanır (rank) ve sıralar üzerinde aynı
+    bloklu Pearson hesabı yapılır. Kayıp değer varsa sıralar her sütunun
+    dolu değerleri üzerinden bir kez hesaplanır; pandas ise her çift için
+    ortak dolu satırları yeniden sıralar, bu durumda sonuçlar çok az farklı
+    olabilir.
+  * kendall : her çift için O(n log n) birleştirmeli sıralama (merge sort)
+    tabanlı tau-b (scipy.stats.kendalltau) kullanılır. Üst üçgendeki
+    çiftler block_size'dan bağımsız olarak işçi sayısının birkaç katı
+    eşit parçaya bölünür ve helpers.backends arka uçlarıyla işçilere
+    dağıtılır; işçiler yalnızca eşiği aşan çiftleri ve top_k adaylarını
+    dönderir.
+
+  pairs = correlated_pairs(df, threshold=0.9)
+  selection = prune_correlated(df, threshold=0.9)
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+
+class _BlockedMatrix:
+  """Sütunları blok çarpımlarına hazır tutan yardımcı sınıf."""
+
+  def __init__(self, df: pd.core.frame.DataFrame = None, columns: list = None, kind: str = "corr", dtype=np.float32,
+               method: str = "pearson"):
+
+    assert kind in ("corr", "cov"), "kind değeri corr ya da cov olmalıdır."
+
+    self.kind = kind
+
+    frame = df.loc[:, columns]
+
+    if method == "spearman":
+      frame = frame.rank(method="average")
+
+    values = frame.to_numpy(dtype=np.float64, na_value=np.nan, copy=True)
+
+    mask = ~np.isnan(values)
+
+    self.has_missing = not mask.all()
+
+    counts = mask.sum(axis=0)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+      means = np.nansum(values, axis=0) / counts
+
+    # merkezleme float64'te yapılır, çarpımlar dtype ile
+    values -= means
+    values[~mask] = 0.0
+
+    if not self.has_missing:
+
+      with np.errstate(invalid="ignore", divide="ignore"):
+        if kind == "corr":
+          scale = np.sqrt((values ** 2).sum(axis=0))
+        else:
+          scale = np.full(values.shape[1], np.sqrt(max(values.shape[0] - 1, 0)))
+        values /= scale
+
+      # sabit sütunların korelasyonu tanımsızdır
+      values[:, ~np.isfinite(scale) | (scale == 0)] = np.nan
+
+    self.values = np.asfortranarray(values, dtype=dtype)
+
+    self.mask = np.asfortranarray(mask, dtype=dtype) if self.has_missing else None
+
+  def block(self, rows: slice = None, columns: slice = None):
+    """rows ve columns sütun aralıkları arasındaki korelasyon/kovaryans bloğu."""
+
+    a = self.values[:, rows]
+    b = self.values[:, columns]
+
+    if not self.has_missing:
+      return (a.T @ b).astype(np.float64)
+
+    mask_a = self.mask[:, rows]
+    mask_b = self.mask[:, columns]
+
+    n = (mask_a.T @ mask_b).astype(np.float64)
+    sum_a = (a.T @ mask_b).astype(np.float64)
+    sum_b = (mask_a.T @ b).astype(np.float64)
+    sum_ab = (a.T @ b).astype(np.float64)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+
+      covariance = sum_ab - sum_a * sum_b / n
+
+      if self.kind == "cov":
+        return np.where(n > 1, covariance / (n - 1), np.nan)
+
+      variance_a = ((a * a).T @ mask_b).astype(np.float64) - sum_a ** 2 / n
+      variance_b = (mask_a.T @ (b * b)).astype(np.float64) - sum_b ** 2 / n
+
+      return covariance / np.sqrt(variance_a * variance_b)
+
+
+METHODS = ("pearson", "spearman", "kendall")
+
+
+def _reduce_block(block, row_positions, column_positions, threshold, top_k):
+  """Bir bloktan yalnızca eşiği aşan çiftleri ve her satır/sütun için en
+  yüksek top_k adayı çıkarır. Yalnızca üst üçgen (i < j) dikkate alınır.
+  """
+
+  upper = row_positions[:, None] < column_positions[None, :]
+  scores = np.where(upper & np.isfinite(block), np.abs(block), -np.inf)
+
+  found = None
+  candidates = []
+
+  if threshold is not None:
+    selected_rows, selected_columns = np.nonzero(scores >= threshold)
+    found = (row_positions[selected_rows], column_positions[selected_columns], block[selected_rows, selected_columns])
+
+  if top_k is not None:
+
+    # blok hem satır hem sütun tarafındaki sütunların adaylarını içerir
+    for owners, partners, owner_scores, owner_values in ((row_positions, column_positions, scores, block),
+                                                         (column_positions, row_positions, scores.T, block.T)):
+      k = min(top_k, owner_scores.shape[1])
+      best = np.argpartition(-owner_scores, k - 1, axis=1)[:, :k]
+      candidates.append((owners, np.take_along_axis(owner_scores, best, axis=1),
+                         np.take_along_axis(owner_values, best, axis=1), partners[best]))
+
+  return found, candidates
+
+
+def _merge_top_k(top, rows, scores, signed, partners, top_k):
+  """rows satırlarının en yüksek top_k listesini yeni adaylarla birleştirir.
+  top, (mutlak değer, işaretli değer, eş sütun) dizilerinden oluşur.
+  """
+
+  top_scores, top_signed, top_index = top
+
+  values = np.concatenate([top_scores[rows], scores], axis=1)
+  signed = np.concatenate([top_signed[rows], signed], axis=1)
+  index = np.concatenate([top_index[rows], partners], axis=1)
+
+  best = np.argpartition(-values, top_k - 1, axis=1)[:, :top_k]
+
+  top_scores[rows] = np.take_along_axis(values, best, axis=1)
+  top_signed[rows] = np.take_along_axis(signed, best, axis=1)
+  top_index[rows] = np.take_along_axis(index, best, axis=1)
+
+
+def _kendall_block(values: np.ndarray = None, rows: range = None, columns: range = None):
+  """İki sütun aralığı arasındaki Kendall tau-b bloğu (ikili dolu satırlarla)."""
+
+  from scipy.stats import kendalltau
+
+  block = np.full((len(rows), len(columns)), np.nan)
+
+  for i, row in enumerate(rows):
+    for j, column in enumerate(columns):
+
+      if row >= column:
+        continue
+
+      x, y = values[:, row], values[:, column]
+      known = ~(np.isnan(x) | np.isnan(y))
+
+      if known.sum() > 1:
+        block[i, j] = kendalltau(x[known], y[known]).statistic
+
+  return block
+
+
+def _kendall_chunk_count(backend=None, n_tasks: int = None):
+  """Kendall işlerinin bölüneceği parça sayısı: işçi sayısının dört katı
+  (en fazla iş sayısı kadar).
+  """
+
+  workers = getattr(backend, "max_workers", None) or os.cpu_count() or 1
+
+  return max(1, min(n_tasks, workers * 4))
+
+
+def _kendall_pairs(arrays: dict = None, chunk: tuple = None):
+  """Üst üçgendeki çiftlerin (satır öncelikli sırada) [start, stop)
+  aralığını işler ve her satır parçası için indirgenmiş sonuçları dönderir
+  (işçide çalışır).
+  """
+
+  start, stop, threshold, top_k = chunk
+
+  values = arrays["values"]
+  p = values.shape[1]
+
+  # i. satırın ilk çiftinin sırası
+  offsets = np.concatenate([[0], np.cumsum(np.arange(p - 1, 0, -1))])
+
+  reduced = []
+
+  row = int(np.searchsorted(offsets, start, side="right")) - 1
+
+  while row < p - 1 and offsets[row] < stop:
+
+    first = max(start, offsets[row]) - offsets[row] + row + 1
+    last = min(stop, offsets[row + 1]) - offsets[row] + row + 1
+
+    column_positions = np.arange(first, last)
+    block = _kendall_block(values, range(row, row + 1), range(first, last))
+    reduced.append(_reduce_block(block, np.array([row]), column_positions, threshold, top_k))
+
+    row += 1
+
+  return reduced
+
+
+def _kendall_target(arrays: dict = None, chunk: tuple = None):
+  """Bir sütun aralığının hedef ile Kendall tau-b değerleri (işçide çalışır)."""
+
+  start, stop = chunk
+
+  values = arrays["values"]
+  target = values.shape[1] - 1
+
+  return _kendall_block(values, range(start, stop), range(target, target + 1))[:, 0]
+
+
+def correlated_pairs(df: pd.core.frame.DataFrame = None, columns: list = None,
+                     threshold: float = None, top_k: int = None,
+                     kind: str = "corr", method: str = "pearson", block_size: int = 512,
+                     dtype=np.float32, backend=None):
+  """Birbiriyle yüksek korelasyonlu sütun çiftlerini, p x p matrisi
+  oluşturmadan bulur.
+
+  Parameters
+  ----------
+  df : pd.core.frame.DataFrame
+      veri seti
+  columns : list
+      sütunlar. Verilmezse sayısal sütunlar.
+  threshold : float
+      mutlak değeri bu eşiğe eşit ya da büyük olan çiftler saklanır
+  top_k : int
+      her sütun için mutlak değeri en yüksek top_k çift saklanır.
+      threshold ile birlikte verilirse iki koşulu da sağlayan çiftler dönderilir.
+  kind : str
+      "corr" (korelasyon) ya da "cov" (kovaryans, yalnızca pearson)
+  method : str
+      "pearson", "spearman" ya da "kendall"
+  block_size : int
+      bir blokta işlenecek sütun sayısı (kendall'da kullanılmaz; çiftler
+      işçi sayısına göre bölünür)
+  dtype : np.dtype
+      matris çarpımlarının tipi. float32 daha hızlıdır; yaklaşık 1e-6
+      duyarlılık gerekiyorsa np.float64 verilmelidir.
+  backend : str ya da arka uç nesnesi
+      kendall hesabının dağıtılacağı arka uç (bkz. helpers.backends).
+      Verilmezse yerel süreç havuzu.
+
+  Returns
+  -------
+  pd.core.frame.DataFrame
+      feature_1, feature_2 ve value (korelasyon ya da kovaryans) sütunları;
+      mutlak değere göre büyükten küçüğe sıralı
+  """
+
+  assert threshold is not None or top_k is not None, "threshold ya da top_k verilmelidir."
+
+  assert method in METHODS, "method değeri pearson, spearman ya da kendall olmalıdır."
+
+  assert kind == "corr" or method == "pearson", "kovaryans yalnızca pearson ile hesaplanabilir."
+
+  if columns is None:
+    columns = df.select_dtypes(include="number").columns.tolist()
+
+  columns = list(columns)
+
+  p = len(columns)
+
+  if method == "kendall":
+
+    from .backends import get_backend
+
+    values = np.asfortranarray(df.loc[:, columns].to_numpy(dtype=np.float64, na_value=np.nan))
+
+    backend = get_backend(backend)
+
+    n_pairs = p * (p - 1) // 2
+    bounds = np.linspace(0, n_pairs, _kendall_chunk_count(backend, n_pairs) + 1).astype(np.int64)
+
+    chunks = [(int(start), int(stop), threshold, top_k) for start, stop in zip(bounds[:-1], bounds[1:]) if stop > start]
+
+    reduced = [item for items in backend.map(_kendall_pairs, chunks, {"values": values})
+               for item in items]
+
+  else:
+
+    matrix = _BlockedMatrix(df, columns, kind, dtype, method)
+
+    def blocks():
+      for start in range(0, p, block_size):
+        row_positions = np.arange(start, min(start + block_size, p))
+        for other in range(start, p, block_size):
+          column_positions = np.arange(other, min(other + block_size, p))
+          block = matrix.block(slice(row_positions[0], row_positions[-1] + 1),
+                               slice(column_positions[0], column_positions[-1] + 1))
+          yield _reduce_block(block, row_positions, column_positions, threshold, top_k)
+
+    reduced = blocks()
+
+  found_rows, found_columns, found_values = [], [], []
+
+  if top_k is not None:
+    top_k = min(top_k, max(p - 1, 1))
+    top = (np.full((p, top_k), -np.inf), np.full((p, top_k), np.nan), np.full((p, top_k), -1, dtype=np.int64))
+
+  for found, candidates in reduced:
+
+    if found is not None:
+      found_rows.append(found[0])
+      found_columns.append(found[1])
+      found_values.append(found[2])
+
+    for owners, scores, signed, partners in candidates:
+      _merge_top_k(top, owners, scores, signed, partners, top_k)
+
+  if top_k is not None:
+
+    top_scores, top_signed, top_index = top
+
+    owner = np.repeat(np.arange(p), top_k)
+    partner = top_index.ravel()
+    valid = np.isfinite(top_scores.ravel()) & (partner >= 0)
+
+    if threshold is not None:
+      valid &= top_scores.ravel() >= threshold
+
+    pairs, position = np.unique(np.sort(np.stack([owner[valid], partner[valid]], axis=1), axis=1),
+                                axis=0, return_index=True)
+    first, second = pairs[:, 0], pairs[:, 1]
+    values = top_signed.ravel()[valid][position]
+
+  else:
+
+    first = np.concatenate(found_rows) if found_rows else np.empty(0, dtype=np.int64)
+    second = np.concatenate(found_columns) if found_columns else np.empty(0, dtype=np.int64)
+    values = np.concatenate(found_values) if found_values else np.empty(0)
+
+  names = np.asarray(columns, dtype=object)
+
+  result = pd.DataFrame({"feature_1": names[first], "feature_2": names[second], "value": values})
+
+  order = np.argsort(-np.abs(result["value"].to_numpy()), kind="stable")
+
+  return result.iloc[order].reset_index(drop=True)
+
+
+def target_correlations(df: pd.core.frame.DataFrame = None, columns: list = None, target: str = None,
+                        method: str = "pearson", block_size: int = 512, dtype=np.float64, backend=None):
+  """Sütunların bir hedef değişken ile korelasyonlarını, yalnızca
+  sütun x 1 bloklar hesaplayarak bulur.
+
+  Returns
+  -------
+  pd.core.series.Series
+  """
+
+  assert method in METHODS, "method değeri pearson, spearman ya da kendall olmalıdır."
+
+  columns = list(columns)
+
+  correlations = np.empty(len(columns))
+
+  if method == "kendall":
+
+    from .backends import get_backend
+
+    values = np.asfortranarray(df.loc[:, columns + [target]].to_numpy(dtype=np.float64, na_value=np.nan))
+
+    backend = get_backend(backend)
+
+    # sütunlar block_size'dan bağımsız olarak işçilere bölünür
+    bounds = np.linspace(0, len(columns), _kendall_chunk_count(backend, len(columns)) + 1).astype(np.int64)
+
+    chunks = [(int(start), int(stop)) for start, stop in zip(bounds[:-1], bounds[1:]) if stop > start]
+
+    for (start, stop), block in zip(chunks, backend.map(_kendall_target, chunks, {"values": values})):
+      correlations[start:stop] = block
+
+    return pd.Series(correlations, index=columns, name=target)
+
+  for start in range(0, len(columns), block_size):
+
+    block_columns = columns[start:start + block_size]
+
+    matrix = _BlockedMatrix(df, block_columns + [target], "corr", dtype, method)
+
+    correlations[start:start + len(block_columns)] = matrix.block(slice(0, len(block_columns)),
+                                                                  slice(len(block_columns), len(block_columns) + 1))[:, 0]
+
+  return pd.Series(correlations, index=columns, name=target)
+
+
+def kendall_matrix(df: pd.core.frame.DataFrame = None, columns: list = None, backend=None):
+  """Küçük sütun kümeleri için O(n log n) Kendall tau-b matrisinin tamamı.
+
+  Returns
+  -------
+  pd.core.frame.DataFrame
+  """
+
+  if columns is None:
+    columns = df.columns.tolist()
+
+  columns = list(columns)
+
+  pairs = correlated_pairs(df, columns, threshold=0.0, method="kendall", backend=backend)
+
+  positions = pd.Index(columns)
+  first = positions.get_indexer(pairs["feature_1"])
+  second = positions.get_indexer(pairs["feature_2"])
+
+  matrix = np.full((len(columns), len(columns)), np.nan)
+  np.fill_diagonal(matrix, 1.0)
+  matrix[first, second] = pairs["value"].to_numpy()
+  matrix[second, first] = pairs["value"].to_numpy()
+
+  return pd.DataFrame(matrix, index=columns, columns=columns)
+
+
+def prune_correlated(df: pd.core.frame.DataFrame = None, columns: list = None, threshold: float = 0.9,
+                     priority: pd.core.series.Series = None, method: str = "pearson", block_size: int = 512,
+                     dtype=np.float32, backend=None):
+  """Birbiriyle mutlak korelasyonu threshold'u aşan sütunlardan birini
+  açgözlü (greedy) olarak eler. Sütunlar öncelik sırasıyla dolaşılır; bir
+  sütun, daha önce seçilmiş bir sütunla yüksek korelasyonluysa elenir.
+
+  Parameters
+  ----------
+  df : pd.core.frame.DataFrame
+      veri seti
+  columns : list
+      sütunlar. Verilmezse sayısal sütunlar.
+  threshold : float
+      eleme için mutlak korelasyon eşiği
+  priority : pd.core.series.Series
+      sütun -> öncelik puanı (büyük olan önce seçilir; ör. hedef ile mutlak
+      korelasyon). Verilmezse columns sırası kullanılır.
+  method : str
+      "pearson", "spearman" ya da "kendall"
+
+  Returns
+  -------
+  dict
+      "selected" : seçilen sütunlar,
+      "dropped" : elenen sütun -> (neden olan seçilmiş sütun, korelasyon),
+      "pairs" : eşiği aşan tüm çiftler
+  """
+
+  if columns is None:
+    columns = df.select_dtypes(include="number").columns.tolist()
+
+  columns = list(columns)
+
+  if priority is not None:
+    columns = priority.reindex(columns).sort_values(ascending=False, kind="stable", na_position="last").index.tolist()
+
+  pairs = correlated_pairs(df, columns, threshold=threshold, method=method, block_size=block_size,
+                           dtype=dtype, backend=backend)
+
+  neighbours = {}
+  for first, second, value in pairs.itertuples(index=False):
+    neighbours.setdefault(first, []).append((second, value))
+    neighbours.setdefault(second, []).append((first, value))
+
+  selected = []
+  selected_set = set()
+  dropped = {}
+
+  for column in columns:
+
+    # çiftler mutlak değere göre sıralı olduğundan ilk eşleşme en güçlüsüdür
+    reason = next(((other, value) for other, value in neighbours.get(column, []) if other in selected_set), None)
+
+    if reason is None:
+      selected.append(column)
+      selected_set.add(column)
+    else:
+      dropped[column] = reason
+
+  return {"selected": selected, "dropped": dropped, "pairs": pairs}
@@ -1,8 +1,16 @@
 import numpy as np
 import pandas as pd
-from sklearn.impute import KNNImputer
-from sklearn.ensemble import IsolationForest
 
+from .arrowio import read_frame
+from .drift import DriftProfile
+from .groupimpute import GroupImputer
+from .instrumentation import instrument_class, record_value
+from .memo import column_fingerprint
+from .missingness import MissingnessBitmap
+from .modelimpute import ModelImputer
+from .modes import column_modes
+
+@instrument_class
 class DataCleaning:
   
   """
@@ -26,6 +34,43 @@ class DataCleaning:
 
     self.variables = df_train.columns.to_list()
 
+    self.outlier_limits = {}
+
+    # sınırların hesaplandığı df_train sütunlarının parmak izleri; sütun
+    # değişince (silme, doldurma, tedavi) sınırlar yeniden hesaplanır
+    self.__outlier_fingerprints = {}
+
+    self.drift_profile = None
+
+    self.group_imputer = None
+
+    self.model_imputer = None
+
+  @classmethod
+  def from_arrow(cls,train_source=None,test_source=None,columns:list=None,filters=None):
+    """
+    Parquet/Arrow veri setlerinden bir DataCleaning oluşturur. Yalnızca
+    columns ile verilen sütunlar okunur ve filtreler okuma sırasında
+    uygulanır.
+
+    Parameters
+    ----------
+    train_source : str, list, pyarrow.Table ya da pyarrow.dataset.Dataset
+        model eğitiminde kullanılacak veri seti
+    test_source : str, list, pyarrow.Table ya da pyarrow.dataset.Dataset
+        model testinde kullanılacak veri seti
+    columns : list
+        okunacak sütunlar. Verilmezse tüm sütunlar okunur.
+    filters : list ya da pyarrow.dataset.Expression
+        her iki veri setine uygulanacak satır filtreleri (ör. [("year", ">=", 2020)])
+
+    Returns
+    -------
+    DataCleaning
+    """
+
+    return cls(read_frame(train_source,columns,filters),read_frame(test_source,columns,filters))
+
   def show_duplicate_observations(self):
     """
     Yinelenen satırları analiz eder.
@@ -66,16 +111,44 @@ class DataCleaning:
 
     """
 
-    df_train_missing_cell = self.df_train.isna().sum()
+    # tüm tablonun isna() çerçevesi yerine sütun sütun paketlenmiş maskeler
+    df_train_missing_cell = MissingnessBitmap.from_frame(self.df_train).missing_counts()
     
-    df_test_missing_cell = self.df_test.isna().sum()
+    df_test_missing_cell = MissingnessBitmap.from_frame(self.df_test).missing_counts()
 
     return {"df_train" : df_train_missing_cell,
     "df_test" :df_test_missing_cell}
 
+  def missingness_patterns(self,top:int=10):
+    """
+    df_train'deki kayıp değer desenlerini, kayıp tedavisini planlamak için
+    çıkarır (bkz. missingness). Kayıp hücre maskeleri hücre başına bir bit
+    olarak paketlenir.
+
+    Parameters
+    ----------
+    top : int
+        dönderilecek en sık desen sayısı
+
+    Returns
+    -------
+    dict
+        co_missingness : sütun çiftlerinin birlikte kayıp olduğu satır sayıları
+        patterns : en sık kayıp desenleri, sayıları ve payları
+        pattern_count : farklı kayıp desenlerinin sayısı
+        drop_impact : her sütun silindiğinde tam dolu hale gelecek satırlar
+    """
+
+    bitmap = MissingnessBitmap.from_frame(self.df_train)
 
+    return {"co_missingness" : bitmap.co_missingness(),
+    "patterns" : bitmap.patterns(top),
+    "pattern_count" : bitmap.pattern_count(),
+    "drop_impact" : bitmap.drop_impact()}
 
-  def missing_values_treatment(self,feature=None,strategy="delete",n_neighbors=3):
+
+
+  def missing_values_treatment(self,feature=None,strategy="delete",n_neighbors=3,verbose=True):
     """
     Kayıp hücreleri tedavi ediyor. Kullanılan yöntemler:
       - Sütunu silme
@@ -87,10 +160,14 @@ class DataCleaning:
 
     Parameters
     ----------
-    feature : string
-        tedavi edilecek sütun/özellik ismi
+    feature : string ya da list
+        tedavi edilecek sütun/özellik ismi. delete ve mode yöntemlerinde
+        sütun isimlerinden oluşan bir liste de verilebilir.
     strategy : string
         tedavi yöntemi
+    verbose : bool
+        doldurma değerinin ekrana yazılıp yazılmayacağı. Değer her durumda
+        ölçüm katmanına (instrumentation) olay olarak da gönderilir.
     """
 
 
@@ -98,7 +175,13 @@ class DataCleaning:
     test_na_index = None
     train_na_index = None
 
-    if strategy != "KNN":
+    is_list = isinstance(feature, (list, tuple, pd.Index))
+
+    features = list(feature) if is_list else [feature]
+
+    assert not is_list or strategy in ("delete","mode"), "Birden fazla sütun yalnızca delete ve mode yöntemleriyle tedavi edilebilir."
+
+    if strategy not in ("KNN","mode"):
     
       train_notna_index = self.df_train.loc[:,feature].notna().values
 
@@ -116,7 +199,10 @@ class DataCleaning:
 
       mean_for_missing_values = self.df_train.loc[train_notna_index,feature].mean()
 
-      print("Mean : ",mean_for_missing_values)
+      record_value("DataCleaning.missing_values_treatment", feature=feature, strategy=strategy, value=mean_for_missing_values)
+
+      if verbose:
+        print("Mean : ",mean_for_missing_values)
 
       self.df_train.loc[train_na_index,feature] = mean_for_missing_values
 
@@ -124,25 +210,38 @@ class DataCleaning:
     
     elif strategy == "mode":
 
-      mode_for_missing_values = self.df_train.loc[train_notna_index,feature].mode()[0]
+      # birden fazla sütunun modu tek seferde (paralel) hesaplanır
+      modes_for_missing_values = column_modes(self.df_train, features)
+
+      mode_for_missing_values = modes_for_missing_values.to_dict() if is_list else modes_for_missing_values.iloc[0]
       
-      print("Mode : ",mode_for_missing_values)
+      record_value("DataCleaning.missing_values_treatment", feature=feature, strategy=strategy, value=mode_for_missing_values)
+
+      if verbose:
+        print("Mode : ",mode_for_missing_values)
+
+      fill_values = modes_for_missing_values.to_dict()
 
-      self.df_train.loc[train_na_index,feature] = mode_for_missing_values
+      self.df_train = self.df_train.fillna(fill_values)
 
-      self.df_test.loc[test_na_index,feature] = mode_for_missing_values
+      self.df_test = self.df_test.fillna(fill_values)
 
     elif strategy == "median":
 
       median_for_missing_values = self.df_train.loc[train_notna_index,feature].median()
 
-      print("Median : ",median_for_missing_values)
+      record_value("DataCleaning.missing_values_treatment", feature=feature, strategy=strategy, value=median_for_missing_values)
+
+      if verbose:
+        print("Median : ",median_for_missing_values)
 
       self.df_train.loc[train_na_index,feature] = median_for_missing_values
 
       self.df_test.loc[test_na_index,feature] = median_for_missing_values
     
     elif strategy =="KNN" :
+      from sklearn.impute import KNNImputer
+
       imputer = KNNImputer(n_neighbors=n_neighbors)
 
       imputer.fit(self.df_train)
@@ -152,11 +251,109 @@ class DataCleaning:
       self.df_test=pd.DataFrame(data=imputer.transform(self.df_test),columns=self.variables)
 
 
+  def group_missing_values_treatment(self,features:list=None,by=None,strategy="median",min_count:int=1,verbose=True):
+    """
+    Kayıp hücreleri, satırın ait olduğu grubun (ör. bölge) df_train'deki
+    ortalaması, medyanı ya da moduyla doldurur. İstatistikler df_train'de
+    tüm sütunlar için tek seferde öğrenilir ve hem df_train'e hem df_test'e
+    uygulanır. df_train'de görülmemiş ya da az dolu gruplar df_train'in
+    genel istatistiğiyle doldurulur. Öğrenilen istatistikler group_imputer
+    olarak saklanır; canlı skorlama verileri de group_imputer.transform ile
+    doldurulabilir.
+
+    Parameters
+    ----------
+    features : list
+        tedavi edilecek sütunlar. Verilmezse by dışındaki tüm sütunlar.
+    by : string ya da list
+        grupları belirleyen sütun(lar)
+    strategy : string ya da dict
+        "mean", "median", "mode" ya da sütun isminden yönteme bir sözlük.
+        "mean" ya da "median" verilirse sayısal olmayan sütunlar mod ile
+        doldurulur.
+    min_count : int
+        bir grubun istatistiğinin kullanılması için gereken en az dolu
+        hücre sayısı
+    verbose : bool
+        grup sayısının ve genel istatistiğe düşen grup sayılarının ekrana
+        yazılıp yazılmayacağı
+
+    Assertions
+    ------
+    AssertionError
+        by verilmemişse ya da strategy tanımlı değilse.
+    """
+
+    assert by is not None, "by değeri verilmelidir."
+
+    self.group_imputer = GroupImputer.fit(self.df_train, by=by, features=features, strategy=strategy, min_count=min_count)
+
+    record_value("DataCleaning.group_missing_values_treatment", by=by, strategy=strategy,
+                 groups=len(self.group_imputer.groups), fallbacks=self.group_imputer.fallback_counts)
+
+    if verbose:
+      print("Groups : ",len(self.group_imputer.groups))
+      print("Fallbacks : ",self.group_imputer.fallback_counts)
+
+    self.df_train = self.group_imputer.transform(self.df_train)
+
+    self.df_test = self.group_imputer.transform(self.df_test)
+
+  def model_missing_values_treatment(self,features:list=None,estimator=None,max_iter:int=10,tol:float=1e-3,
+                                     max_samples:int=None,backend=None,batch_size:int=100_000,
+                                     update:str="sequential",verbose=True):
+    """
+    Kayıp hücreleri, her sütunu diğer sayısal sütunlardan tahmin eden
+    modellerle yinelemeli olarak doldurur (bkz. modelimpute). Modeller
+    df_train'de eğitilir; df_test eğitilmiş modellerle parçalar halinde
+    doldurulur. Eğitilmiş modeller model_imputer olarak saklanır.
+
+    Parameters
+    ----------
+    features : list
+        kullanılacak sayısal sütunlar. Verilmezse tüm sayısal sütunlar.
+    estimator : sklearn regresyon modeli
+        her sütun için kopyalanacak model. Verilmezse BayesianRidge.
+    max_iter : int
+        en fazla tur sayısı
+    tol : float
+        turdaki en büyük değişim, tol ile gözlenen en büyük mutlak
+        (ölçeklenmiş) değerin çarpımından küçükse durulur
+    max_samples : int
+        her modelin eğitileceği en fazla dolu satır sayısı
+    backend : str ya da nesne
+        test parçalarının ve update="parallel" ise sütun modellerinin
+        dağıtılacağı arka uç ("serial", "process", "dask")
+    batch_size : int
+        df_test'in bir parçasındaki satır sayısı
+    update : string
+        "sequential" (her sütun sırayla, Gauss-Seidel) ya da "parallel"
+        (sütunlar arka uçlarda birlikte, sönümlü Jacobi)
+    verbose : bool
+        tur sayısının ve son turdaki değişimin ekrana yazılıp yazılmayacağı
+    """
+
+    self.model_imputer = ModelImputer(estimator=estimator, max_iter=max_iter, tol=tol, max_samples=max_samples,
+                                      backend=backend, batch_size=batch_size, update=update)
+
+    self.df_train = self.model_imputer.fit_transform(self.df_train, features)
+
+    self.df_test = self.model_imputer.transform(self.df_test)
+
+    change = self.model_imputer.history[-1] if self.model_imputer.history else 0.0
+
+    record_value("DataCleaning.model_missing_values_treatment", rounds=self.model_imputer.n_rounds, change=change)
+
+    if verbose:
+      print("Rounds : ",self.model_imputer.n_rounds)
+      print("Change : ",change)
+
   def outlier_detection(self,feature=None,
                         strategy="inter_quartile_range",
                         n_estimators=50,
                         max_samples='auto',
-                        contamination=0.10):
+                        contamination=0.10,
+                        verbose=True):
     """
     Aykırı değerleri tespit etme.Kullanılan yöntemler:
       - Çeyrekler arası aralık
@@ -174,6 +371,9 @@ class DataCleaning:
         her bir ağacı eğitmek için çekilecek örnek sayısını belirtir.(izolasyon Ormanı yöntemi ile ilgili)
     contamination : float
         veri setindeki aykırı değerlerin beklenen oran(izolasyon Ormanı yöntemi ile ilgili)
+    verbose : bool
+        sınırların ekrana yazılıp yazılmayacağı. Sınırlar her durumda ölçüm
+        katmanına (instrumentation) olay olarak da gönderilir.
 
     Returns
     -------
@@ -193,11 +393,18 @@ class DataCleaning:
         lower_limit = Q1-1.5*IQR
         upper_limit = Q3+1.5*IQR
 
-        print("Alt sınır : ",lower_limit,"\nÜst sınır : ",upper_limit)
+        # tedavi aşamasında çeyrekler yeniden hesaplanmasın diye saklanır
+        self.outlier_limits[feature] = (lower_limit, upper_limit)
+        self.__outlier_fingerprints[feature] = column_fingerprint(self.df_train[feature])
+
+        record_value("DataCleaning.outlier_detection", feature=feature, lower_limit=lower_limit, upper_limit=upper_limit)
 
-        out_train = np.array(self.df_train[feature] > lower_limit) & (self.df_train[feature] < upper_limit) == False
+        if verbose:
+          print("Alt sınır : ",lower_limit,"\nÜst sınır : ",upper_limit)
 
-        out_test = np.array(self.df_test[feature] > lower_limit) & (self.df_test[feature] < upper_limit) == False
+        out_train = self.__outliers(self.df_train[feature], lower_limit, upper_limit).values
+
+        out_test = self.__outliers(self.df_test[feature], lower_limit, upper_limit).values
         
         #aykırı değerler  
         df_train_outliers = self.df_train.loc[out_train]
@@ -206,6 +413,8 @@ class DataCleaning:
     
     elif strategy == "isolation_forest":
 
+        from sklearn.ensemble import IsolationForest
+
         forest_model=IsolationForest(n_estimators=n_estimators, 
         contamination=contamination)
 
@@ -237,3 +446,176 @@ class DataCleaning:
     outliers = df_train[model.labels_ == -1]
     model.labels_ 
     """
+
+
+  def __outliers(self,values=None,lower_limits=None,upper_limits=None):
+    """
+    Aykırı hücre maskesi. Tespit ve tedavi aynı karşılaştırmayı kullanır:
+    sınırların dışındaki değerler aykırıdır, sınıra eşit değerler ve kayıp
+    hücreler aykırı değildir.
+
+    Parameters
+    ----------
+    values : pd.core.series.Series ya da pd.core.frame.DataFrame
+        değerler
+    lower_limits, upper_limits : float ya da pd.Series
+        alt ve üst sınırlar (Veri Çerçevesinde sütun isimleriyle indekslenmiş)
+
+    Returns
+    -------
+    pd.core.series.Series ya da pd.core.frame.DataFrame
+    """
+
+    if isinstance(values, pd.DataFrame):
+      return values.lt(lower_limits,axis=1) | values.gt(upper_limits,axis=1)
+
+    return values.lt(lower_limits) | values.gt(upper_limits)
+
+  def __inter_quartile_range_limits(self,features:list=None):
+    """
+    Sütunların çeyrekler arası aralık sınırlarını dönderir. outlier_detection
+    ile daha önce hesaplanmış sınırlar, sütun o zamandan beri değişmemişse
+    yeniden kullanılır; eksik ya da eskimiş olanların çeyrekleri tek bir
+    quantile çağrısı ile birlikte hesaplanır.
+
+    Parameters
+    ----------
+    features : list
+        sınırları istenen sütun/özellik isimleri
+
+    Returns
+    -------
+    tuple
+        sütun isimleriyle indekslenmiş alt ve üst sınırlar (pd.Series, pd.Series)
+
+    """
+
+    fingerprints = {feature: column_fingerprint(self.df_train[feature]) for feature in features}
+
+    not_computed = [feature for feature in features
+                    if feature not in self.outlier_limits
+                    or self.__outlier_fingerprints.get(feature) != fingerprints[feature]]
+
+    if not_computed:
+
+      quartiles = self.df_train.loc[:,not_computed].quantile([0.25,0.75])
+      IQR = quartiles.loc[0.75] - quartiles.loc[0.25]
+      lower_limits = quartiles.loc[0.25]-1.5*IQR
+      upper_limits = quartiles.loc[0.75]+1.5*IQR
+
+      for feature in not_computed:
+        self.outlier_limits[feature] = (lower_limits[feature], upper_limits[feature])
+        self.__outlier_fingerprints[feature] = fingerprints[feature]
+
+    limits = pd.DataFrame([self.outlier_limits[feature] for feature in features],
+                          index=features, columns=["lower","upper"])
+
+    return limits["lower"], limits["upper"]
+
+
+  def outlier_treatment(self,features:list=None,strategy="cut_off"):
+    """
+    Aykırı değerleri tedavi eder. Sınırlar outlier_detection aşamasında
+    saklananlardan alınır (sütun o zamandan beri değiştiyse yeniden
+    hesaplanır) ve tüm sütunlara tek seferde, vektörel olarak uygulanır.
+    Aykırı değerler outlier_detection ile aynı şekilde, sınırların
+    dışındaki değerlerdir. Kullanılan yöntemler:
+      - Sınırlara kırpma (winsorization)
+      - Aykırı satırları silme (yalnızca df_train; skorlama anında satır
+        silinemeyeceği için df_test'e dokunulmaz)
+      - Ortalama ile doldurma tedavisi
+      - Medyan ile doldurma tedavisi
+
+    Logaritma ve sepetleme (binning) gibi dönüşümler bu metodun kapsamında
+    değildir.
+
+    Parameters
+    ----------
+    features : list
+        tedavi edilecek sütun/özellik isimleri. Verilmezse outlier_detection
+        ile sınırları hesaplanmış tüm sütunlar kullanılır.
+    strategy : string
+        tedavi yöntemi ("cut_off", "delete", "mean", "median")
+
+    Assertions
+    ------
+    AssertionError
+        tedavi edilecek sütun yoksa ya da strategy tanımlı değilse.
+
+    """
+
+    assert strategy in ("cut_off","delete","mean","median"), "strategy değeri cut_off, delete, mean ya da median olmalıdır."
+
+    if features is None:
+      features = list(self.outlier_limits)
+
+    assert len(features) > 0, "tedavi edilecek sütunlar verilmeli ya da önce outlier_detection çalıştırılmalıdır."
+
+    lower_limits, upper_limits = self.__inter_quartile_range_limits(features)
+
+    fill_values = None
+
+    if strategy in ("mean","median"):
+
+      # doldurma değerleri yalnızca df_train'deki aykırı olmayan değerlerden hesaplanır
+      train_values = self.df_train.loc[:,features]
+      inliers = train_values.mask(self.__outliers(train_values,lower_limits,upper_limits))
+      fill_values = inliers.mean() if strategy == "mean" else inliers.median()
+
+    def treat(df):
+
+      values = df.loc[:,features]
+
+      if strategy == "cut_off":
+        df[features] = values.clip(lower=lower_limits, upper=upper_limits, axis=1)
+        return df
+
+      out = self.__outliers(values,lower_limits,upper_limits)
+
+      if strategy == "delete":
+        return df.loc[~out.any(axis=1).values]
+
+      df[features] = values.mask(out, fill_values, axis=1)
+      return df
+
+    self.df_train = treat(self.df_train)
+
+    # test satırları silinmez; yalnızca kırpma ve doldurma uygulanır
+    if strategy != "delete":
+      self.df_test = treat(self.df_test)
+
+
+  def data_drift(self,n_bins:int=20,psi_threshold:float=0.2,alpha:float=0.05,refit:bool=False):
+    """
+    df_train ile df_test arasındaki dağılım kaymasını tüm sütunlar için
+    hesaplar. df_train profili ilk çağrıda bir kez çıkarılıp drift_profile
+    olarak saklanır; canlı skorlama verileri de bu profil ile
+    (drift_profile.compare) eğitim verisi yeniden yüklenmeden
+    karşılaştırılabilir. Kullanılan ölçüler:
+      - Popülasyon Kararlılık İndeksi (PSI)
+      - Kolmogorov-Smirnov (KS) (sürekli değişkenler)
+      - Ki-Kare homojenlik testi
+
+    Parameters
+    ----------
+    n_bins : int
+        sürekli değişkenler için sepet sayısı
+    psi_threshold : float
+        kayma olarak işaretlemek için PSI eşiği
+    alpha : float
+        KS ve Ki-Kare testleri için anlamlılık düzeyi
+    refit : bool
+        df_train değiştiyse (ör. tedavilerden sonra) profili yeniden çıkarır
+
+    Returns
+    -------
+    pd.core.frame.DataFrame
+        sütun bazında psi, ks_statistic, ks_p_value, chi2, chi2_p_value ve drift
+
+    """
+
+    if self.drift_profile is None or refit or self.drift_profile.n_bins != n_bins:
+
+      self.drift_profile = DriftProfile.fit(self.df_train, n_bins=n_bins)
+
+    return self.drift_profile.compare(self.df_test, psi_threshold=psi_threshold, alpha=alpha)
@@ -0,0 +1,351 @@
+"""
+Eğitim verisi ile test / canlı skorlama verisi arasındaki dağılım kayması
+(data drift) analizi.
+
+Eğitim verisinden bir kez küçük bir profil (sürekli değişkenler için
+çeyreklik sınırlı histogramlar, kategorik değişkenler için kategori
+frekansları) çıkarılır. Karşılaştırılan veri aynı sınırlara göre sayılır
+ve PSI, KS ve Ki-Kare değerleri tüm sütunlar için tek seferde, matrisler
+üzerinde hesaplanır. Eğitim verisinin yeniden yüklenmesi gerekmez.
+
+Notlar:
+  * Kayıp değerler histogramlarda ayrı bir sepet (bin) olarak PSI ve
+    Ki-Kare hesabına katılır, KS hesabına katılmaz.
+  * KS istatistiği ham veri yerine profil sepetlerinin birikimli
+    dağılımlarından hesaplanır; bu nedenle gerçek değerin bir alt sınırıdır
+    ve sepet sayısı arttıkça gerçek değere yaklaşır.
+  * Eğitimde görülmemiş kategoriler ortak bir "diğer" sepetinde sayılır.
+  * save / to_dict kategorileri tipleriyle birlikte saklar (tamsayı, tarih,
+    süre vb.), böylece yüklenen profil aynı değerleri aynı sepetlere sayar.
+"""
+
+import datetime
+import json
+
+import numpy as np
+import pandas as pd
+
+
+def _encode_value(value):
+  """object tipli kategorilerde JSON'da tipini kaybedecek değerleri etiketler."""
+
+  if isinstance(value, np.generic) and not isinstance(value, (np.datetime64, np.timedelta64)):
+    value = value.item()
+
+  if value is None or isinstance(value, (bool, int, float, str)):
+    return value
+
+  if isinstance(value, (datetime.datetime, np.datetime64)):
+    return {"type": "timestamp", "value": pd.Timestamp(value).isoformat()}
+
+  if isinstance(value, datetime.date):
+    return {"type": "date", "value": value.isoformat()}
+
+  if isinstance(value, (datetime.timedelta, np.timedelta64)):
+    return {"type": "timedelta", "value": pd.Timedelta(value).isoformat()}
+
+  if isinstance(value, tuple):
+    return {"type": "tuple", "value": [_encode_value(item) for item in value]}
+
+  raise TypeError(f"{type(value).__name__} tipindeki kategori değeri saklanamıyor: {value!r}")
+
+
+def _decode_value(value):
+
+  if not isinstance(value, dict):
+    return value
+
+  if value["type"] == "timestamp":
+    return pd.Timestamp(value["value"])
+
+  if value["type"] == "date":
+    return datetime.date.fromisoformat(value["value"])
+
+  if value["type"] == "timedelta":
+    return pd.Timedelta(value["value"])
+
+  return tuple(_decode_value(item) for item in value["value"])
+
+
+def _encode_categories(categories):
+  """Kategorileri dtype bilgisiyle birlikte JSON'a uygun bir sözlüğe çevirir."""
+
+  if isinstance(categories.dtype, pd.CategoricalDtype):
+    categories = pd.Index(categories.astype(categories.dtype.categories.dtype))
+
+  dtype = categories.dtype
+
+  if dtype.kind in "mM":
+    values = [value.isoformat() for value in categories]
+  elif dtype == object:
+    values = [_encode_value(value) for value in categories]
+  else:
+    values = categories.tolist()
+
+  return {"dtype": str(dtype), "values": values}
+
+
+def _decode_categories(data):
+
+  # dtype bilgisi olmadan saklanmış eski profiller
+  if isinstance(data, list):
+    return pd.Index(data)
+
+  dtype = pd.api.types.pandas_dtype(data["dtype"])
+  values = data["values"]
+
+  if dtype.kind == "M":
+    return pd.Index(pd.to_datetime(values, format="ISO8601", utc=getattr(dtype, "tz", None) is not None)).astype(dtype)
+
+  if dtype.kind == "m":
+    return pd.Index(pd.to_timedelta(values)).astype(dtype)
+
+  if dtype == object:
+    return pd.Index([_decode_value(value) for value in values], dtype=object)
+
+  return pd.Index(values, dtype=dtype)
+
+
+class DriftProfile:
+  """
+  Dağılım kayması karşılaştırmaları için eğitim verisi profili
+
+  """
+
+  def __init__(self, continuous_variables: list = None,
+               categorical_variables: list = None,
+               n_bins: int = 20):
+    """
+    Parameters
+    ----------
+    continuous_variables : list
+        sürekli değişkenler
+    categorical_variables : list
+        kategorik değişkenler
+    n_bins : int
+        sürekli değişkenler için en fazla sepet sayısı
+    """
+
+    self.continuous_variables = list(continuous_variables or [])
+
+    self.categorical_variables = list(categorical_variables or [])
+
+    self.n_bins = n_bins
+
+    # sürekli değişkenler için iç sınırlar (uçlar -inf / +inf kabul edilir)
+    self.bin_edges = {}
+
+    # kategorik değişkenler için eğitimde görülen kategoriler
+    self.categories = {}
+
+    # her değişken için sepet sayıları; son iki sepet sırasıyla "diğer" (yalnızca
+    # kategoriklerde dolu olabilir) ve kayıp değerlerdir
+    self.counts = {}
+
+  @classmethod
+  def fit(cls, df: pd.core.frame.DataFrame = None,
+          continuous_variables: list = None,
+          categorical_variables: list = None,
+          n_bins: int = 20):
+    """Bir Veri Çerçevesinden (genellikle eğitim verisi) profil oluşturur.
+    Değişkenler verilmezse sayısal sütunlar sürekli, diğerleri kategorik
+    kabul edilir.
+
+    Returns
+    -------
+    DriftProfile
+    """
+
+    if continuous_variables is None:
+      continuous_variables = df.select_dtypes(include="number").columns.tolist()
+
+    if categorical_variables is None:
+      categorical_variables = [column for column in df.columns if column not in continuous_variables]
+
+    profile = cls(continuous_variables, categorical_variables, n_bins)
+
+    if profile.continuous_variables:
+
+      quantiles = df.loc[:, profile.continuous_variables].quantile(np.linspace(0, 1, n_bins + 1)[1:-1])
+
+      for variable in profile.continuous_variables:
+        profile.bin_edges[variable] = np.unique(quantiles[variable].dropna().to_numpy(dtype=np.float64))
+
+    for variable in profile.categorical_variables:
+      profile.categories[variable] = pd.Index(df.loc[:, variable].dropna().unique())
+
+    profile.counts = profile.histograms(df)
+
+    return profile
+
+  def histograms(self, df: pd.core.frame.DataFrame = None):
+    """Bir Veri Çerçevesini profildeki sepetlere göre sayar.
+
+    Returns
+    -------
+    dict
+        değişken -> sepet sayıları (np.ndarray)
+    """
+
+    counts = {}
+
+    for variable in self.continuous_variables:
+
+      values = df.loc[:, variable].to_numpy(dtype=np.float64)
+      edges = self.bin_edges[variable]
+
+      codes = np.searchsorted(edges, values, side="right")
+      codes[np.isnan(values)] = edges.size + 2
+
+      counts[variable] = np.bincount(codes, minlength=edges.size + 3)
+
+    for variable in self.categorical_variables:
+
+      column = df.loc[:, variable]
+      categories = self.categories[variable]
+
+      codes = categories.get_indexer(column)
+      codes[codes == -1] = categories.size
+      codes[column.isna().to_numpy()] = categories.size + 1
+
+      counts[variable] = np.bincount(codes, minlength=categories.size + 2)
+
+    return counts
+
+  def __count_matrix(self, counts: dict = None, variables: list = None):
+    """Farklı uzunluktaki sepet sayılarını sıfırla doldurarak tek bir
+    (değişken, sepet) matrisine yerleştirir.
+    """
+
+    width = max((counts[variable].size for variable in variables), default=0)
+
+    matrix = np.zeros((len(variables), width))
+
+    for row, variable in enumerate(variables):
+      matrix[row, :counts[variable].size] = counts[variable]
+
+    return matrix
+
+  def compare(self, df: pd.core.frame.DataFrame = None, epsilon: float = 1e-4,
+              psi_threshold: float = 0.2, alpha: float = 0.05):
+    """Bir Veri Çerçevesinin (test verisi ya da canlı skorlama verisi)
+    profile göre kaymasını hesaplar.
+
+    Parameters
+    ----------
+    df : pd.core.frame.DataFrame
+        karşılaştırılacak veri seti
+    epsilon : float
+        PSI hesabında boş sepetlerin oranına eklenen küçük değer
+    psi_threshold : float
+        kayma olarak işaretlemek için PSI eşiği (0.1 küçük, 0.2 büyük kayma
+        olarak yorumlanır)
+    alpha : float
+        KS ve Ki-Kare testleri için anlamlılık düzeyi
+
+    Returns
+    -------
+    pd.core.frame.DataFrame
+        her değişken için psi, ks_statistic, ks_p_value, chi2, chi2_p_value ve drift
+    """
+
+    from scipy.stats import chi2 as chi2_distribution
+    from scipy.stats import kstwobign
+
+    variables = self.continuous_variables + self.categorical_variables
+
+    expected = self.__count_matrix(self.counts, variables)
+    actual = self.__count_matrix(self.histograms(df), variables)
+
+    expected_total = expected.sum(axis=1, keepdims=True)
+    actual_total = actual.sum(axis=1, keepdims=True)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+
+      # PSI : sum((a - e) * ln(a / e))
+      expected_ratio = expected / expected_total + epsilon
+      actual_ratio = actual / actual_total + epsilon
+      used = (expected > 0) | (actual > 0)
+      psi = np.where(used, (actual_ratio - expected_ratio) * np.log(actual_ratio / expected_ratio), 0.0).sum(axis=1)
+
+      # iki örneklem Ki-Kare homojenlik testi (2 x sepet çapraz tablo)
+      column_total = expected + actual
+      grand_total = expected_total + actual_total
+      expected_in_train = expected_total * column_total / grand_total
+      expected_in_actual = actual_total * column_total / grand_total
+      chi2 = np.where(used, (expected - expected_in_train) ** 2 / expected_in_train
+                      + (actual - expected_in_actual) ** 2 / expected_in_actual, 0.0).sum(axis=1)
+      degrees_of_freedom = used.sum(axis=1) - 1
+      chi2_p_value = np.where(degrees_of_freedom > 0, chi2_distribution.sf(chi2, np.maximum(degrees_of_freedom, 1)), 1.0)
+
+    n_continuous = len(self.continuous_variables)
+
+    ks_statistic = np.full(len(variables), np.nan)
+    ks_p_value = np.full(len(variables), np.nan)
+
+    if n_continuous:
+
+      # kayıp değer ve "diğer" sepetleri KS hesabına katılmaz
+      last_bins = np.array([self.bin_edges[variable].size + 1 for variable in self.continuous_variables])
+      in_range = np.arange(expected.shape[1])[None, :] < last_bins[:, None]
+
+      expected_values = np.where(in_range, expected[:n_continuous], 0.0)
+      actual_values = np.where(in_range, actual[:n_continuous], 0.0)
+      n_expected = expected_values.sum(axis=1)
+      n_actual = actual_values.sum(axis=1)
+
+      with np.errstate(invalid="ignore", divide="ignore"):
+        distance = np.abs(np.cumsum(expected_values, axis=1) / n_expected[:, None]
+                          - np.cumsum(actual_values, axis=1) / n_actual[:, None]).max(axis=1)
+        effective_size = np.sqrt(n_expected * n_actual / (n_expected + n_actual))
+
+      ks_statistic[:n_continuous] = distance
+      ks_p_value[:n_continuous] = kstwobign.sf(distance * effective_size)
+
+    result = pd.DataFrame({"psi": psi,
+                           "ks_statistic": ks_statistic,
+                           "ks_p_value": ks_p_value,
+                           "chi2": chi2,
+                           "chi2_p_value": chi2_p_value},
+                          index=variables)
+
+    result["drift"] = (result["psi"] > psi_threshold) | (result["chi2_p_value"] < alpha) | (result["ks_p_value"] < alpha)
+
+    return result
+
+  def to_dict(self):
+    """Profili JSON ile saklanabilir bir sözlüğe çevirir."""
+
+    return {
+      "continuous_variables": self.continuous_variables,
+      "categorical_variables": self.categorical_variables,
+      "n_bins": self.n_bins,
+      "bin_edges": {variable: edges.tolist() for variable, edges in self.bin_edges.items()},
+      "categories": {variable: _encode_categories(categories) for variable, categories in self.categories.items()},
+      "counts": {variable: counts.tolist() for variable, counts in self.counts.items()},
+    }
+
+  @classmethod
+  def from_dict(cls, data: dict = None):
+    """to_dict ile oluşturulmuş sözlükten profili geri yükler."""
+
+    profile = cls(data["continuous_variables"], data["categorical_variables"], data["n_bins"])
+
+    profile.bin_edges = {variable: np.asarray(edges, dtype=np.float64) for variable, edges in data["bin_edges"].items()}
+    profile.categories = {variable: _decode_categories(categories) for variable, categories in data["categories"].items()}
+    profile.counts = {variable: np.asarray(counts, dtype=np.int64) for variable, counts in data["counts"].items()}
+
+    return profile
+
+  def save(self, path: str = None):
+    """Profili JSON dosyası olarak saklar."""
+
+    with open(path, "w") as file:
+      json.dump(self.to_dict(), file)
+
+  @classmethod
+  def load(cls, path: str = None):
+    """save ile saklanmış profili yükler."""
+
+    with open(path) as file:
+      return cls.from_dict(json.load(file))
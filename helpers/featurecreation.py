@@ -0,0 +1,853 @@
+import itertools
+import math
+import re
+import time
+
+import numpy as np
+import pandas as pd
+
+from .instrumentation import instrument_class, record_cache
+from .memo import column_fingerprint, frame_fingerprint
+
+
+@instrument_class
+class FeatureCreation:
+  """
+  Bir veri setinden yeni öznitelikler türetmek için kullanılan bir sınıf
+
+  """
+
+  # etkileşim işlemleri : (fonksiyon, sembol, yalnızca ikili mi, iki yönde mi)
+  # a-b ile b-a'nın mutlak korelasyonu aynı olduğundan fark tek yönde üretilir
+  __interaction_operations = {
+    "sum": (np.add, "+", False, False),
+    "difference": (np.subtract, "-", True, False),
+    "product": (np.multiply, "*", False, False),
+    "quotient": (np.divide, "/", True, True),
+  }
+
+  # tarih metinlerinin biçim kalıbı (rakamlar 0 yapılmış hali) -> strftime biçimi
+  # tüm örnekler arasında paylaşılır, aynı biçim bir kez tahmin edilir
+  __date_format_cache = {}
+
+  __datetime_feature_names = ("year", "month", "day", "day_of_week", "day_of_year",
+                              "quarter", "hour", "minute", "is_weekend", "is_holiday")
+
+  def __init__(self, df: pd.core.frame.DataFrame = None,
+               target_variable: str = None):
+    """
+    Parameters
+    ----------
+    df : pd.core.frame.DataFrame
+        kullanılacak veri seti
+    target_variable : str
+        hedef değişken
+    """
+
+    self.df = df
+
+    self.variables = df.columns.to_list()
+
+    self.__target_variable = self.set_target_variable(target_variable)
+
+    self.__parsed_datetimes = {}
+
+    self.sparse_class_tables = {}
+
+    self.threshold_rules = {}
+
+    self.__sufficient_statistics = {}
+
+  def __check_it_includes(self, main_list: list = None, sub_list: list = None):
+    """ Bir alt listede yer alan bütün elemanların, ana listede olup
+    olmadığını kontrol eder.
+
+    Parameters
+    ----------
+    main_list : list
+        ana liste
+    sub_list : list
+        alt liste
+
+    Returns
+    -------
+    boolean
+        Alt listedeki tüm elemanlar ana listedeyse True, değilse False
+    """
+
+    result = True
+
+    for sub_i in sub_list:
+      if not (sub_i in main_list):
+        result = False
+        break
+    return result
+
+  def set_target_variable(self, target_variable):
+    """Hedef değişkeni ayarlamada kullanılır
+
+    Parameters
+    ----------
+    target_variable : str
+        hedef değişken
+
+    Assertions
+    ------
+    AssertionError
+        target_variable degiskenin değeri,  veri setinde tanımlanmamışsa.
+
+    Returns
+    -------
+    str
+        hedef değişken
+    """
+
+    if target_variable is not None:
+      assert (self.__check_it_includes(self.variables,
+                                       [target_variable])), "target_variable degiskenin değeri,  veri setinde tanımlanmalıdır."
+
+    return target_variable
+
+  def get_target_variable(self):
+    """Hedef değişkeni dönderir
+
+    Returns
+    -------
+    str
+        hedef değişken
+    """
+
+    return self.__target_variable
+
+  def __absolute_correlation(self, block: np.ndarray = None, target: np.ndarray = None):
+    """Bir aday blok içindeki her sütunun hedef değişken ile mutlak
+    korelasyonunu hesaplar. Sonsuz ve kayıp değerler ilgili sütunda,
+    hedef değişkenin kayıp (ya da sonsuz) olduğu satırlar tüm sütunlarda
+    hesaba katılmaz.
+
+    Parameters
+    ----------
+    block : np.ndarray
+        (satır, aday) boyutunda aday öznitelikler
+    target : np.ndarray
+        hedef değişkenin değerleri
+
+    Returns
+    -------
+    np.ndarray
+        her aday için mutlak korelasyon katsayısı (hesaplanamıyorsa 0)
+    """
+
+    valid = np.isfinite(block) & np.isfinite(target)[:, None]
+
+    if valid.all():
+      # ortalaması yayılımından çok büyük adaylarda (ör. çarpımlar) sum(x^2) - n*ortalama^2
+      # sadeleşmeye (cancellation) uğrar; blok önce merkezlenir
+      target_centered = target - target.mean()
+      block_centered = block - block.mean(axis=0)
+      covariance = block_centered.T @ target_centered
+      block_sum_of_squares = np.einsum("ij,ij->j", block_centered, block_centered)
+      denominator = np.sqrt(block_sum_of_squares * (target_centered ** 2).sum())
+
+    else:
+      block = np.where(valid, block, 0.0)
+      counts = valid.sum(axis=0)
+      targets = np.where(valid, target[:, None], 0.0)
+      with np.errstate(invalid="ignore", divide="ignore"):
+        block_centered = np.where(valid, block - block.sum(axis=0) / counts, 0.0)
+        target_centered = np.where(valid, targets - targets.sum(axis=0) / counts, 0.0)
+      covariance = (block_centered * target_centered).sum(axis=0)
+      denominator = np.sqrt((block_centered ** 2).sum(axis=0) * (target_centered ** 2).sum(axis=0))
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+      score = np.abs(covariance / denominator)
+
+    return np.nan_to_num(score, nan=0.0, posinf=0.0, neginf=0.0)
+
+  def __interaction_candidates(self, n_features: int = None, operations: list = None, max_order: int = 2):
+    """Aday etkileşimleri (işlem, sütun indeksleri) olarak tembel biçimde üretir.
+    Fark ve bölüm yalnızca ikili etkileşimlerde, bölüm her iki yönde üretilir.
+    """
+
+    for order in range(2, max_order + 1):
+      for operation in operations:
+        _, _, only_pairwise, both_directions = self.__interaction_operations[operation]
+        if only_pairwise and order > 2:
+          continue
+        for combination in itertools.combinations(range(n_features), order):
+          yield operation, combination
+          if both_directions:
+            yield operation, combination[::-1]
+
+  def __compute_interactions(self, values: np.ndarray = None, operation: str = None, indices: np.ndarray = None):
+    """(aday, derece) boyutundaki sütun indeksleri için aynı işlemi
+    uygulayan etkileşim sütunlarını tek seferde hesaplar.
+    """
+
+    function = self.__interaction_operations[operation][0]
+
+    result = values[:, indices[:, 0]]
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+      for position in range(1, indices.shape[1]):
+        result = function(result, values[:, indices[:, position]])
+
+    return result
+
+  def interaction_features(self, features: list = None,
+                           operations: list = ("sum", "difference", "product", "quotient"),
+                           max_order: int = 2,
+                           top_k: int = 20,
+                           block_size: int = 256):
+    """Sürekli değişkenlerin toplam, fark, çarpım ve bölümlerinden oluşan
+    etkileşim özniteliklerini üretir. Tüm aday sütunlar bellekte
+    oluşturulmaz; adaylar block_size büyüklüğündeki bloklar halinde
+    hesaplanır, hedef değişken ile mutlak korelasyonlarına göre puanlanır
+    ve yalnızca en iyi top_k aday saklanır.
+
+    Parameters
+    ----------
+    features : list
+        etkileşimleri üretilecek sürekli değişkenler. Verilmezse hedef
+        değişken dışındaki tüm sayısal sütunlar kullanılır.
+    operations : list
+        kullanılacak işlemler ("sum", "difference", "product", "quotient")
+    max_order : int
+        bir etkileşimde yer alabilecek en fazla değişken sayısı. Fark ve
+        bölüm yalnızca ikili etkileşimlerde kullanılır.
+    top_k : int
+        saklanacak en iyi etkileşim sayısı
+    block_size : int
+        tek seferde bellekte hesaplanacak aday sayısı
+
+    Assertions
+    ------
+    AssertionError
+        hedef değişken tanımlanmamışsa, features veri setinde yoksa ya da
+        operations tanımlı değilse.
+
+    Returns
+    -------
+    dict
+        "features" : en iyi etkileşim sütunlarını içeren Veri Çerçevesi
+        "scores" : bu sütunların hedef değişken ile mutlak korelasyonu
+    """
+
+    assert self.__target_variable is not None, "interaction_features için target_variable tanımlanmalıdır."
+
+    if features is None:
+      features = [variable for variable in self.df.select_dtypes(include="number").columns
+                  if variable != self.__target_variable]
+
+    assert (self.__check_it_includes(self.variables, features)), "features degiskenin değerleri,  veri setinde tanımlanmalıdır."
+
+    assert (self.__check_it_includes(list(self.__interaction_operations), list(operations))), "operations değerleri sum, difference, product ya da quotient olmalıdır."
+
+    values = self.df.loc[:, features].to_numpy(dtype=np.float64)
+
+    target = self.df.loc[:, self.__target_variable].to_numpy(dtype=np.float64)
+
+    best_scores = np.empty(0)
+    best_candidates = []
+
+    candidates = self.__interaction_candidates(len(features), list(operations), max_order)
+
+    while True:
+
+      block = list(itertools.islice(candidates, block_size))
+
+      if not block:
+        break
+
+      block_scores = np.empty(len(block))
+
+      # aynı işlem ve dereceye sahip adaylar tek bir vektörel adımda hesaplanır
+      for (operation, order), group in itertools.groupby(enumerate(block), key=lambda item: (item[1][0], len(item[1][1]))):
+        group = list(group)
+        positions = np.array([position for position, _ in group])
+        indices = np.array([candidate[1] for _, candidate in group])
+        block_scores[positions] = self.__absolute_correlation(self.__compute_interactions(values, operation, indices), target)
+
+      scores = np.concatenate([best_scores, block_scores])
+      candidates_so_far = best_candidates + block
+
+      if scores.size > top_k:
+        kept = np.argpartition(-scores, top_k - 1)[:top_k]
+      else:
+        kept = np.arange(scores.size)
+
+      best_scores = scores[kept]
+      best_candidates = [candidates_so_far[index] for index in kept]
+
+    order = np.argsort(-best_scores, kind="stable")
+
+    new_features = {}
+    new_scores = {}
+
+    for index in order:
+      operation, combination = best_candidates[index]
+      symbol = self.__interaction_operations[operation][1]
+      name = symbol.join(features[position] for position in combination)
+      new_features[name] = self.__compute_interactions(values, operation, np.array([combination]))[:, 0]
+      new_scores[name] = best_scores[index]
+
+    return {"features": pd.DataFrame(new_features, index=self.df.index),
+            "scores": pd.Series(new_scores, dtype=np.float64)}
+
+  def __date_format(self, sample: str = None, dayfirst: bool = False):
+    """Bir tarih metninin biçimini, aynı kalıptaki metinler için önbellekten
+    dönderir; önbellekte yoksa tahmin eder ve saklar.
+    """
+
+    key = (re.sub(r"\d", "0", sample), dayfirst)
+
+    record_cache("FeatureCreation.date_format", key in self.__date_format_cache)
+
+    if key not in self.__date_format_cache:
+      self.__date_format_cache[key] = pd.tseries.api.guess_datetime_format(sample, dayfirst=dayfirst)
+
+    return self.__date_format_cache[key]
+
+  def __parse_datetime(self, feature: str = None, date_format: str = None, dayfirst: bool = False):
+    """Bir tarih sütununu bir kez çözümleyip 1970'ten bu yana geçen
+    nanosaniyeler (int64, NaT için en küçük int64) olarak dönderir. Metin
+    sütunlarında yalnızca benzersiz değerler çözümlenir. Sonuç aynı sütun,
+    date_format ve dayfirst için tekrar kullanılmak üzere sütunun parmak
+    iziyle saklanır; sütun değişmişse yeniden çözümlenir.
+    """
+
+    column = self.df.loc[:, feature]
+
+    key = (feature, date_format, dayfirst)
+
+    fingerprint = column_fingerprint(column)
+
+    cached = self.__parsed_datetimes.get(key)
+
+    record_cache("FeatureCreation.parsed_datetimes", cached is not None and cached[0] == fingerprint)
+
+    if cached is not None and cached[0] == fingerprint:
+      return cached[1]
+
+    if pd.api.types.is_datetime64_any_dtype(column.dtype):
+
+      if getattr(column.dt, "tz", None) is not None:
+        column = column.dt.tz_localize(None)
+
+      nanoseconds = column.to_numpy(dtype="datetime64[ns]").view(np.int64)
+
+    else:
+
+      codes, uniques = pd.factorize(column)
+
+      if date_format is None and len(uniques) > 0:
+        date_format = self.__date_format(str(uniques[0]), dayfirst)
+
+      parsed = pd.to_datetime(pd.Index(uniques), format=date_format, dayfirst=dayfirst)
+
+      if parsed.tz is not None:
+        parsed = parsed.tz_localize(None)
+
+      # -1 kodu kayıp değerlere karşılık gelir, sonuna eklenen NaT'ye düşer
+      parsed_nanoseconds = np.append(parsed.to_numpy(dtype="datetime64[ns]").view(np.int64),
+                                     np.iinfo(np.int64).min)
+
+      nanoseconds = parsed_nanoseconds.take(codes)
+
+    self.__parsed_datetimes[key] = (fingerprint, nanoseconds)
+
+    return nanoseconds
+
+  def datetime_features(self, feature: str = None,
+                        features: list = ("year", "month", "day", "day_of_week", "hour", "is_weekend"),
+                        holidays: list = None,
+                        date_format: str = None,
+                        dayfirst: bool = False):
+    """Bir tarih/zaman sütunundan alan ve zaman çıkarımları yapar
+    (ör. purchase_day_of_week). Sütun bir kez çözümlenir ve tüm öznitelikler
+    satır satır değil, int64 zaman damgaları üzerinde vektörel olarak
+    hesaplanır. Sonuçlar int8/int16 olarak saklanır; kayıp zamanlar -1 olur.
+
+    Türetilebilecek öznitelikler:
+      * year
+      * month
+      * day
+      * day_of_week (Pazartesi = 0)
+      * day_of_year
+      * quarter
+      * hour
+      * minute
+      * is_weekend
+      * is_holiday (holidays parametresi ile)
+
+    Parameters
+    ----------
+    feature : str
+        tarih/zaman değerleri içeren sütun
+    features : list
+        türetilecek özniteliklerin isimleri
+    holidays : list
+        tatil/özel gün olarak işaretlenecek tarihler
+        (ör. ["2021-12-25", "2021-11-26"])
+    date_format : str
+        metin sütunları için strftime biçimi. Verilmezse ilk değerden
+        tahmin edilir ve aynı kalıptaki sütunlar için önbellekte saklanır.
+    dayfirst : bool
+        biçim tahmin edilirken günün aydan önce geldiği kabul edilir
+
+    Assertions
+    ------
+    AssertionError
+        feature veri setinde yoksa ya da features tanımlı değilse.
+
+    Returns
+    -------
+    pd.core.frame.DataFrame
+        "<feature>_<öznitelik>" isimli sütunlardan oluşan Veri Çerçevesi
+    """
+
+    assert (self.__check_it_includes(self.variables, [feature])), "feature degiskenin değeri,  veri setinde tanımlanmalıdır."
+
+    assert (self.__check_it_includes(self.__datetime_feature_names, list(features))), "features değerleri " + ", ".join(self.__datetime_feature_names) + " olmalıdır."
+
+    assert ("is_holiday" not in features or holidays is not None), "is_holiday için holidays tanımlanmalıdır."
+
+    nanoseconds = self.__parse_datetime(feature, date_format, dayfirst)
+
+    missing = nanoseconds == np.iinfo(np.int64).min
+
+    timestamps = nanoseconds.view("datetime64[ns]")
+    days = timestamps.astype("datetime64[D]")
+    months = days.astype("datetime64[M]")
+    years = days.astype("datetime64[Y]")
+
+    nanoseconds_of_day = nanoseconds - days.astype(np.int64) * 86_400_000_000_000
+
+    def extract(name):
+
+      if name == "year":
+        return years.astype(np.int64) + 1970, np.int16
+      if name == "month":
+        return (months - years).astype(np.int64) + 1, np.int8
+      if name == "day":
+        return (days - months).astype(np.int64) + 1, np.int8
+      if name == "day_of_week":
+        # 1970-01-01 bir perşembe günüdür
+        return (days.astype(np.int64) + 3) % 7, np.int8
+      if name == "day_of_year":
+        return (days - years).astype(np.int64) + 1, np.int16
+      if name == "quarter":
+        return (months - years).astype(np.int64) // 3 + 1, np.int8
+      if name == "hour":
+        return nanoseconds_of_day // 3_600_000_000_000, np.int8
+      if name == "minute":
+        return nanoseconds_of_day // 60_000_000_000 % 60, np.int8
+      if name == "is_weekend":
+        return (days.astype(np.int64) + 3) % 7 >= 5, np.int8
+      if name == "is_holiday":
+        holiday_days = np.unique(pd.to_datetime(pd.Index(holidays)).to_numpy(dtype="datetime64[D]"))
+        return np.isin(days, holiday_days), np.int8
+
+    result = {}
+
+    for name in features:
+      values, dtype = extract(name)
+      result[feature + "_" + name] = np.where(missing, -1, values).astype(dtype)
+
+    return pd.DataFrame(result, index=self.df.index)
+
+  def fit_sparse_classes(self, feature: str = None, min_frequency: float = 0.05,
+                         other_label: str = "other", name: str = None):
+    """Kategorik bir sütundaki seyrek sınıfları tek bir sınıfta toplayan
+    arama tablosunu veri setinden öğrenir (ör. sold dışındakiler "other").
+    Tablo; öğrenilen kategoriler ve her kategorinin yeni sınıf koduna
+    karşılık gelen tamsayı dizisinden oluşur, representation_features ile
+    uygulanır.
+
+    Parameters
+    ----------
+    feature : str
+        kategorik sütun
+    min_frequency : float
+        bir sınıfın korunması için gereken en küçük görülme oranı
+    other_label : str
+        seyrek ve daha önce görülmemiş sınıfların toplanacağı sınıf. Sütunda
+        bu isimde sık bir sınıf varsa o da bu sınıfta toplanır.
+    name : str
+        oluşturulacak sütunun adı. Verilmezse "<feature>_grouped" kullanılır.
+
+    Assertions
+    ------
+    AssertionError
+        feature veri setinde tanımlanmamışsa.
+
+    Returns
+    -------
+    list
+        korunan sınıflar ve en sonda other_label
+    """
+
+    assert (self.__check_it_includes(self.variables, [feature])), "feature degiskenin değeri,  veri setinde tanımlanmalıdır."
+
+    frequencies = self.df.loc[:, feature].value_counts(normalize=True, dropna=True)
+
+    # other_label ile aynı isimli sınıf ayrı bir sınıf olarak korunmaz
+    kept = frequencies.index[frequencies.values >= min_frequency].drop(other_label, errors="ignore")
+
+    labels = kept.tolist() + [other_label]
+
+    # her öğrenilen kategorinin yeni kodu; seyrekler other_label'ın koduna gider
+    code_map = kept.get_indexer(frequencies.index)
+    code_map[code_map == -1] = len(kept)
+
+    # sona eklenen değer, görülmemiş kategorilerin (-1) düştüğü other_label kodudur
+    self.sparse_class_tables[name or feature + "_grouped"] = {
+      "feature": feature,
+      "categories": frequencies.index,
+      "code_map": np.append(code_map, len(kept)).astype(np.int32),
+      "labels": labels,
+    }
+
+    return labels
+
+  def fit_threshold_rule(self, feature: str = None, thresholds: list = None,
+                         labels: list = None, name: str = None):
+    """Sayısal bir sütun için eşik kuralını derler (ör. belli bir fiyatın
+    altı "poor"). Eşikler sıralı saklanır, indicator_features ile tek bir
+    searchsorted çağrısıyla uygulanır. Değer i. ve (i+1). eşik arasındaysa
+    i+1. sınıfa atanır (eşiğe eşit değerler üst sınıfa düşer).
+
+    Parameters
+    ----------
+    feature : str
+        sayısal sütun
+    thresholds : list
+        eşik değerleri. labels verilirse artan sırada olmalıdır; verilmezse
+        sıralanır.
+    labels : list
+        len(thresholds)+1 uzunluğunda, küçükten büyüğe aralıkların sınıf
+        isimleri. Verilmezse sınıf numaraları (tek eşik için 0/1 göstergesi)
+        dönderilir.
+    name : str
+        oluşturulacak sütunun adı. Verilmezse "<feature>_indicator" kullanılır.
+
+    Assertions
+    ------
+    AssertionError
+        feature veri setinde tanımlanmamışsa, labels uzunluğu uygun değilse
+        ya da labels verilmiş ve thresholds artan sırada değilse.
+    """
+
+    assert (self.__check_it_includes(self.variables, [feature])), "feature degiskenin değeri,  veri setinde tanımlanmalıdır."
+
+    assert (labels is None or len(labels) == len(thresholds) + 1), "labels uzunluğu thresholds uzunluğundan bir fazla olmalıdır."
+
+    thresholds = np.asarray(thresholds, dtype=np.float64)
+
+    # etiketler aralıklara sırayla eşlendiğinden etiketli kurallarda eşikler sıralanmaz
+    assert (labels is None or (np.diff(thresholds) > 0).all()), "labels verildiğinde thresholds artan sırada olmalıdır."
+
+    self.threshold_rules[name or feature + "_indicator"] = {
+      "feature": feature,
+      "thresholds": np.sort(thresholds),
+      "labels": labels,
+    }
+
+  def representation_features(self, df: pd.core.frame.DataFrame = None):
+    """fit_sparse_classes ile öğrenilmiş tabloları uygular. Her sütun için
+    kategoriler tamsayı kodlara çevrilir ve kod tablosundan tek bir take
+    ile yeni sınıflar elde edilir; satır bazında Python koşulu çalışmaz.
+
+    Parameters
+    ----------
+    df : pd.core.frame.DataFrame
+        tabloların uygulanacağı veri seti (ör. skorlanacak yeni veri).
+        Verilmezse sınıfın veri seti kullanılır.
+
+    Returns
+    -------
+    pd.core.frame.DataFrame
+        her tablo için kategorik bir sütun içeren Veri Çerçevesi
+    """
+
+    if df is None:
+      df = self.df
+
+    result = {}
+
+    for name, table in self.sparse_class_tables.items():
+
+      column = df.loc[:, table["feature"]]
+
+      if isinstance(column.dtype, pd.CategoricalDtype):
+        # kategorik sütunlarda yalnızca kategoriler eşlenir, kodlar yeniden kullanılır
+        category_codes = np.append(table["categories"].get_indexer(column.cat.categories), -1)
+        codes = category_codes.take(column.cat.codes.to_numpy())
+      else:
+        codes = table["categories"].get_indexer(column)
+
+      new_codes = table["code_map"].take(codes)
+      new_codes[column.isna().to_numpy()] = -1
+
+      result[name] = pd.Categorical.from_codes(new_codes, categories=table["labels"])
+
+    return pd.DataFrame(result, index=df.index)
+
+  def indicator_features(self, df: pd.core.frame.DataFrame = None):
+    """fit_threshold_rule ile derlenmiş eşik kurallarını uygular. Her
+    kural sütun üzerinde tek bir searchsorted çağrısıdır.
+
+    Parameters
+    ----------
+    df : pd.core.frame.DataFrame
+        kuralların uygulanacağı veri seti (ör. skorlanacak yeni veri).
+        Verilmezse sınıfın veri seti kullanılır.
+
+    Returns
+    -------
+    pd.core.frame.DataFrame
+        her kural için bir sütun içeren Veri Çerçevesi. Kayıp değerler
+        etiketli kurallarda NaN, etiketsiz kurallarda -1 olur.
+    """
+
+    if df is None:
+      df = self.df
+
+    result = {}
+
+    for name, rule in self.threshold_rules.items():
+
+      values = df.loc[:, rule["feature"]].to_numpy(dtype=np.float64)
+
+      codes = np.searchsorted(rule["thresholds"], values, side="right").astype(np.int16)
+      codes[np.isnan(values)] = -1
+
+      if rule["labels"] is None:
+        result[name] = codes.astype(np.int8) if len(rule["thresholds"]) < 127 else codes
+      else:
+        result[name] = pd.Categorical.from_codes(codes, categories=rule["labels"])
+
+    return pd.DataFrame(result, index=df.index)
+
+  def __centered_gram_matrix(self, features: list = None, chunk_size: int = 100_000):
+    """features ve hedef değişkenin merkezlenmiş çapraz çarpım (Gram)
+    matrisini veri üzerinde tek geçişte, satır blokları halinde hesaplar.
+    Kayıp değer içeren satırlar kullanılmaz. Sütunlar toplanmadan önce ilk
+    bloğun ortalamasıyla kaydırılır; ortalaması büyük sütunlarda duyarlılık
+    kaybolmaz. Sonuç sütunların parmak iziyle saklanır; aynı veri için
+    sonraki aramalar veriyi yeniden taramaz, veri değişmişse yeniden
+    hesaplanır.
+
+    Assertions
+    ------
+    AssertionError
+        hiçbir satır tam dolu değilse.
+
+    Returns
+    -------
+    tuple
+        (kullanılan satır sayısı, (p+1, p+1) boyutunda matris; son satır/sütun hedef)
+    """
+
+    key = frame_fingerprint(self.df, list(features) + [self.__target_variable])
+
+    record_cache("FeatureCreation.sufficient_statistics", key in self.__sufficient_statistics)
+
+    if key in self.__sufficient_statistics:
+      return self.__sufficient_statistics[key]
+
+    values = self.df.loc[:, list(features) + [self.__target_variable]].to_numpy(dtype=np.float64)
+
+    size = values.shape[1]
+    gram = np.zeros((size, size))
+    sums = np.zeros(size)
+    n_rows = 0
+    shift = None
+
+    for start in range(0, values.shape[0], chunk_size):
+      chunk = values[start:start + chunk_size]
+      chunk = chunk[~np.isnan(chunk).any(axis=1)]
+      if not chunk.shape[0]:
+        continue
+      # kaydırma çapraz çarpımları değiştirmez, yalnızca sadeleşmeyi önler
+      if shift is None:
+        shift = chunk.mean(axis=0)
+      chunk = chunk - shift
+      gram += chunk.T @ chunk
+      sums += chunk.sum(axis=0)
+      n_rows += chunk.shape[0]
+
+    assert n_rows > 0, "features ve hedef değişkenin birlikte dolu olduğu satır bulunmalıdır."
+
+    gram -= np.outer(sums, sums) / n_rows
+
+    self.__sufficient_statistics[key] = (n_rows, gram)
+
+    return n_rows, gram
+
+  def __sweep(self, matrix: np.ndarray = None, pivot: int = None):
+    """Simetrik bir matriste pivot üzerinde süpürme (sweep) işlemi yapar.
+    Süpürülmemiş satır/sütunlar, süpürülmüş değişkenlere göre kalan
+    (artık) kareler toplamlarını içerir.
+    """
+
+    diagonal = matrix[pivot, pivot]
+    row = matrix[pivot, :].copy()
+
+    matrix -= np.outer(row, row) / diagonal
+    matrix[pivot, :] = row / diagonal
+    matrix[:, pivot] = row / diagonal
+    matrix[pivot, pivot] = -1 / diagonal
+
+  def __fisher_z_p_value(self, partial_correlation: float = None, n_rows: int = None, n_conditioned: int = None):
+    """Kısmi korelasyonun sıfır olduğu hipotezi için Fisher z testinin
+    P-değerini hesaplar.
+    """
+
+    partial_correlation = min(abs(partial_correlation), 1 - 1e-12)
+
+    z = math.atanh(partial_correlation) * math.sqrt(max(n_rows - n_conditioned - 3, 1))
+
+    return math.erfc(z / math.sqrt(2))
+
+  def conjunctive_features(self, features: list = None,
+                           strategy: str = "linear_predictor",
+                           max_features: int = 10,
+                           tolerance: float = 0.001,
+                           alpha: float = 0.05,
+                           time_budget: float = None):
+    """Hedef değişkeni birlikte en iyi açıklayan öznitelik kümesini arar.
+    Kullanılan yöntemler:
+      - Doğrusal tahmin edici (linear_predictor) : ileri adımsal doğrusal
+        regresyon; her adımda kısmi R² artışı en büyük olan öznitelik eklenir.
+      - Markov örtüsü (markov_blanket) : IAMB; kısmi korelasyonun Fisher z
+        testi ile koşullu bağımsızlık sınanır, önce bağımlı öznitelikler
+        eklenir, sonra diğerlerine göre bağımsız kalanlar çıkarılır.
+
+    Veri yalnızca bir kez taranarak Gram matrisi oluşturulur ve saklanır;
+    aday eklemek bu matris üzerinde bir süpürme (sweep) adımıdır. Arama
+    max_features, tolerance/alpha ya da time_budget sınırlarından biri
+    aşıldığında erken durur. Kayıp değer içeren satırlar kullanılmaz.
+
+    Parameters
+    ----------
+    features : list
+        aday sürekli değişkenler. Verilmezse hedef değişken dışındaki tüm
+        sayısal sütunlar kullanılır.
+    strategy : str
+        arama yöntemi ("linear_predictor", "markov_blanket")
+    max_features : int
+        seçilecek en fazla öznitelik sayısı
+    tolerance : float
+        linear_predictor için bir özniteliğin eklenmesi için gereken en
+        küçük kısmi R² artışı
+    alpha : float
+        markov_blanket için koşullu bağımsızlık testinin anlamlılık düzeyi
+    time_budget : float
+        saniye cinsinden en fazla arama süresi
+
+    Assertions
+    ------
+    AssertionError
+        hedef değişken tanımlanmamışsa, features veri setinde yoksa ya da
+        strategy tanımlı değilse.
+
+    Returns
+    -------
+    dict
+        "selected" : seçilen özniteliklerin listesi
+        "scores" : seçilenlerin kısmi R² artışları (linear_predictor) ya da
+        P-değerleri (markov_blanket)
+        "stop_reason" : aramanın durma nedeni
+    """
+
+    assert self.__target_variable is not None, "conjunctive_features için target_variable tanımlanmalıdır."
+
+    assert strategy in ("linear_predictor", "markov_blanket"), "strategy değeri linear_predictor ya da markov_blanket olmalıdır."
+
+    if features is None:
+      features = [variable for variable in self.df.select_dtypes(include="number").columns
+                  if variable != self.__target_variable]
+
+    assert (self.__check_it_includes(self.variables, features)), "features degiskenin değerleri,  veri setinde tanımlanmalıdır."
+
+    start_time = time.perf_counter()
+
+    n_rows, gram = self.__centered_gram_matrix(features)
+
+    target = len(features)
+    swept = gram.copy()
+    original_diagonal = np.diag(gram).copy()
+
+    selected = []
+    scores = {}
+    stop_reason = "no_candidate"
+
+    while True:
+
+      if len(selected) >= max_features:
+        stop_reason = "max_features"
+        break
+
+      if time_budget is not None and time.perf_counter() - start_time > time_budget:
+        stop_reason = "time_budget"
+        break
+
+      candidates = np.array([index for index in range(target) if features[index] not in selected], dtype=int)
+
+      # seçilenlerle neredeyse doğrusal bağımlı adaylar dışarıda bırakılır
+      residual_variance = swept[candidates, candidates]
+      candidates = candidates[residual_variance > 1e-10 * original_diagonal[candidates]]
+
+      if candidates.size == 0 or swept[target, target] <= 0:
+        break
+
+      gains = swept[candidates, target] ** 2 / swept[candidates, candidates]
+      best = candidates[np.argmax(gains)]
+      partial_r2 = gains.max() / swept[target, target]
+
+      if strategy == "linear_predictor":
+
+        if partial_r2 < tolerance:
+          stop_reason = "tolerance"
+          break
+
+        score = partial_r2
+
+      else:
+
+        score = self.__fisher_z_p_value(math.sqrt(partial_r2), n_rows, len(selected))
+
+        if score >= alpha:
+          stop_reason = "independent"
+          break
+
+      self.__sweep(swept, best)
+      selected.append(features[best])
+      scores[features[best]] = score
+
+    if strategy == "markov_blanket" and len(selected) > 1:
+
+      # geri adım : diğer seçilenlere göre hedeften bağımsız kalanlar çıkarılır
+      removed = True
+
+      while removed and len(selected) > 1:
+
+        indices = [features.index(feature) for feature in selected] + [target]
+        precision = np.linalg.pinv(gram[np.ix_(indices, indices)])
+
+        p_values = [self.__fisher_z_p_value(-precision[position, -1] / math.sqrt(precision[position, position] * precision[-1, -1]),
+                                            n_rows, len(selected) - 1)
+                    for position in range(len(selected))]
+
+        worst = int(np.argmax(p_values))
+        removed = p_values[worst] >= alpha
+
+        if removed:
+          scores.pop(selected.pop(worst))
+        else:
+          scores = dict(zip(selected, p_values))
+
+    return {"selected": selected,
+            "scores": pd.Series([scores[feature] for feature in selected], index=selected, dtype=np.float64),
+            "stop_reason": stop_reason}
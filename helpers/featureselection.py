@@ -1,9 +1,219 @@
 import numpy as np
 import pandas as pd
-from scipy.stats import chi2_contingency
-from scipy.stats import f_oneway  # for ANOVA
 
+from .arrowio import ArrowFrame
+from .backends import get_backend
+from .correlation import prune_correlated, target_correlations
+from .instrumentation import instrument_class
+from .memo import memoize, pairwise_matrix
 
+
+def _code_matrix(df: pd.core.frame.DataFrame = None, variables: list = None, bin_edges: dict = None):
+  """Sütunları tek seferde tamsayı kodlara çevirir. bin_edges'te sınırları
+  verilen sütunlar bu sınırlara göre sepetlenir, diğerleri factorize edilir.
+  Kayıp değerlerin kodu -1'dir.
+
+  Returns
+  -------
+  sütun öncelikli (Fortran) kod matrisi ve her sütunun kod sayısı
+  """
+
+  bin_edges = bin_edges or {}
+
+  cardinality = np.zeros(len(variables), dtype=np.int64)
+  column_codes = []
+
+  for position, variable in enumerate(variables):
+
+    if variable in bin_edges:
+      values = df[variable].to_numpy(dtype=np.float64, na_value=np.nan)
+      codes = np.searchsorted(bin_edges[variable], values, side="right")
+      codes[np.isnan(values)] = -1
+      cardinality[position] = bin_edges[variable].size + 1
+    else:
+      codes, uniques = pd.factorize(df[variable])
+      cardinality[position] = len(uniques)
+
+    column_codes.append(codes)
+
+  code_dtype = np.int16 if cardinality.max(initial=0) < np.iinfo(np.int16).max else np.int32
+
+  # sütun parçaları ardışık okunabilsin diye sütun öncelikli (Fortran) düzen
+  codes = np.empty((df.shape[0], len(variables)), dtype=code_dtype, order="F")
+  for position, column in enumerate(column_codes):
+    codes[:, position] = column
+
+  return codes, cardinality
+
+
+def _quantile_edges(df: pd.core.frame.DataFrame = None, variables: list = None, n_bins: int = 20, profile=None):
+  """Sürekli değişkenler için eşit frekanslı sepet sınırları. Bir profil
+  (DriftProfile ya da ProfileSnapshot) verilirse sınırlar ondan alınır;
+  profilde bulunmayan değişkenler için tek bir quantile çağrısı yapılır.
+  """
+
+  interior = np.linspace(0, 1, n_bins + 1)[1:-1]
+
+  edges = {}
+
+  for variable in variables:
+
+    if profile is not None and variable in getattr(profile, "bin_edges", {}):
+      edges[variable] = np.asarray(profile.bin_edges[variable], dtype=np.float64)
+
+    elif profile is not None and variable in getattr(profile, "continuous_variables", []) \
+        and hasattr(profile, "quantile_sketches"):
+      sketch = profile.quantile_sketches[profile.continuous_variables.index(variable)]
+      edges[variable] = np.unique(sketch.quantile(interior))
+
+  remaining = [variable for variable in variables if variable not in edges]
+
+  if remaining:
+
+    quantiles = df.loc[:, remaining].quantile(interior)
+
+    for variable in remaining:
+      edges[variable] = np.unique(quantiles[variable].dropna().to_numpy(dtype=np.float64))
+
+  return edges
+
+
+def _mutual_information_columns(arrays: dict = None, chunk: tuple = None):
+  """Bir parça sütun için hedef ile karşılıklı bilgi (nat). Kayıp değerler
+  ayrı bir sepet olarak sayılır; birleşik frekanslar bincount ile bulunur.
+  """
+
+  start, stop = chunk
+
+  target = arrays["target"].astype(np.int64)
+  n_target = int(arrays["target_cardinality"][0])
+  target[target < 0] = n_target
+  n_target += 1
+
+  target_counts = np.bincount(target, minlength=n_target).astype(np.float64)
+
+  rows = []
+
+  for column in range(start, stop):
+
+    codes = arrays["codes"][:, column].astype(np.int64)
+    cardinality = int(arrays["cardinality"][column])
+    codes[codes < 0] = cardinality
+    cardinality += 1
+
+    joint = np.bincount(codes * n_target + target, minlength=cardinality * n_target).reshape(cardinality, n_target)
+    joint = joint.astype(np.float64)
+
+    n = joint.sum()
+    column_counts = joint.sum(axis=1)
+
+    used = joint > 0
+    outer = column_counts[:, None] * target_counts[None, :]
+
+    mutual_information = (joint[used] * np.log(joint[used] * n / outer[used])).sum() / n
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+      column_entropy = -(column_counts[column_counts > 0] / n * np.log(column_counts[column_counts > 0] / n)).sum()
+      target_entropy = -(target_counts[target_counts > 0] / n * np.log(target_counts[target_counts > 0] / n)).sum()
+      symmetric_uncertainty = 2 * mutual_information / (column_entropy + target_entropy)
+
+    rows.append((max(mutual_information, 0.0), symmetric_uncertainty, int((column_counts > 0).sum()), int(n)))
+
+  return rows
+
+
+def _anova_columns(arrays: dict = None, chunk: tuple = None):
+  """Bir parça kategorik sütun için tek yönlü ANOVA (F testi) sonuçları.
+  Gruplar toplamları bincount ile tek geçişte bulunur.
+  """
+
+  from scipy.stats import f as f_distribution
+
+  start, stop = chunk
+
+  target = arrays["target"]
+  target_known = ~np.isnan(target)
+
+  rows = []
+
+  for column in range(start, stop):
+
+    codes = arrays["codes"][:, column]
+    valid = (codes >= 0) & target_known
+
+    values = target[valid]
+    values = values - values.mean() if values.size else values
+    codes = codes[valid]
+
+    counts = np.bincount(codes, minlength=arrays["cardinality"][column])
+    sums = np.bincount(codes, weights=values, minlength=arrays["cardinality"][column])
+
+    present = counts > 0
+    n_groups = int(present.sum())
+    n = int(counts.sum())
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+
+      correction = sums.sum() ** 2 / n if n else 0.0
+      between = (sums[present] ** 2 / counts[present]).sum() - correction
+      within = (values ** 2).sum() - correction - between
+
+      statistic = (between / (n_groups - 1)) / (within / (n - n_groups))
+
+    p_value = f_distribution.sf(statistic, n_groups - 1, n - n_groups) if n_groups > 1 and n > n_groups else np.nan
+
+    rows.append((statistic if n_groups > 1 and n > n_groups else np.nan, p_value, n_groups - 1, n))
+
+  return rows
+
+
+def _chi2_columns(arrays: dict = None, chunk: tuple = None):
+  """Bir parça kategorik sütun için hedef değişken ile Ki-Kare bağımsızlık
+  testi sonuçları. Çapraz tablolar bincount ile oluşturulur; scipy'daki
+  gibi serbestlik derecesi 1 olduğunda Yates düzeltmesi uygulanır.
+  """
+
+  from scipy.stats import chi2 as chi2_distribution
+
+  start, stop = chunk
+
+  target = arrays["target"]
+  n_target = int(target.max()) + 1 if target.size else 0
+
+  rows = []
+
+  for column in range(start, stop):
+
+    codes = arrays["codes"][:, column]
+    valid = (codes >= 0) & (target >= 0)
+    cardinality = int(arrays["cardinality"][column])
+
+    table = np.bincount(target[valid].astype(np.int64) * cardinality + codes[valid],
+                        minlength=n_target * cardinality).reshape(n_target, cardinality).astype(np.float64)
+
+    table = table[table.sum(axis=1) > 0][:, table.sum(axis=0) > 0]
+    n = table.sum()
+
+    degrees_of_freedom = (table.shape[0] - 1) * (table.shape[1] - 1)
+
+    if degrees_of_freedom <= 0:
+      rows.append((0.0, 1.0, 0, int(n)))
+      continue
+
+    expected = table.sum(axis=1, keepdims=True) * table.sum(axis=0, keepdims=True) / n
+
+    if degrees_of_freedom == 1:
+      difference = expected - table
+      table = table + np.sign(difference) * np.minimum(0.5, np.abs(difference))
+
+    statistic = ((table - expected) ** 2 / expected).sum()
+
+    rows.append((statistic, chi2_distribution.sf(statistic, degrees_of_freedom), degrees_of_freedom, int(n)))
+
+  return rows
+
+
+@instrument_class
 class FeatureSelection:
   """
   Bir veri setinin özniteliklerini seçmek için kullanılan bir sınıf
@@ -18,8 +228,9 @@ class FeatureSelection:
       """
       Parameters
       ----------
-      df : pd.core.frame.DataFrame
-          kullanıcalak veri seti
+      df : pd.core.frame.DataFrame ya da ArrowFrame
+          kullanıcalak veri seti. ArrowFrame verilirse her metod yalnızca
+          ihtiyaç duyduğu sütunları okur.
       continuous_variables : list
           sürekli değişkenler
       categorical_variables : list
@@ -62,7 +273,69 @@ class FeatureSelection:
               result = False
               break
       return result
-      
+
+  @classmethod
+  def from_arrow(cls, source=None,
+                 continuous_variables: list = None,
+                 categorical_variables: list = None,
+                 target_variable: str = None,
+                 filters=None):
+      """Parquet/Arrow veri setinden bir FeatureSelection oluşturur. Veri
+      önceden yüklenmez; her metod yalnızca kullandığı sütunları, filtreler
+      okuma sırasında uygulanarak okur.
+
+      Parameters
+      ----------
+      source : str, list, pyarrow.Table ya da pyarrow.dataset.Dataset
+          veri seti
+      continuous_variables : list
+          sürekli değişkenler
+      categorical_variables : list
+          kategorik değişkenler
+      target_variable : str
+          hedef değişken
+      filters : list ya da pyarrow.dataset.Expression
+          satır filtreleri (ör. [("year", ">=", 2020)])
+
+      Returns
+      -------
+      FeatureSelection
+      """
+
+      return cls(ArrowFrame(source, filters), continuous_variables, categorical_variables, target_variable)
+
+  def __frame(self, columns: list = None):
+      """Veri setinin yalnızca istenen sütunlarını dönderir. Veri seti bir
+      ArrowFrame ise bu sütunlar (henüz okunmadılarsa) diskten okunur.
+      """
+
+      if isinstance(self.df, ArrowFrame):
+          return self.df.load(columns)
+
+      return self.df.loc[:, columns]
+
+  def __target_is_continuous(self, df_frame: pd.core.frame.DataFrame = None, numer_of_unique_values: int = 20):
+      """Hedef değişkenin sürekli olup olmadığını dönderir. Hedef
+      değişken genellikle continuous_variables listesinde verilmez; bu
+      durumda tipine ve benzersiz değer sayısına bakılır: en az
+      numer_of_unique_values benzersiz değeri olan sayısal (bool dışı) bir
+      hedef süreklidir (bkz. clean_eda.understand_variable_types).
+      categorical_variables listesinde verilen hedef her zaman kategoriktir.
+      """
+
+      if self.__target_variable in self.__continuous_variables:
+          return True
+
+      if self.__target_variable in self.__categorical_variables:
+          return False
+
+      target = df_frame[self.__target_variable]
+
+      if not pd.api.types.is_numeric_dtype(target.dtype) or pd.api.types.is_bool_dtype(target.dtype):
+          return False
+
+      return target.nunique(dropna=True) >= numer_of_unique_values
+
   def set_continuous_variables(self, continuous_variables):
       """Sürekli değişkenleri ayarlamada kullanılır
 
@@ -180,7 +453,7 @@ class FeatureSelection:
 
 
 
-  def correlation(self, threshold_for_target=0.5):
+  def correlation(self, threshold_for_target=0.5, method: str = "pearson", backend=None):
       """Hedef değişken ile diğer değişkenler arasındaki korelasyon katsayısı 
       bulunur.Belli bir eşik değer üstündeki (varsayılan , 0.5'dir.) katsayıya 
       sahip tahmin edici değişkenler tespit edilir. Ve bu tespit edilen tahmin 
@@ -192,14 +465,72 @@ class FeatureSelection:
       ----------
       threshold_for_target : int
           ilişkinin olup olmadığını belirleyen katsayı değeri
+      method : str
+          "pearson", "spearman" (sütunlar bir kez sıralanır, ardından bloklu
+          Pearson) ya da "kendall" (O(n log n) tau-b, çiftler işçilere dağıtılır).
+          Çarpık dağılımlı değişkenler için sıra korelasyonları tercih edilmelidir.
+      backend : str ya da arka uç nesnesi
+          kendall hesabının dağıtılacağı arka uç (bkz. helpers.backends)
+
+      Returns
+      -------
+      pd.core.series.Series
+          hedef değişken ile korelasyonu eşik değerin üstünde olan değişkenler
       """
 
-      # Korelasyon matrisini oluşturma
-      correlation_data = pd.concat([self.df[self.__continuous_variables], self.df[self.__target_variable]], axis=1).corr()
+      # Hedef değişken ile korelasyonlar (p x p matris oluşturulmadan)
+      columns = self.__continuous_variables + [self.__target_variable]
+      df_frame = self.__frame(columns)
+      target_correlation = memoize(df_frame, columns, "target_correlations",
+                                   lambda: target_correlations(df_frame, self.__continuous_variables, self.__target_variable,
+                                                               method=method, backend=backend),
+                                   method=method)
       # Yalnızca Hedef Değişken ile mutlak korelasyonun > threshold_for_target (0.5) olduğu sütunları filtreleme
-      selected_corr_list = correlation_data[self.__target_variable][abs(correlation_data[self.__target_variable]) > threshold_for_target][:-1]
+      selected_corr_list = target_correlation[abs(target_correlation) > threshold_for_target]
+      selected = selected_corr_list.index.tolist()
       print("Hedef değişken ile korelasyonu yüksek olan değişkenler :\n",selected_corr_list,"\n")
-      print("\nDiğer değişkenlerin kendi aralarındaki korelasyon : \n", self.df[selected_corr_list.index.values.tolist()].corr())
+      print("\nDiğer değişkenlerin kendi aralarındaki korelasyon : \n", pairwise_matrix(df_frame, selected, "corr", method))
+
+      return selected_corr_list
+
+
+  def redundant_features(self, threshold: float = 0.9, method: str = "pearson", block_size: int = 512, backend=None):
+      """Sürekli değişkenlerden birbiriyle mutlak korelasyonu threshold'u aşan
+      çiftlerin birini açgözlü (greedy) olarak eler. Değişkenler hedef
+      değişken ile mutlak korelasyonlarına göre sırayla dolaşılır; daha önce
+      seçilmiş bir değişkenle yüksek korelasyonlu olan değişken elenir.
+      Korelasyon matrisi bloklar halinde dolaşılır, tamamı bellekte tutulmaz.
+
+      Parameters
+      ----------
+      threshold : float
+          eleme için mutlak korelasyon eşiği
+      method : str
+          "pearson", "spearman" ya da "kendall"
+      block_size : int
+          bir blokta işlenecek sütun sayısı
+      backend : str ya da arka uç nesnesi
+          kendall hesabının dağıtılacağı arka uç (bkz. helpers.backends)
+
+      Returns
+      -------
+      dict
+          "selected" : seçilen değişkenler,
+          "dropped" : elenen değişken -> (neden olan seçilmiş değişken, korelasyon),
+          "pairs" : eşiği aşan tüm çiftler
+      """
+
+      columns = self.__continuous_variables + [self.__target_variable]
+      df_frame = self.__frame(columns)
+
+      target_correlation = memoize(df_frame, columns, "target_correlations",
+                                   lambda: target_correlations(df_frame, self.__continuous_variables, self.__target_variable,
+                                                               method=method, backend=backend),
+                                   method=method)
+
+      return prune_correlated(df_frame, self.__continuous_variables, threshold=threshold,
+                              priority=target_correlation.abs(), method=method, block_size=block_size,
+                              backend=backend)
 
 
   def ANOVA_test(self, variable=None):
@@ -213,11 +544,17 @@ class FeatureSelection:
       ----------
       variable : str
           ANOVA_test'i için bir kategorik değişken
+
+      Returns
+      -------
+      F istatistiği ve P-değeri (scipy.stats.f_oneway sonucu)
       """
 
+      from scipy.stats import f_oneway
+
       print('##### ANOVA Sonucu ##### \n')
 
-      category_group_list = self.df.groupby(variable)[self.__target_variable].apply(list)
+      category_group_list = self.__frame([variable, self.__target_variable]).groupby(variable)[self.__target_variable].apply(list)
 
       anova_result = f_oneway(*category_group_list)
 
@@ -229,6 +566,8 @@ class FeatureSelection:
       else:
           print(variable,", ",self.__target_variable,'ile ilişkili değildir.', '| P-Value:', anova_result[1])
 
+      return anova_result
+
 
   def chi2_contingency(self,categorical_variable=None):
       """Hedef değişken ile kategorik değişken arasında bir ilişki olup olmadığını 
@@ -241,10 +580,19 @@ class FeatureSelection:
       ----------
       categorical_variable : str
           Ki-Kare testi için bir kategorik değişken
+
+      Returns
+      -------
+      Ki-Kare istatistiği, P-değeri, serbestlik derecesi ve beklenen
+      frekanslar (scipy.stats.chi2_contingency sonucu)
       """
       
-      df_crosstab=pd.crosstab(index=self.df[self.__target_variable], columns=self.df[categorical_variable])
+      df_frame = self.__frame([self.__target_variable, categorical_variable])
+
+      df_crosstab=pd.crosstab(index=df_frame[self.__target_variable], columns=df_frame[categorical_variable])
  
+      from scipy.stats import chi2_contingency
+
       chi_square_result = chi2_contingency(df_crosstab)
       # # Ki kare P-Değeri <0,05 ise, bu, H0'ı reddettiğimiz anlamına gelir
       if (chi_square_result[1]< 0.05):
@@ -253,3 +601,150 @@ class FeatureSelection:
 
       else:
           print(categorical_variable,", ",self.__target_variable,'ile ilişkili değildir.', '| P-Value:', chi_square_result[1])
+
+      return chi_square_result
+
+
+  def screen(self, variables: list = None, test: str = "auto", backend=None, chunk_size: int = 64):
+      """Kategorik değişkenleri hedef değişkene göre toplu olarak test eder
+      ve sonuçları tek bir sıralı tabloda dönderir. Sütunlar tamsayı kodlara
+      çevrilip işçilerle bir kez paylaşılır; testler sütun parçaları halinde
+      işçilere dağıtılır. Sonuçlar ANOVA_test ve chi2_contingency ile aynıdır
+      (ANOVA'da hedefi kayıp olan satırlar çıkarılır).
+
+      Parameters
+      ----------
+      variables : list
+          test edilecek kategorik değişkenler. Verilmezse tüm kategorik değişkenler.
+      test : str
+          "anova" (sürekli hedef), "chi2" (kategorik hedef) ya da "auto".
+          "auto" hedef değişken sürekliyse "anova", değilse "chi2" seçer.
+          Hedef continuous_variables listesinde değilse tipine ve benzersiz
+          değer sayısına bakılır (sayısal ve en az 20 benzersiz değer:
+          sürekli). Sürekli bir hedef ile "chi2" kullanılamaz.
+      backend : str ya da arka uç nesnesi
+          "process" (varsayılan, yerel süreç havuzu), "serial", "dask" ya da
+          helpers.backends arayüzüne uyan bir nesne
+      chunk_size : int
+          bir işçiye tek seferde gönderilecek sütun sayısı
+
+      Returns
+      -------
+      pd.core.frame.DataFrame
+          her değişken için test, statistic, p_value, dof, n ve rank;
+          P-değerine (eşitlikte istatistiğe) göre sıralı
+      """
+
+      if variables is None:
+          variables = self.__categorical_variables
+
+      assert test in ("anova", "chi2", "auto"), "test değeri anova, chi2 ya da auto olmalıdır."
+
+      df_frame = self.__frame(list(variables) + [self.__target_variable])
+
+      target_is_continuous = self.__target_is_continuous(df_frame)
+
+      if test == "auto":
+          test = "anova" if target_is_continuous else "chi2"
+
+      # her farklı değeri bir sınıf sayan chi2, sürekli hedefte anlamsızdır
+      assert not (test == "chi2" and target_is_continuous), "Sürekli hedef değişken için chi2 kullanılamaz; test='anova' kullanın ya da hedefi categorical_variables listesine ekleyin."
+
+      codes, cardinality = _code_matrix(df_frame, variables)
+
+      if test == "anova":
+          target = df_frame[self.__target_variable].to_numpy(dtype=np.float64, na_value=np.nan)
+          function = _anova_columns
+      else:
+          target = pd.factorize(df_frame[self.__target_variable])[0]
+          function = _chi2_columns
+
+      chunks = [(start, min(start + chunk_size, len(variables))) for start in range(0, len(variables), chunk_size)]
+
+      results = get_backend(backend).map(function, chunks, {"codes": codes, "cardinality": cardinality, "target": target})
+
+      result = pd.DataFrame([row for rows in results for row in rows],
+                            index=pd.Index(variables, name="variable"),
+                            columns=["statistic", "p_value", "dof", "n"])
+
+      result.insert(0, "test", test)
+
+      result = result.sort_values(["p_value", "statistic"], ascending=[True, False], na_position="last")
+
+      result["rank"] = np.arange(1, result.shape[0] + 1)
+
+      return result
+
+
+  def mutual_information(self, variables: list = None, n_bins: int = 20, profile=None,
+                         backend=None, chunk_size: int = 64):
+      """Değişkenleri hedef değişken ile karşılıklı bilgilerine (mutual
+      information) göre sıralar. Korelasyonun yakalayamadığı doğrusal
+      olmayan ilişkileri de bulur.
+
+      Her sütun bir kez tamsayı kodlara çevrilir: sürekli değişkenler eşit
+      frekanslı (quantile) sepetlere, kategorik değişkenler kategorilerine.
+      Kayıp değerler ayrı bir sepettir. Birleşik frekanslar bincount ile
+      bulunur ve sütun parçaları işçilere dağıtılır. Sürekli hedef değişken
+      de aynı şekilde n_bins sepete bölünür. Hedef continuous_variables
+      listesinde değilse tipine ve benzersiz değer sayısına bakılır (sayısal
+      ve en az 20 benzersiz değer: sürekli); aksi halde her farklı hedef
+      değeri bir sınıf sayılır ve karşılıklı bilgi hedefin entropisine
+      yaklaşır.
+
+      Parameters
+      ----------
+      variables : list
+          sıralanacak değişkenler. Verilmezse tüm sürekli ve kategorik değişkenler.
+      n_bins : int
+          sürekli değişkenler için sepet sayısı
+      profile : DriftProfile ya da ProfileSnapshot
+          sepet sınırlarının alınacağı önceden hesaplanmış profil. Verilirse
+          veri üzerinde çeyreklik hesabı yapılmaz.
+      backend : str ya da arka uç nesnesi
+          "process" (varsayılan), "serial", "dask" ya da helpers.backends
+          arayüzüne uyan bir nesne
+      chunk_size : int
+          bir işçiye tek seferde gönderilecek sütun sayısı
+
+      Returns
+      -------
+      pd.core.frame.DataFrame
+          her değişken için mutual_information (nat), symmetric_uncertainty
+          (0-1 arası normalleştirilmiş değer), bins, n ve rank
+      """
+
+      if variables is None:
+          variables = [variable for variable in self.__continuous_variables + self.__categorical_variables
+                       if variable != self.__target_variable]
+
+      variables = list(variables)
+
+      df_frame = self.__frame(variables + [self.__target_variable])
+
+      continuous = [variable for variable in variables if variable in self.__continuous_variables]
+
+      target_is_continuous = self.__target_is_continuous(df_frame)
+
+      bin_edges = _quantile_edges(df_frame, continuous + ([self.__target_variable] if target_is_continuous else []),
+                                  n_bins, profile)
+
+      codes, cardinality = _code_matrix(df_frame, variables, bin_edges)
+
+      target, target_cardinality = _code_matrix(df_frame, [self.__target_variable], bin_edges)
+
+      chunks = [(start, min(start + chunk_size, len(variables))) for start in range(0, len(variables), chunk_size)]
+
+      results = get_backend(backend).map(_mutual_information_columns, chunks,
+                                         {"codes": codes, "cardinality": cardinality,
+                                          "target": target[:, 0], "target_cardinality": target_cardinality})
+
+      result = pd.DataFrame([row for rows in results for row in rows],
+                            index=pd.Index(variables, name="variable"),
+                            columns=["mutual_information", "symmetric_uncertainty", "bins", "n"])
+
+      result = result.sort_values("mutual_information", ascending=False, kind="stable")
+
+      result["rank"] = np.arange(1, result.shape[0] + 1)
+
+      return result
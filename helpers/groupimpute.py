@@ -0,0 +1,245 @@
+"""
+Grup bazlı (segment bazlı) kayıp değer doldurma.
+
+Kayıp hücreler, satırın ait olduğu grubun (ör. bölge) eğitim verisindeki
+ortalaması, medyanı ya da moduyla doldurulur. Gruplar eğitim verisinde bir
+kez tamsayı kodlara çevrilir ve tüm sütunların grup istatistikleri tek
+seferde hesaplanır:
+
+  * mean / median : sayısal sütunlar tek bir groupby geçişinde, birlikte
+  * mode          : her sütun (grup, değer) çiftlerinin sıralanıp
+                    sayılmasıyla; eşitlikte en küçük değer seçilir
+                    (bkz. modes)
+
+mean ve median yalnızca sayısal sütunlara uygulanır; strategy tek bir
+yöntem olarak verildiğinde sayısal olmayan (metin, kategorik, bool)
+sütunlar mode ile doldurulur.
+
+Eğitimde görülmemiş gruplar, grubunda hiç değer olmayan ya da değer sayısı
+min_count'tan az olan sütunlar eğitim verisinin genel istatistiğiyle
+doldurulur. Grup sütunlarındaki kayıp değerler ayrı bir grup kabul edilir.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .modes import column_modes
+
+
+STRATEGIES = ("mean", "median", "mode")
+
+
+def _group_mode(group_codes: np.ndarray = None, n_groups: int = None, series: pd.core.series.Series = None):
+  """Bir sütunun her gruptaki modunu dönderir. Değeri olmayan gruplar
+  kayıp (NaN) olur.
+  """
+
+  try:
+    value_codes, uniques = pd.factorize(series, sort=True, use_na_sentinel=True)
+  except TypeError:
+    # karşılaştırılamayan değerler: eşitlikte ilk görülen değer
+    value_codes, uniques = pd.factorize(series, sort=False, use_na_sentinel=True)
+
+  valid = value_codes >= 0
+
+  n_uniques = max(len(uniques), 1)
+
+  pairs, counts = np.unique(group_codes[valid].astype(np.int64) * n_uniques + value_codes[valid], return_counts=True)
+
+  groups, values = np.divmod(pairs, n_uniques)
+
+  # her grupta en sık değer; eşitlikte en küçük kod (sıralı factorize ile en küçük değer)
+  order = np.lexsort((values, -counts, groups))
+
+  first = np.ones(len(order), dtype=bool)
+  first[1:] = groups[order][1:] != groups[order][:-1]
+
+  chosen = order[first]
+
+  positions = np.full(n_groups, -1, dtype=np.int64)
+  positions[groups[chosen]] = values[chosen]
+
+  if not len(uniques):
+    return pd.Index(np.full(n_groups, np.nan))
+
+  # bool gibi kayıp değer tutamayan tipler where ile object'e genişler
+  return pd.Index(uniques).take(np.maximum(positions, 0)).where(positions >= 0)
+
+
+class GroupImputer:
+  """
+  Eğitim verisinde öğrenilen grup istatistikleriyle kayıp değer dolduran
+  sınıf
+
+  """
+
+  def __init__(self, by: list = None, strategies: dict = None, min_count: int = 1):
+    """
+    Parameters
+    ----------
+    by : list
+        grupları belirleyen sütunlar
+    strategies : dict
+        doldurulacak her sütun için "mean", "median" ya da "mode"
+    min_count : int
+        bir grubun istatistiğinin kullanılması için gereken en az dolu
+        hücre sayısı
+    """
+
+    self.by = list(by)
+
+    self.strategies = dict(strategies)
+
+    self.min_count = min_count
+
+    # eğitimde görülen gruplar; i. grup istatistik tablosunun i. satırıdır
+    self.groups = None
+
+    # grup x sütun istatistik tablosu; son satır genel istatistiklerdir
+    self.statistics = None
+
+    # her sütun için genel istatistiğe düşen grup sayısı
+    self.fallback_counts = {}
+
+  @classmethod
+  def fit(cls, df: pd.core.frame.DataFrame = None, by=None, features: list = None,
+          strategy="median", min_count: int = 1):
+    """Grup istatistiklerini bir Veri Çerçevesinden (genellikle eğitim
+    verisi) öğrenir.
+
+    Parameters
+    ----------
+    df : pd.core.frame.DataFrame
+        eğitim verisi
+    by : str ya da list
+        grupları belirleyen sütun(lar)
+    features : list
+        doldurulacak sütunlar. Verilmezse by dışındaki tüm sütunlar.
+    strategy : str ya da dict
+        "mean", "median", "mode" ya da sütun adından yönteme sözlük.
+        "mean" ya da "median" verilirse sayısal olmayan sütunlar mode ile
+        doldurulur; sözlükte ise yalnızca sayısal sütunlara verilebilir.
+    min_count : int
+        bir grubun istatistiğinin kullanılması için gereken en az dolu
+        hücre sayısı
+
+    Returns
+    -------
+    GroupImputer
+    """
+
+    by = [by] if isinstance(by, str) else list(by)
+
+    if features is None:
+      features = [column for column in df.columns if column not in by]
+
+    def is_numeric(feature):
+      dtype = df[feature].dtype
+      return pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)
+
+    if isinstance(strategy, dict):
+      strategies = dict(strategy)
+    else:
+      # ortalama ve medyan sayısal olmayan sütunlarda tanımsızdır
+      strategies = {feature: strategy if strategy == "mode" or is_numeric(feature) else "mode" for feature in features}
+
+    assert set(strategies.values()) <= set(STRATEGIES), "strategy değeri mean, median ya da mode olmalıdır."
+    assert not set(strategies) & set(by), "Grup sütunları doldurulacak sütunlar arasında olmamalıdır."
+    assert all(method == "mode" or is_numeric(feature) for feature, method in strategies.items()), \
+      "mean ve median yalnızca sayısal sütunlara uygulanabilir."
+
+    imputer = cls(by, strategies, min_count)
+
+    codes, imputer.groups = imputer.__factorize(df)
+
+    n_groups = len(imputer.groups)
+
+    features = list(strategies)
+
+    # dolu hücre sayıları tüm sütunlar için tek geçişte
+    counts = df.loc[:, features].notna().groupby(codes, sort=True).sum().reindex(range(n_groups), fill_value=0)
+
+    statistics = pd.DataFrame(index=pd.RangeIndex(n_groups + 1), columns=features, dtype=object)
+
+    for statistic in ("mean", "median"):
+
+      columns = [feature for feature in features if strategies[feature] == statistic]
+
+      if not columns:
+        continue
+
+      frame = df.loc[:, columns]
+
+      grouped = getattr(frame.groupby(codes, sort=True), statistic)().reindex(range(n_groups))
+
+      general = getattr(frame, statistic)().to_frame().T
+
+      statistics[columns] = pd.concat([grouped, general], ignore_index=True)
+
+    columns = [feature for feature in features if strategies[feature] == "mode"]
+
+    if columns:
+
+      general = column_modes(df, columns)
+
+      for column in columns:
+        values = _group_mode(codes, n_groups, df[column])
+        statistics[column] = pd.Series(values.append(pd.Index([general[column]])))
+
+    # az dolu gruplar genel istatistiğe düşer
+    for column in features:
+
+      sparse = np.flatnonzero(counts[column].to_numpy() < min_count)
+
+      imputer.fallback_counts[column] = len(sparse)
+
+      if len(sparse):
+        statistics.loc[sparse, column] = statistics.at[n_groups, column]
+
+    imputer.statistics = statistics.infer_objects()
+
+    return imputer
+
+  def __factorize(self, df: pd.core.frame.DataFrame = None):
+    """Eğitim verisinin grup kodlarını ve benzersiz gruplarını dönderir."""
+
+    if len(self.by) == 1:
+      codes, groups = pd.factorize(df[self.by[0]], use_na_sentinel=False)
+      return codes, pd.Index(groups)
+
+    codes, groups = pd.MultiIndex.from_frame(df.loc[:, self.by]).factorize()
+
+    return codes, groups
+
+  def group_codes(self, df: pd.core.frame.DataFrame = None):
+    """Bir Veri Çerçevesinin satırlarını eğitimde görülen gruplara eşler.
+    Görülmemiş gruplar genel istatistik satırına (len(groups)) eşlenir.
+    """
+
+    if len(self.by) == 1:
+      keys = pd.Index(df[self.by[0]])
+    else:
+      keys = pd.MultiIndex.from_frame(df.loc[:, self.by])
+
+    codes = self.groups.get_indexer(keys)
+
+    codes[codes < 0] = len(self.groups)
+
+    return codes
+
+  def transform(self, df: pd.core.frame.DataFrame = None):
+    """Kayıp hücreleri grup istatistikleriyle doldurur.
+
+    Returns
+    -------
+    pd.core.frame.DataFrame
+        doldurulmuş kopya
+    """
+
+    features = [feature for feature in self.strategies if feature in df.columns]
+
+    fill_values = self.statistics.loc[:, features].take(self.group_codes(df))
+
+    fill_values.index = df.index
+
+    return df.fillna(fill_values)
@@ -0,0 +1,279 @@
+"""
+helpers sınıfları için ölçüm (instrumentation) katmanı.
+
+Kapalıyken (varsayılan) ölçülen her metod çağrısı yalnızca tek bir bayrak
+kontrolü kadar ek maliyet getirir. Açıldığında her çağrı için süre, işlenen
+satır/bayt sayısı ve isteğe bağlı olarak tepe bellek ölçülür ve yapılandırılmış
+olaylar (dict) bir geri çağırma fonksiyonuna ya da bir logger'a gönderilir.
+
+Örnek:
+
+  import logging
+  from helpers import instrumentation
+
+  events = []
+  with instrumentation.instrumented(callback=events.append, track_memory=True):
+    dc.outlier_detection(feature="v_1")
+
+  # ya da
+  instrumentation.enable(logger=logging.getLogger("pykasif"))
+"""
+
+import contextlib
+import functools
+import json
+import logging
+import threading
+import time
+import tracemalloc
+
+import pandas as pd
+
+
+_enabled = False
+
+_callbacks = []
+
+_loggers = []
+
+_track_memory = False
+
+# iç içe ölçülen çağrılarda tepe bellek yalnızca en dıştaki çağrıda ölçülür;
+# derinlik her iş parçacığı için ayrı tutulur (bkz. aio)
+_local = threading.local()
+
+# tracemalloc süreç genelindedir: aynı anda süren ölçümler sayılır, izleme
+# ilk ölçümle başlatılır ve son ölçüm bitince durdurulur
+_memory_lock = threading.Lock()
+
+_memory_measurements = 0
+
+_started_tracing = False
+
+_cache_counters = {}
+
+
+def enable(callback=None, logger: logging.Logger = None, track_memory: bool = False):
+  """Ölçümü açar. Aynı geri çağırma fonksiyonu ya da logger birden fazla
+  kez verilirse bir kez kaydedilir.
+
+  Parameters
+  ----------
+  callback : callable
+      her olay (dict) için çağrılacak fonksiyon
+  logger : logging.Logger
+      olayların JSON olarak INFO düzeyinde yazılacağı logger
+  track_memory : bool
+      tepe bellek kullanımının tracemalloc ile ölçülüp ölçülmeyeceği
+      (belirgin bir ek maliyeti vardır)
+  """
+
+  global _enabled, _track_memory
+
+  if callback is not None and callback not in _callbacks:
+    _callbacks.append(callback)
+
+  if logger is not None and logger not in _loggers:
+    _loggers.append(logger)
+
+  _track_memory = track_memory
+
+  _enabled = True
+
+
+def disable():
+  """Ölçümü kapatır ve kayıtlı geri çağırma fonksiyonlarını/logger'ları siler."""
+
+  global _enabled, _track_memory
+
+  _enabled = False
+
+  _track_memory = False
+
+  _callbacks.clear()
+
+  _loggers.clear()
+
+
+def is_enabled():
+  """Ölçümün açık olup olmadığını dönderir."""
+
+  return _enabled
+
+
+@contextlib.contextmanager
+def instrumented(callback=None, logger: logging.Logger = None, track_memory: bool = False):
+  """Yalnızca with bloğu içinde ölçümü açar."""
+
+  enable(callback, logger, track_memory)
+
+  try:
+    yield
+  finally:
+    disable()
+
+
+def emit(event: dict = None):
+  """Bir olayı kayıtlı geri çağırma fonksiyonlarına ve logger'lara gönderir."""
+
+  if not _enabled:
+    return
+
+  for callback in _callbacks:
+    callback(event)
+
+  for logger in _loggers:
+    logger.info(json.dumps(event, default=str))
+
+
+def record_value(name: str = None, **values):
+  """Bir metodun ara değerlerini (ör. doldurma değeri, aykırı değer
+  sınırları) olay olarak gönderir.
+  """
+
+  if _enabled:
+    emit({"event": "value", "name": name, "time": time.time(), **values})
+
+
+def record_cache(cache: str = None, hit: bool = None):
+  """Bir önbelleğe yapılan erişimi sayar ve olay olarak gönderir. Sayaçlar
+  ölçüm kapalıyken tutulmaz.
+  """
+
+  if not _enabled:
+    return
+
+  counters = _cache_counters.setdefault(cache, {"hits": 0, "misses": 0})
+  counters["hits" if hit else "misses"] += 1
+
+  emit({"event": "cache", "name": cache, "hit": hit, "time": time.time()})
+
+
+def cache_statistics():
+  """Önbellek isabet sayılarını ve oranlarını dönderir.
+
+  Returns
+  -------
+  dict
+      önbellek adı -> {"hits", "misses", "hit_rate"}
+  """
+
+  return {cache: {**counters, "hit_rate": counters["hits"] / max(counters["hits"] + counters["misses"], 1)}
+          for cache, counters in _cache_counters.items()}
+
+
+def reset_cache_statistics():
+  """Önbellek sayaçlarını sıfırlar."""
+
+  _cache_counters.clear()
+
+
+def _data_size(instance):
+  """Bir sınıf örneğindeki Veri Çerçevelerinin toplam satır ve bayt sayısı."""
+
+  rows = 0
+  n_bytes = 0
+
+  for value in vars(instance).values():
+    if isinstance(value, pd.DataFrame):
+      rows += value.shape[0]
+      n_bytes += int(value.memory_usage(index=False, deep=False).sum())
+
+  return rows, n_bytes
+
+
+def _start_memory_measurement():
+  """Bir tepe bellek ölçümü başlatır. Başka bir iş parçacığında süren
+  ölçüm yoksa tepe değer sıfırlanır; varsa tepe değerler paylaşılır.
+  """
+
+  global _memory_measurements, _started_tracing
+
+  with _memory_lock:
+
+    if _memory_measurements == 0:
+      if not tracemalloc.is_tracing():
+        tracemalloc.start()
+        _started_tracing = True
+      tracemalloc.reset_peak()
+
+    _memory_measurements += 1
+
+
+def _stop_memory_measurement():
+  """Bir tepe bellek ölçümünü bitirir ve tepe değeri dönderir."""
+
+  global _memory_measurements, _started_tracing
+
+  with _memory_lock:
+
+    peak_bytes = tracemalloc.get_traced_memory()[1] if tracemalloc.is_tracing() else None
+
+    _memory_measurements -= 1
+
+    if _memory_measurements == 0 and _started_tracing:
+      tracemalloc.stop()
+      _started_tracing = False
+
+  return peak_bytes
+
+
+def instrument(method):
+  """Bir metodu ölçülecek şekilde sarar."""
+
+  @functools.wraps(method)
+  def wrapper(self, *args, **kwargs):
+
+    if not _enabled:
+      return method(self, *args, **kwargs)
+
+    name = type(self).__name__ + "." + method.__name__
+    rows, n_bytes = _data_size(self)
+    depth = getattr(_local, "depth", 0)
+    measure_memory = _track_memory and depth == 0
+
+    if measure_memory:
+      _start_memory_measurement()
+
+    error = None
+    _local.depth = depth + 1
+    start = time.perf_counter()
+
+    try:
+      return method(self, *args, **kwargs)
+
+    except Exception as exception:
+      error = f"{type(exception).__name__}: {exception}"
+      raise
+
+    finally:
+      seconds = time.perf_counter() - start
+      _local.depth = depth
+
+      event = {"event": "method", "name": name, "seconds": seconds,
+               "rows": rows, "bytes": n_bytes, "time": time.time()}
+
+      if measure_memory:
+        peak_bytes = _stop_memory_measurement()
+        if peak_bytes is not None:
+          event["peak_bytes"] = peak_bytes
+
+      if error is not None:
+        event["error"] = error
+
+      emit(event)
+
+  return wrapper
+
+
+def instrument_class(cls):
+  """Bir sınıfın get_/set_ dışındaki tüm herkese açık metodlarını ölçülecek
+  şekilde sarar. Sınıf tanımında dekoratör olarak kullanılır.
+  """
+
+  for attribute, value in list(vars(cls).items()):
+    if (callable(value) and not attribute.startswith("_")
+        and not attribute.startswith(("get_", "set_"))):
+      setattr(cls, attribute, instrument(value))
+
+  return cls
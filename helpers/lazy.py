@@ -0,0 +1,100 @@
+"""
+Ağır bağımlılıkların (matplotlib, seaborn) ilk kullanımda yüklenmesi.
+
+helpers modülleri içe aktarıldığında matplotlib ve seaborn yüklenmez;
+plt / sns nesnelerinin bir niteliğine ilk erişildiğinde yüklenirler.
+Böylece yalnızca veri temizleme ya da skorlama yapan kısa ömürlü işçiler
+çizim kütüphanelerinin yükleme süresini ve belleğini hiç ödemez.
+scikit-learn ve scipy ise kullanıldıkları fonksiyonların içinde içe
+aktarılır.
+
+Ekranı olmayan (headless) ortamlarda PYKASIF_HEADLESS=1 ortam değişkeni
+ya da set_headless() ile matplotlib, pyplot yüklenmeden önce "Agg"
+arka ucuna ayarlanır; grafikler pencere açmadan çizilir.
+"""
+
+import importlib
+import os
+
+
+_headless = os.environ.get("PYKASIF_HEADLESS", "").lower() in ("1", "true", "yes")
+
+
+def set_headless(headless: bool = True):
+  """Çizimlerin ekran gerektirmeyen "Agg" arka ucuyla yapılmasını sağlar.
+  pyplot henüz yüklenmediyse ucuzdur; yüklendiyse arka uç değiştirilir.
+  """
+
+  global _headless
+
+  _headless = headless
+
+  if headless and pyplot.is_loaded():
+    pyplot.switch_backend("Agg")
+
+
+def is_headless():
+
+  return _headless
+
+
+def _configure_matplotlib():
+
+  if _headless:
+    import matplotlib
+    matplotlib.use("Agg")
+
+
+class LazyModule:
+  """
+  Bir modülü, bir niteliğine ilk erişildiğinde içe aktaran vekil nesne
+
+  """
+
+  def __init__(self, name: str = None, setup=None):
+    """
+    Parameters
+    ----------
+    name : str
+        içe aktarılacak modülün tam adı
+    setup : callable
+        içe aktarmadan hemen önce bir kez çağrılacak fonksiyon
+    """
+
+    self.__name = name
+
+    self.__setup = setup
+
+    self.__module = None
+
+  def is_loaded(self):
+    """Modülün yüklenip yüklenmediğini dönderir."""
+
+    return self.__module is not None
+
+  def load(self):
+    """Modülü (gerekirse) içe aktarır ve dönderir."""
+
+    if self.__module is None:
+
+      if self.__setup is not None:
+        self.__setup()
+
+      self.__module = importlib.import_module(self.__name)
+
+    return self.__module
+
+  def __getattr__(self, attribute):
+
+    return getattr(self.load(), attribute)
+
+  def __repr__(self):
+
+    state = "yüklendi" if self.__module is not None else "yüklenmedi"
+
+    return f"<LazyModule {self.__name} ({state})>"
+
+
+pyplot = LazyModule("matplotlib.pyplot", setup=_configure_matplotlib)
+
+seaborn = LazyModule("seaborn", setup=_configure_matplotlib)
@@ -0,0 +1,309 @@
+"""
+Veri parmak izine (fingerprint) dayalı, bellek bütçeli sonuç önbelleği.
+
+Aynı veri üzerinde tekrar çağrılan pahalı hesaplamalar (korelasyon,
+kovaryans, PCA gibi) bir kez yapılır. Anahtar; hesaplamanın adı,
+kullanılan her sütunun parmak izi ve parametrelerden oluşur. Parmak izi
+sütun nesnesine değil içeriğine bağlı olduğundan, aynı veriyi kullanan
+farklı sınıflar (ör. ProfillingReport ve FeatureSelection) sonuçları
+paylaşır. Önbellek toplam boyutu bütçeyi aşınca en uzun süre kullanılmayan
+sonuçlar (LRU) silinir.
+
+Parmak izi varsayılan olarak kesindir: sütunun adı, tipi, uzunluğu ve tüm
+hücrelerinin özeti. Maliyeti O(n) olup koruduğu O(n·p²) korelasyon,
+kovaryans ve PCA hesaplarının yanında önemsizdir. set_fingerprint_mode("sample")
+ile yalnızca eşit aralıklarla seçilmiş en fazla sample_size hücre
+özetlenebilir; bu durumda örneklenmeyen hücrelerdeki yerinde değişiklikler
+fark edilmez ve önbellek eskimiş (yanlış) sonuçlar dönderebilir. Örnekleme
+yalnızca veri yerinde değiştirilmiyorsa ya da her değişiklikten sonra
+clear_cache() çağrılıyorsa kullanılmalıdır.
+
+Önbellekten dönen nesneler paylaşılır; çağıranlar bunları değiştirmemelidir.
+"""
+
+import collections
+import hashlib
+import sys
+import threading
+
+import numpy as np
+import pandas as pd
+
+from .instrumentation import record_cache
+
+
+_fingerprint_mode = "exact"
+
+_sample_size = 4096
+
+
+def set_fingerprint_mode(mode: str = "exact", sample_size: int = 4096):
+  """Parmak izi hesaplama yöntemini ayarlar.
+
+  Parameters
+  ----------
+  mode : str
+      "exact" (tüm hücreler, varsayılan) ya da "sample" (örneklenmiş
+      hücreler; daha hızlı ama örneklenmeyen hücrelerdeki yerinde
+      değişiklikleri fark etmez, önbellek eskimiş sonuç dönderebilir)
+  sample_size : int
+      "sample" yönteminde özetlenecek hücre sayısı
+  """
+
+  global _fingerprint_mode, _sample_size
+
+  assert mode in ("sample", "exact"), "mode değeri sample ya da exact olmalıdır."
+
+  _fingerprint_mode = mode
+
+  _sample_size = sample_size
+
+
+def column_fingerprint(series: pd.core.series.Series = None):
+  """Bir sütunun içeriğine bağlı kısa bir parmak izi dönderir."""
+
+  n = len(series)
+
+  if _fingerprint_mode == "sample" and n > _sample_size:
+    positions = np.unique(np.concatenate([np.linspace(0, n - 1, _sample_size).astype(np.int64),
+                                          np.arange(min(64, n)), np.arange(max(n - 64, 0), n)]))
+    series = series.iloc[positions]
+
+  digest = hashlib.blake2b(pd.util.hash_pandas_object(series, index=False).to_numpy().tobytes(), digest_size=16)
+  digest.update(f"{series.name}|{series.dtype}|{n}".encode())
+
+  return digest.hexdigest()
+
+
+def frame_fingerprint(df: pd.core.frame.DataFrame = None, columns: list = None):
+  """Bir Veri Çerçevesinin istenen sütunlarının parmak izleri."""
+
+  if columns is None:
+    columns = df.columns.tolist()
+
+  return tuple((column, column_fingerprint(df[column])) for column in columns)
+
+
+def _size_of(value):
+  """Bir sonucun yaklaşık bellek boyutu (bayt)."""
+
+  if isinstance(value, pd.DataFrame):
+    return int(value.memory_usage(index=True, deep=False).sum())
+  if isinstance(value, pd.Series):
+    return int(value.memory_usage(index=True, deep=False))
+  if isinstance(value, (pd.Index, np.ndarray)):
+    return int(value.nbytes)
+  if isinstance(value, (tuple, list)):
+    return sum(_size_of(item) for item in value) + sys.getsizeof(value)
+  if isinstance(value, dict):
+    return sum(_size_of(item) for item in value.values()) + sys.getsizeof(value)
+  return sys.getsizeof(value)
+
+
+class MemoCache:
+  """
+  Bellek bütçeli, en uzun süre kullanılmayanı silen (LRU) sonuç önbelleği
+
+  """
+
+  def __init__(self, max_bytes: int = 512 * 2**20):
+    """
+    Parameters
+    ----------
+    max_bytes : int
+        önbellekteki sonuçların toplam boyutu için üst sınır (bayt)
+    """
+
+    self.max_bytes = max_bytes
+
+    self.current_bytes = 0
+
+    self.__entries = collections.OrderedDict()
+
+    # aynı önbellek birden fazla iş parçacığından kullanılabilir (bkz. aio)
+    self.__lock = threading.RLock()
+
+  def __contains__(self, key):
+
+    return key in self.__entries
+
+  def get(self, key=None, default=None):
+    """Anahtarın sonucunu dönderir ve en son kullanılan olarak işaretler."""
+
+    with self.__lock:
+
+      if key not in self.__entries:
+        return default
+
+      self.__entries.move_to_end(key)
+
+      return self.__entries[key][0]
+
+  def put(self, key=None, value=None):
+    """Bir sonucu saklar; bütçe aşılırsa en eski sonuçları siler. Tek başına
+    bütçeden büyük sonuçlar saklanmaz.
+    """
+
+    size = _size_of(value)
+
+    with self.__lock:
+
+      if key in self.__entries:
+        self.current_bytes -= self.__entries.pop(key)[1]
+
+      if size > self.max_bytes:
+        return
+
+      self.__entries[key] = (value, size)
+      self.current_bytes += size
+
+      self.__evict()
+
+  def set_max_bytes(self, max_bytes: int = None):
+    """Bütçeyi değiştirir ve gerekirse hemen siler."""
+
+    with self.__lock:
+
+      self.max_bytes = max_bytes
+
+      self.__evict()
+
+  def __evict(self):
+
+    while self.current_bytes > self.max_bytes:
+      _, (_, evicted_size) = self.__entries.popitem(last=False)
+      self.current_bytes -= evicted_size
+
+  def keys(self):
+    """Anahtarları en eskiden en yeniye dönderir."""
+
+    with self.__lock:
+      return list(self.__entries)
+
+  def clear(self):
+    """Tüm sonuçları siler."""
+
+    with self.__lock:
+
+      self.__entries.clear()
+
+      self.current_bytes = 0
+
+
+_cache = MemoCache()
+
+_missing = object()
+
+
+def get_cache():
+  """Paylaşılan önbelleği dönderir."""
+
+  return _cache
+
+
+def set_memory_budget(max_bytes: int = None):
+  """Paylaşılan önbelleğin bellek bütçesini ayarlar (gerekirse hemen siler)."""
+
+  _cache.set_max_bytes(max_bytes)
+
+
+def clear_cache():
+  """Paylaşılan önbelleği boşaltır."""
+
+  _cache.clear()
+
+
+def memoize(df: pd.core.frame.DataFrame = None, columns: list = None, name: str = None, compute=None, **parameters):
+  """compute() sonucunu, df'in columns sütunlarının parmak izi ve
+  parametrelerle birlikte önbellekte saklar; aynı anahtarla yapılan
+  sonraki çağrılarda hesaplamadan dönderir.
+
+  Parameters
+  ----------
+  df : pd.core.frame.DataFrame
+      hesaplamada kullanılan veri seti
+  columns : list
+      hesaplamada kullanılan sütunlar
+  name : str
+      hesaplamanın adı
+  compute : callable
+      parametresiz çağrılan ve sonucu dönderen fonksiyon
+  parameters
+      sonucu etkileyen diğer parametreler (hashlenebilir olmalıdır)
+  """
+
+  key = (name, frame_fingerprint(df, columns), tuple(sorted(parameters.items())))
+
+  value = _cache.get(key, _missing)
+
+  record_cache("memo." + name, value is not _missing)
+
+  if value is not _missing:
+    return value
+
+  value = compute()
+
+  _cache.put(key, value)
+
+  return value
+
+
+def pairwise_matrix(df: pd.core.frame.DataFrame = None, columns: list = None, kind: str = "corr", method: str = "pearson"):
+  """Sütunlar arası korelasyon ya da kovaryans matrisini dönderir. Aynı
+  sütunları (parmak izleri aynı olmak üzere) kapsayan daha büyük bir matris
+  önbellekte varsa sonuç ondan kesilerek alınır; ikili (pairwise) dolu
+  satırlarla hesaplandığı için kesilen matris doğrudan hesaplananla aynıdır.
+
+  Parameters
+  ----------
+  df : pd.core.frame.DataFrame
+      veri seti
+  columns : list
+      sütunlar (tekrar eden sütunlar korunur)
+  kind : str
+      "corr" ya da "cov"
+  method : str
+      korelasyon yöntemi ("pearson", "spearman", "kendall")
+
+  Returns
+  -------
+  pd.core.frame.DataFrame
+  """
+
+  assert kind in ("corr", "cov"), "kind değeri corr ya da cov olmalıdır."
+
+  unique_columns = list(dict.fromkeys(columns))
+
+  fingerprints = dict(frame_fingerprint(df, unique_columns))
+
+  cache_name = "memo." + kind + "_matrix"
+
+  for key in reversed(_cache.keys()):
+
+    if key[0] != kind + "_matrix" or key[2] != method:
+      continue
+
+    cached_fingerprints = dict(key[1])
+
+    if all(cached_fingerprints.get(column) == fingerprint for column, fingerprint in fingerprints.items()):
+      matrix = _cache.get(key, _missing)
+      if matrix is not _missing:
+        record_cache(cache_name, True)
+        return matrix.loc[columns, columns]
+
+  record_cache(cache_name, False)
+
+  frame = df.loc[:, unique_columns]
+
+  if kind == "cov":
+    matrix = frame.cov()
+  elif method == "kendall":
+    # pandas'ın Kendall hesabı her çift için O(n^2)'dir
+    from .correlation import kendall_matrix
+    matrix = kendall_matrix(frame)
+  else:
+    matrix = frame.corr(method=method)
+
+  _cache.put((kind + "_matrix", tuple(fingerprints.items()), method), matrix)
+
+  return matrix.loc[columns, columns]
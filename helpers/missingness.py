@@ -0,0 +1,324 @@
+"""
+Kayıp değer desenlerinin bit eşlemleri (bitmap) üzerinden analizi.
+
+Her sütunun kayıp hücre maskesi hücre başına bir bit olacak şekilde
+64 bitlik kelimelere paketlenir; bir sütun için n / 8 bayt yer tutar
+(isna() maskesinin sekizde biri). Maskeler sütun sütun çıkarıldığından
+tüm tablonun isna() çerçevesi hiçbir zaman bellekte oluşturulmaz.
+
+Paketlenmiş maskelerden:
+  * sütun bazında kayıp hücre sayıları (popcount)
+  * iki sütunun birlikte kayıp olduğu satır sayıları matrisi
+    (co-missingness); satır blokları açılarak tek bir matris çarpımıyla
+    (BLAS), hiç kaybı olmayan satır blokları atlanarak
+  * satırlardaki farklı kayıp desenlerinin sayısı ve en sık desenler
+  * her sütun silindiğinde tam dolu hale gelecek satır sayısı (kayıp
+    satırları silme yönteminde o sütun yüzünden kaybedilen satırlar);
+    "en az bir" ve "en az iki" kayıp bitleri kelimeler üzerinde biriktirilip
+    popcount ile
+hesaplanır.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+if hasattr(np, "bitwise_count"):
+  _popcount = np.bitwise_count
+else:
+  _byte_counts = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1).astype(np.uint8)
+
+  def _popcount(words: np.ndarray = None):
+    """numpy < 2.0 için bayt tablosu ile popcount."""
+    return _byte_counts[words.view(np.uint8)].reshape(*words.shape, 8).sum(axis=-1)
+
+
+def _pack(mask: np.ndarray = None, n_words: int = None):
+  """Bir mantıksal maskeyi 64 bitlik kelimelere paketler (i. satır,
+  i // 64. kelimenin i % 64. biti).
+  """
+
+  words = np.zeros(n_words, dtype="<u8")
+
+  packed = np.packbits(mask, bitorder="little")
+
+  words.view(np.uint8)[:len(packed)] = packed
+
+  return words
+
+
+class MissingnessBitmap:
+  """
+  Sütunların kayıp hücre maskelerini paketlenmiş bitler olarak tutan sınıf
+
+  """
+
+  def __init__(self, columns: list = None, row_count: int = 0, bits: np.ndarray = None):
+    """
+    Parameters
+    ----------
+    columns : list
+        sütunlar
+    row_count : int
+        satır sayısı
+    bits : np.ndarray
+        (sütun sayısı, ceil(row_count / 64)) boyutlu uint64 maskeler
+    """
+
+    self.columns = list(columns)
+
+    self.row_count = row_count
+
+    self.bits = bits
+
+    self.__rows = None
+
+  @classmethod
+  def from_frame(cls, df: pd.core.frame.DataFrame = None, columns: list = None):
+    """Bir Veri Çerçevesinin kayıp hücre maskelerini sütun sütun paketler.
+
+    Returns
+    -------
+    MissingnessBitmap
+    """
+
+    if columns is None:
+      columns = df.columns.tolist()
+
+    n_words = -(-len(df) // 64)
+
+    bits = np.zeros((len(columns), n_words), dtype="<u8")
+
+    for position, column in enumerate(columns):
+      bits[position] = _pack(df[column].isna().to_numpy(), n_words)
+
+    return cls(columns, len(df), bits)
+
+  @classmethod
+  def from_arrow(cls, source=None, columns: list = None, filters=None):
+    """Parquet/Arrow veri setinin kayıp hücre maskelerini, her seferinde
+    yalnızca bir sütun okuyarak paketler (bkz. arrowio). Kayan noktalı
+    sütunlardaki NaN değerler de kayıp sayılır.
+
+    Returns
+    -------
+    MissingnessBitmap
+    """
+
+    import pyarrow.compute
+
+    from .arrowio import _filter_expression, open_dataset
+
+    dataset = open_dataset(source)
+
+    expression = _filter_expression(filters)
+
+    if columns is None:
+      columns = dataset.schema.names
+
+    row_count = 0
+
+    bits = np.zeros((len(columns), 0), dtype="<u8")
+
+    for position, column in enumerate(columns):
+
+      values = dataset.to_table(columns=[column], filter=expression).column(0)
+      mask = pyarrow.compute.is_null(values, nan_is_null=True).to_numpy(zero_copy_only=False)
+
+      # satır sayısı ilk sütun okunduğunda belli olur
+      if position == 0:
+        row_count = len(mask)
+        bits = np.zeros((len(columns), -(-row_count // 64)), dtype="<u8")
+
+      bits[position] = _pack(mask, bits.shape[1])
+
+    return cls(columns, row_count, bits)
+
+  def mask(self, column: str = None):
+    """Bir sütunun kayıp hücre maskesini açar.
+
+    Returns
+    -------
+    np.ndarray
+        satır sayısı uzunluğunda mantıksal dizi
+    """
+
+    words = self.bits[self.columns.index(column)]
+
+    return np.unpackbits(words.view(np.uint8), count=self.row_count, bitorder="little").astype(bool)
+
+  def missing_counts(self):
+    """Sütun bazında kayıp hücre sayıları.
+
+    Returns
+    -------
+    pd.core.series.Series
+    """
+
+    return pd.Series(_popcount(self.bits).sum(axis=1, dtype=np.int64), index=self.columns)
+
+  def co_missingness(self, normalize: bool = False, max_block_bytes: int = 32 * 2**20):
+    """Her sütun çifti için ikisinin birlikte kayıp olduğu satır sayısı.
+    Köşegen sütunların kayıp hücre sayılarıdır. Hiç kaybı olmayan
+    sütunların satır ve sütunları hesaplanmadan sıfır bırakılır.
+
+    Parameters
+    ----------
+    normalize : bool
+        True ise sayılar yerine Jaccard benzerliği (birlikte kayıp /
+        en az birinde kayıp) dönderilir.
+    max_block_bytes : int
+        ara dizilerin bellek sınırı (bayt)
+
+    Returns
+    -------
+    pd.core.frame.DataFrame
+    """
+
+    counts = self.missing_counts().to_numpy()
+
+    present = np.flatnonzero(counts > 0)
+
+    matrix = np.zeros((len(self.columns), len(self.columns)), dtype=np.int64)
+
+    if len(present):
+
+      bits = self.bits[present]
+
+      # hiçbir sütunda kaybı olmayan 64 satırlık kelimeler katkı vermez
+      bits = bits[:, np.bitwise_or.reduce(bits, axis=0) != 0]
+
+      # bir blokta açılan maske en fazla max_block_bytes yer tutar
+      block = max(1, max_block_bytes // (4 * 64 * len(present)))
+
+      together = np.zeros((len(present), len(present)))
+
+      for start in range(0, bits.shape[1], block):
+        words = np.ascontiguousarray(bits[:, start:start + block])
+        masks = np.unpackbits(words.view(np.uint8), axis=1, bitorder="little").astype(np.float32)
+        # blok başına sayılar 2**24'ten küçük olduğundan float32 çarpım kesindir
+        together += masks @ masks.T
+
+      matrix[np.ix_(present, present)] = np.rint(together).astype(np.int64)
+
+    if normalize:
+      with np.errstate(invalid="ignore", divide="ignore"):
+        union = counts[:, None] + counts[None, :] - matrix
+        matrix = np.where(union > 0, matrix / union, 0.0)
+
+    return pd.DataFrame(matrix, index=self.columns, columns=self.columns)
+
+  def __row_summary(self):
+    """Her satırın kayıp hücre sayısı ve kayıp deseninin 64 bitlik özeti.
+    Özet, kayıp sütunlara atanmış rastgele 64 bitlik sayıların toplamıdır
+    (2**64 modunda); farklı iki desenin aynı özeti alma olasılığı ihmal
+    edilebilir düzeydedir.
+    """
+
+    if self.__rows is not None:
+      return self.__rows
+
+    multipliers = np.random.default_rng(0).integers(1, 2**63, len(self.columns), dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+
+    row_missing = np.zeros(self.row_count, dtype=np.int32)
+
+    hashes = np.zeros(self.row_count, dtype=np.uint64)
+
+    counts = self.missing_counts().to_numpy()
+
+    for position in np.flatnonzero(counts > 0):
+
+      mask = np.unpackbits(self.bits[position].view(np.uint8), count=self.row_count, bitorder="little")
+
+      row_missing += mask
+      hashes += mask.astype(np.uint64) * multipliers[position]
+
+    self.__rows = (row_missing, hashes)
+
+    return self.__rows
+
+  def row_missing_counts(self):
+    """Satır bazında kayıp hücre sayıları.
+
+    Returns
+    -------
+    np.ndarray
+    """
+
+    return self.__row_summary()[0]
+
+  def pattern_count(self):
+    """Satırlardaki farklı kayıp desenlerinin sayısı (tam dolu satırlar da
+    bir desendir).
+    """
+
+    return len(np.unique(self.__row_summary()[1]))
+
+  def patterns(self, top: int = 10):
+    """En sık kayıp desenleri.
+
+    Parameters
+    ----------
+    top : int
+        dönderilecek desen sayısı
+
+    Returns
+    -------
+    pd.core.frame.DataFrame
+        missing_columns (desende kayıp olan sütunlar), count ve share
+    """
+
+    row_missing, hashes = self.__row_summary()
+
+    _, first_rows, counts = np.unique(hashes, return_index=True, return_counts=True)
+
+    order = np.argsort(-counts, kind="stable")[:top]
+
+    rows = first_rows[order]
+
+    # desenin sütunları, desenin ilk görüldüğü satırın bitlerinden okunur
+    missing = (self.bits[:, rows // 64] >> (rows % 64).astype(np.uint64)) & np.uint64(1)
+
+    return pd.DataFrame({"missing_columns": [tuple(self.columns[column] for column in np.flatnonzero(missing[:, position]))
+                                             for position in range(len(rows))],
+                         "missing_cells": row_missing[rows],
+                         "count": counts[order],
+                         "share": counts[order] / max(self.row_count, 1)})
+
+  def drop_impact(self):
+    """Her sütun tek başına silindiğinde kayıp satırları silme yönteminde
+    kurtarılacak satır sayısı: yalnızca o sütunda kaybı olan satırlar.
+
+    Returns
+    -------
+    pd.core.frame.DataFrame
+        sütun bazında missing_count, rows_recovered (kurtarılan satırlar) ve
+        complete_rows_if_dropped (sütun silinince tam dolu satırlar);
+        rows_recovered'a göre azalan sırada
+    """
+
+    # satırda en az bir / en az iki kayıp bitleri
+    at_least_one = np.zeros(self.bits.shape[1], dtype="<u8")
+    at_least_two = np.zeros(self.bits.shape[1], dtype="<u8")
+
+    for words in self.bits:
+      at_least_two |= at_least_one & words
+      at_least_one |= words
+
+    complete_rows = self.row_count - int(_popcount(at_least_one).sum(dtype=np.int64))
+
+    only_one = at_least_one & ~at_least_two
+
+    recovered = _popcount(self.bits & only_one).sum(axis=1, dtype=np.int64)
+
+    impact = pd.DataFrame({"missing_count": self.missing_counts().to_numpy(),
+                           "rows_recovered": recovered,
+                           "complete_rows_if_dropped": complete_rows + recovered},
+                          index=self.columns)
+
+    return impact.sort_values("rows_recovered", ascending=False, kind="stable")
+
+  def nbytes(self):
+    """Paketlenmiş maskelerin bellekteki boyutu (bayt)."""
+
+    return self.bits.nbytes
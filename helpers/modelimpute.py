@@ -0,0 +1,413 @@
+"""
+Model tabanlı, yinelemeli (chained equations) kayıp değer doldurma.
+
+Sütunlar eğitim verisinin ortalama ve standart sapmalarıyla ölçeklenir ve
+kayıp hücreler önce ortalamayla doldurulur. Ardından her turda, kayıp
+hücresi olan her sütun için diğer tüm sayısal sütunlardan o sütunu tahmin
+eden bir model eğitilir ve sütunun kayıp hücreleri modelin tahminiyle
+güncellenir. Turlar, tahminlerdeki en büyük değişim tol ile gözlenen en
+büyük mutlak (ölçeklenmiş) değerin çarpımının altına inene ya da max_iter
+turu tamamlanana kadar sürer (sklearn IterativeImputer ile aynı ölçüt).
+
+Güncelleme yöntemleri (update):
+  * "sequential" (varsayılan) : Gauss-Seidel / MICE. Sütunlar az kayıplıdan
+    çok kayıplıya sırayla eğitilir ve her sütunun tahminleri bir sonraki
+    sütun eğitilmeden yazılır; hızlı ve kararlı yakınsar. Modeller aynı
+    süreçte eğitilir.
+  * "parallel" : Jacobi. Bir turdaki tüm sütun modelleri turun başındaki
+    aynı matristen eğitilir, böylece arka uçlara (bkz. backends)
+    dağıtılabilir ve sonuç arka uçtan bağımsızdır. Güncelleme salınmasın
+    diye sönümlenir: yeni değer = (1 - damping) * eski + damping * tahmin.
+    Süreç havuzu ve paylaşımlı bellek tüm turlar boyunca bir kez açılır.
+
+Hızlandırmalar:
+  * Her model en fazla max_samples dolu satırdan oluşan rastgele bir alt
+    örneklemle eğitilir.
+  * Modeller turlar arasında saklanır; warm_start parametresi olan
+    modeller (ör. SGDRegressor, HistGradientBoostingRegressor,
+    MLPRegressor) bir önceki turun durumundan devam eder.
+  * Her turun sonunda modellerin bir kopyası estimator_sequence içinde
+    saklanır (sklearn'deki imputation_sequence_ gibi). transform bu
+    modelleri tur tur, eğitimdeki sırayla uygular; böylece eğitim verisinde
+    transform, fit_transform ile aynı sonucu verir. Bellek kullanımı tur
+    sayısıyla doğru orantılıdır.
+  * transform veriyi batch_size satırlık parçalar halinde, parçaları arka
+    uçlara dağıtarak doldurur.
+
+Yalnızca sayısal sütunlar doldurulur ve tahmin için kullanılır. Eğitimde
+kayıp hücresi olmayan sütunların test verisindeki kayıp hücreleri eğitim
+ortalamasıyla doldurulur.
+"""
+
+import copy
+
+import numpy as np
+import pandas as pd
+
+from .backends import get_backend, open_session
+
+
+UPDATES = ("sequential", "parallel")
+
+
+def _fit_columns(arrays: dict = None, chunk: list = None):
+  """Bir parça sütun için modelleri eğitir ve kayıp hücreleri tahmin eder.
+
+  chunk, (sütun sırası, model, alt örneklem boyutu, tohum) dörtlülerinden
+  oluşur; (sütun sırası, model, tahminler) üçlüleri dönderilir.
+  """
+
+  values = arrays["values"]
+  missing = arrays["missing"]
+
+  results = []
+
+  for column, estimator, max_samples, seed in chunk:
+
+    others = np.ones(values.shape[1], dtype=bool)
+    others[column] = False
+
+    observed = np.flatnonzero(~missing[:, column])
+
+    if max_samples is not None and len(observed) > max_samples:
+      observed = np.sort(np.random.default_rng(seed).choice(observed, max_samples, replace=False))
+
+    estimator.fit(values[observed][:, others], values[observed, column])
+
+    predictions = estimator.predict(values[missing[:, column]][:, others])
+
+    results.append((column, estimator, predictions))
+
+  return results
+
+
+def _transform_rows(arrays: dict = None, chunk: tuple = None):
+  """Bir satır aralığını her turun modelleriyle, tur tur doldurur."""
+
+  start, stop, columns, estimator_sequence, update, damping = chunk
+
+  values = arrays["values"][start:stop].copy()
+  missing = arrays["missing"][start:stop]
+
+  for estimators in estimator_sequence:
+
+    predictions = []
+
+    for column, estimator in zip(columns, estimators):
+
+      rows = missing[:, column]
+
+      if not rows.any():
+        continue
+
+      others = np.ones(values.shape[1], dtype=bool)
+      others[column] = False
+
+      prediction = estimator.predict(values[rows][:, others])
+
+      # eğitimdeki güncelleme yöntemiyle aynı sırada yazılır
+      if update == "sequential":
+        values[rows, column] = prediction
+      else:
+        predictions.append((column, rows, prediction))
+
+    for column, rows, prediction in predictions:
+      values[rows, column] = (1 - damping) * values[rows, column] + damping * prediction
+
+  return values
+
+
+class ModelImputer:
+  """
+  Her sütunu diğer sütunlardan tahmin eden modellerle, yinelemeli olarak
+  kayıp değer dolduran sınıf
+
+  """
+
+  def __init__(self, estimator=None, max_iter: int = 10, tol: float = 1e-3,
+               max_samples: int = None, random_state: int = 0, backend=None,
+               batch_size: int = 100_000, update: str = "sequential", damping: float = 0.5):
+    """
+    Parameters
+    ----------
+    estimator : sklearn regresyon modeli
+        her sütun için kopyalanacak model. Verilmezse
+        sklearn.linear_model.BayesianRidge.
+    max_iter : int
+        en fazla tur sayısı
+    tol : float
+        turdaki en büyük değişim, tol ile gözlenen en büyük mutlak
+        (ölçeklenmiş) değerin çarpımından küçükse durulur
+    max_samples : int
+        her modelin eğitileceği en fazla dolu satır sayısı. Verilmezse
+        tüm dolu satırlar.
+    random_state : int
+        alt örneklem için tohum
+    backend : str ya da nesne
+        "serial", "process" (varsayılan), "dask" ya da map metodu olan bir
+        arka uç (bkz. backends). transform parçaları ve update="parallel"
+        ise sütun modelleri dağıtılır.
+    batch_size : int
+        transform'da bir parçadaki satır sayısı
+    update : str
+        "sequential" (Gauss-Seidel, varsayılan) ya da "parallel" (sönümlü
+        Jacobi; sütun modelleri arka uçlara dağıtılır)
+    damping : float
+        update="parallel" için (0, 1] aralığında güncelleme katsayısı
+    """
+
+    assert update in UPDATES, "update değeri sequential ya da parallel olmalıdır."
+
+    assert 0 < damping <= 1, "damping değeri (0, 1] aralığında olmalıdır."
+
+    self.estimator = estimator
+
+    self.max_iter = max_iter
+
+    self.tol = tol
+
+    self.max_samples = max_samples
+
+    self.random_state = random_state
+
+    self.backend = backend
+
+    self.batch_size = batch_size
+
+    self.update = update
+
+    self.damping = damping
+
+    # doldurulan ve tahminde kullanılan sayısal sütunlar
+    self.variables = []
+
+    # eğitim ortalamaları ve standart sapmaları (ölçekleme ve ilk doldurma)
+    self.means = None
+
+    self.scales = None
+
+    # modeli olan sütunlar (variables içindeki sıraları) ve son turun modelleri
+    self.columns = []
+
+    self.estimators = []
+
+    # her turun sonundaki modellerin kopyaları; transform bunları sırayla uygular
+    self.estimator_sequence = []
+
+    # her turdaki en büyük değişim
+    self.history = []
+
+    self.n_rounds = 0
+
+  def __new_estimator(self):
+
+    if self.estimator is None:
+      from sklearn.linear_model import BayesianRidge
+      estimator = BayesianRidge()
+    else:
+      from sklearn.base import clone
+      estimator = clone(self.estimator)
+
+    if "warm_start" in estimator.get_params():
+      estimator.set_params(warm_start=True)
+
+    return estimator
+
+  def fit_transform(self, df: pd.core.frame.DataFrame = None, variables: list = None):
+    """Modelleri bir Veri Çerçevesinde (genellikle eğitim verisi) eğitir ve
+    doldurulmuş kopyasını dönderir.
+
+    Parameters
+    ----------
+    df : pd.core.frame.DataFrame
+        eğitim verisi
+    variables : list
+        kullanılacak sayısal sütunlar. Verilmezse tüm sayısal sütunlar.
+
+    Returns
+    -------
+    pd.core.frame.DataFrame
+    """
+
+    if variables is None:
+      variables = df.select_dtypes(include="number").columns.tolist()
+
+    # tamamı kayıp sütunlar ne doldurulabilir ne de tahminde kullanılabilir
+    self.variables = [variable for variable in variables if df[variable].notna().any()]
+
+    assert len(self.variables) > 1, "Model tabanlı doldurma için en az iki dolu sayısal sütun gereklidir."
+
+    values = df.loc[:, self.variables].to_numpy(dtype=np.float64, na_value=np.nan, copy=True)
+
+    missing = np.isnan(values)
+
+    self.means = np.nansum(values, axis=0) / (~missing).sum(axis=0)
+
+    self.scales = np.sqrt(np.nansum((values - self.means) ** 2, axis=0) / (~missing).sum(axis=0))
+    self.scales[self.scales == 0] = 1.0
+
+    values = self.__scale(values, missing)
+
+    # az kayıplı sütunlardan çok kayıplılara doğru
+    counts = missing.sum(axis=0)
+    self.columns = [int(column) for column in np.argsort(counts, kind="stable") if counts[column] > 0]
+    self.estimators = [self.__new_estimator() for _ in self.columns]
+
+    self.estimator_sequence = []
+    self.history = []
+    self.n_rounds = 0
+
+    if not self.columns:
+      return self.__assign(df, values, missing)
+
+    # sklearn IterativeImputer gibi değişim, gözlenen en büyük mutlak değere göre ölçülür
+    threshold = self.tol * np.abs(values[~missing]).max(initial=0.0)
+
+    rng = np.random.default_rng(self.random_state)
+
+    if self.update == "sequential":
+      self.__fit_sequential(values, missing, threshold, rng)
+    else:
+      values = self.__fit_parallel(values, missing, threshold, rng)
+
+    return self.__assign(df, values, missing)
+
+  def __fit_sequential(self, values: np.ndarray = None, missing: np.ndarray = None, threshold: float = None, rng=None):
+    """Gauss-Seidel turları: her sütunun tahminleri bir sonraki sütun
+    eğitilmeden yazılır. values yerinde güncellenir.
+    """
+
+    arrays = {"values": values, "missing": missing}
+
+    for _ in range(self.max_iter):
+
+      seeds = rng.integers(0, 2**32, len(self.columns))
+
+      change = 0.0
+
+      for position, (column, seed) in enumerate(zip(self.columns, seeds)):
+
+        [(_, estimator, predictions)] = _fit_columns(arrays, [(column, self.estimators[position], self.max_samples, seed)])
+
+        rows = missing[:, column]
+
+        change = max(change, np.abs(values[rows, column] - predictions).max(initial=0.0))
+
+        values[rows, column] = predictions
+
+        self.estimators[position] = estimator
+
+      # warm_start'lı modeller sonraki turda yerinde güncellendiği için kopyalanır
+      self.estimator_sequence.append(copy.deepcopy(self.estimators))
+
+      self.n_rounds += 1
+      self.history.append(change)
+
+      if change < threshold:
+        break
+
+  def __fit_parallel(self, values: np.ndarray = None, missing: np.ndarray = None, threshold: float = None, rng=None):
+    """Sönümlü Jacobi turları: sütun modelleri turun başındaki matristen
+    arka uçlarda eğitilir. Havuz tüm turlar boyunca bir kez açılır.
+
+    Returns
+    -------
+    np.ndarray
+        doldurulmuş değerler
+    """
+
+    backend = get_backend(self.backend)
+
+    n_chunks = min(len(self.columns), (getattr(backend, "max_workers", None) or 1) * 4)
+
+    with open_session(backend, {"values": values, "missing": missing}) as session:
+
+      # işçiler oturumun (paylaşımlı bellekteki) dizilerini okur
+      shared = session.arrays["values"]
+
+      for _ in range(self.max_iter):
+
+        seeds = rng.integers(0, 2**32, len(self.columns))
+
+        tasks = list(zip(self.columns, self.estimators, [self.max_samples] * len(self.columns), seeds))
+
+        chunks = [tasks[start::n_chunks] for start in range(n_chunks)]
+
+        results = [result for chunk in session.map(_fit_columns, chunks) for result in chunk]
+
+        change = 0.0
+
+        estimators = dict(zip(self.columns, self.estimators))
+
+        for column, estimator, predictions in results:
+
+          rows = missing[:, column]
+
+          updated = (1 - self.damping) * shared[rows, column] + self.damping * predictions
+
+          change = max(change, np.abs(shared[rows, column] - updated).max(initial=0.0))
+
+          shared[rows, column] = updated
+
+          estimators[column] = estimator
+
+        self.estimators = [estimators[column] for column in self.columns]
+
+        self.estimator_sequence.append(copy.deepcopy(self.estimators))
+
+        self.n_rounds += 1
+        self.history.append(change)
+
+        if change < threshold:
+          break
+
+      # paylaşımlı bellek oturumla birlikte kapanır
+      return np.array(shared)
+
+  def __scale(self, values: np.ndarray = None, missing: np.ndarray = None):
+    """Değerleri ölçekler; kayıp hücreler ortalamaya (0) eşitlenir."""
+
+    values = (values - self.means) / self.scales
+
+    values[missing] = 0.0
+
+    return values
+
+  def __assign(self, df: pd.core.frame.DataFrame = None, values: np.ndarray = None, missing: np.ndarray = None):
+    """Yalnızca kayıp hücresi olan sütunları doldurulmuş değerlerle
+    değiştirerek df'in bir kopyasını dönderir.
+    """
+
+    result = df.copy()
+
+    for position in np.flatnonzero(missing.any(axis=0)):
+      result[self.variables[position]] = values[:, position] * self.scales[position] + self.means[position]
+
+    return result
+
+  def transform(self, df: pd.core.frame.DataFrame = None):
+    """Kayıp hücreleri eğitilmiş modellerle doldurur. Satırlar batch_size
+    boyutlu parçalar halinde, her turun modelleriyle eğitimdeki sırayla
+    güncellenir.
+
+    Returns
+    -------
+    pd.core.frame.DataFrame
+        doldurulmuş kopya
+    """
+
+    values = df.loc[:, self.variables].to_numpy(dtype=np.float64, na_value=np.nan, copy=True)
+
+    missing = np.isnan(values)
+
+    values = self.__scale(values, missing)
+
+    if self.columns and missing.any():
+
+      chunks = [(start, min(start + self.batch_size, len(values)), self.columns, self.estimator_sequence,
+                 self.update, self.damping)
+                for start in range(0, len(values), self.batch_size)]
+
+      values = np.concatenate(get_backend(self.backend).map(_transform_rows, chunks, {"values": values, "missing": missing}))
+
+    return self.__assign(df, values, missing)
@@ -0,0 +1,152 @@
+"""
+Çok sütunlu hızlı mod (en sık değer) hesabı.
+
+Series.mode() her sütun için tüm değer sayımlarını içeren bir tablo kurar
+ve sıralar. Burada her sütun bir kez tamsayı kodlara çevrilir (kategorik
+sütunların kodları doğrudan kullanılır), kodlar np.bincount ile sayılır ve
+en büyük sayı seçilir. Tam sayı değerli, dar aralıklı sayısal sütunlarda
+hash tablosu da kurulmaz; değerin kendisi kod olarak kullanılır. Sütunlar bir iş parçacığı havuzunda aynı anda
+işlenir.
+
+Eşitlik durumunda, Series.mode()[0] ile aynı olarak eşit sıklıktaki
+değerlerin en küçüğü seçilir (kategorik sütunlarda kategori sırasındaki
+ilki). Değerler birbiriyle karşılaştırılamıyorsa (ör. karışık tipler)
+veride ilk görülen değer seçilir. Sonuç bu nedenle satır ya da iş
+parçacığı sırasından bağımsızdır.
+"""
+
+import concurrent.futures
+import os
+
+import numpy as np
+import pandas as pd
+
+
+def _codes(series: pd.core.series.Series = None):
+  """Bir sütunun tamsayı kodlarını (kayıp değerler -1), kodlara karşılık
+  gelen benzersiz değerleri ve kod sırasının değer sırası olup olmadığını
+  dönderir.
+  """
+
+  if isinstance(series.dtype, pd.CategoricalDtype):
+    return series.cat.codes.to_numpy(), series.cat.categories, True
+
+  if isinstance(series.dtype, np.dtype) and series.dtype.kind in "iuf" and len(series) > 0:
+
+    values = series.to_numpy()
+
+    # küçük tamsayı tiplerinde values - low taşmasın diye 64 bite genişletilir
+    if series.dtype.kind in "iu":
+      values = values.astype(np.int64 if series.dtype.kind == "i" else np.uint64, copy=False)
+
+    present = ~np.isnan(values) if series.dtype.kind == "f" else None
+
+    observed = values[present] if present is not None else values
+
+    # tam sayı değerli ve dar aralıklı sayısal sütunlarda değerin kendisi
+    # kod olarak kullanılır; hash tablosu kurulmaz
+    if observed.size and (series.dtype.kind != "f" or np.array_equal(observed, np.floor(observed))):
+
+      low, high = observed.min(), observed.max()
+
+      # tamsayılarda aralık Python tamsayısıyla hesaplanır; int64 sınırlarına
+      # yakın değerlerde high - low taşmaz
+      span = int(high) - int(low) if series.dtype.kind in "iu" else high - low
+
+      if span < 2 * len(values):
+        if present is None:
+          codes = (values - low).astype(np.int64)
+        else:
+          codes = np.full(len(values), -1, dtype=np.int64)
+          codes[present] = (observed - low).astype(np.int64)
+        uniques = (np.arange(int(span) + 1, dtype=values.dtype) + low).astype(series.dtype)
+        return codes, uniques, True
+
+  codes, uniques = pd.factorize(series, sort=False, use_na_sentinel=True)
+
+  return codes, uniques, False
+
+
+def mode_of_codes(codes: np.ndarray = None, uniques=None, ordered: bool = False):
+  """Kodlardan modu ve sıklığını dönderir. Kayıp değer dışında değer yoksa
+  (nan, 0) dönderir.
+
+  Parameters
+  ----------
+  codes : np.ndarray
+      tamsayı kodlar (kayıp değerler -1)
+  uniques : array-like
+      kodlara karşılık gelen değerler
+  ordered : bool
+      True ise küçük kod küçük değer demektir (ör. kategorik kodlar);
+      eşitlikte değerler yeniden sıralanmaz.
+  """
+
+  counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+
+  if counts.size == 0 or counts.max() == 0:
+    return np.nan, 0
+
+  count = counts.max()
+
+  tied = np.flatnonzero(counts == count)
+
+  if len(tied) == 1 or ordered:
+    return uniques[tied[0]], int(count)
+
+  candidates = pd.Index(uniques).take(tied)
+
+  try:
+    return candidates.sort_values()[0], int(count)
+  except TypeError:
+    # karşılaştırılamayan değerler: factorize sırası ilk görülme sırasıdır
+    return candidates[0], int(count)
+
+
+def column_mode(series: pd.core.series.Series = None):
+  """Tek bir sütunun modunu ve sıklığını dönderir."""
+
+  return mode_of_codes(*_codes(series))
+
+
+def column_modes(df: pd.core.frame.DataFrame = None, columns: list = None,
+                 max_workers: int = None, return_counts: bool = False):
+  """Birden fazla sütunun modlarını aynı anda hesaplar.
+
+  Parameters
+  ----------
+  df : pd.core.frame.DataFrame
+      veri seti
+  columns : list
+      modu hesaplanacak sütunlar. Verilmezse tüm sütunlar.
+  max_workers : int
+      iş parçacığı sayısı. Verilmezse işlemci çekirdeği sayısı.
+  return_counts : bool
+      True ise modların sıklıkları da dönderilir.
+
+  Returns
+  -------
+  pd.core.series.Series
+      sütun adıyla indekslenmiş modlar. return_counts True ise "mode" ve
+      "count" sütunlarından oluşan bir pd.core.frame.DataFrame.
+  """
+
+  if columns is None:
+    columns = df.columns.tolist()
+
+  columns = list(columns)
+
+  max_workers = min(max_workers or os.cpu_count() or 1, max(len(columns), 1))
+
+  if max_workers == 1:
+    results = [column_mode(df[column]) for column in columns]
+  else:
+    with concurrent.futures.ThreadPoolExecutor(max_workers) as pool:
+      results = list(pool.map(column_mode, (df[column] for column in columns)))
+
+  modes = pd.Series([mode for mode, _ in results], index=columns, dtype=None if results else object, name="mode")
+
+  if not return_counts:
+    return modes
+
+  return pd.DataFrame({"mode": modes, "count": [count for _, count in results]}, index=columns)
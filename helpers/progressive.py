@@ -0,0 +1,325 @@
+"""
+Parça parça ilerleyen (anytime) profil çıkarma.
+
+Büyük veri setlerinde ProfillingReport istatistikleri tek bir uzun
+hesaplamayı beklemeden, veri parçalar halinde işlendikçe güncellenir.
+Her parça ProfileSnapshot'a eklenir (bkz. snapshot); dağılım ölçüleri,
+kayıp hücre sayıları, korelasyonlar ve histogramlar her parçadan sonra
+okunabilir.
+
+Her parçadan sonra tahminlerin bir önceki parçaya göre değişimi ölçülür:
+  * ortalama ve standart sapma : standart sapma cinsinden
+  * kayıp oranı               : mutlak
+  * histogramlar              : toplam varyasyon uzaklığı
+  * korelasyonlar             : mutlak
+En büyük değişim art arda patience parça boyunca tol'un altında kalırsa
+(ve en az min_rows satır işlendiyse) ya da time_budget saniyesi dolarsa
+durulur. Ayrıca ortalamalar, kayıp oranları ve korelasyonlar için standart
+hatalar raporlanır.
+
+Değişim ölçüleri ve standart hatalar parçaların verinin rastgele
+parçaları olduğunu varsayar. Veri sıralıysa (ör. tarihe göre) parçalar
+karıştırılmalıdır; ProfillingReport.progressive_profile bunu varsayılan
+olarak yapar.
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+
+from .snapshot import ProfileSnapshot
+
+
+class ProgressiveProfile:
+  """
+  Veri parçalar halinde geldikçe güncellenen ve tahminler durulduğunda
+  duran profil
+
+  """
+
+  def __init__(self, continuous_variables: list = None,
+               categorical_variables: list = None,
+               n_bins: int = 20,
+               tol: float = 0.01,
+               patience: int = 2,
+               min_rows: int = 10_000,
+               time_budget: float = None):
+    """
+    Parameters
+    ----------
+    continuous_variables : list
+        sürekli değişkenler. Verilmezse ilk parçadaki sayısal sütunlar.
+    categorical_variables : list
+        kategorik değişkenler. Verilmezse ilk parçadaki diğer sütunlar.
+    n_bins : int
+        histogramlardaki en fazla sepet sayısı
+    tol : float
+        durmak için tahminlerdeki en büyük değişimin üst sınırı
+    patience : int
+        değişimin art arda kaç parça boyunca tol'un altında kalması gerektiği
+    min_rows : int
+        durmadan önce işlenmesi gereken en az satır sayısı
+    time_budget : float
+        saniye cinsinden süre sınırı. Süre dolduğunda işlenmekte olan parça
+        tamamlanır ve durulur.
+    """
+
+    self.continuous_variables = continuous_variables
+
+    self.categorical_variables = categorical_variables
+
+    self.n_bins = n_bins
+
+    self.tol = tol
+
+    self.patience = patience
+
+    self.min_rows = min_rows
+
+    self.time_budget = time_budget
+
+    self.snapshot = None
+
+    # sürekli değişkenler için ilk parçadan çıkarılan iç sınırlar (uçlar -inf / +inf)
+    self.bin_edges = {}
+
+    self.histogram_counts = {}
+
+    # her parçadan sonra satır sayısı, geçen süre ve değişimler
+    self.history = []
+
+    # "converged", "time_budget" ya da "exhausted"
+    self.stop_reason = None
+
+    self.__stable_chunks = 0
+
+  def __start(self, df: pd.core.frame.DataFrame = None):
+    """İlk parça ile değişkenleri, özeti ve histogram sınırlarını kurar."""
+
+    if self.continuous_variables is None:
+      self.continuous_variables = df.select_dtypes(include="number").columns.tolist()
+
+    if self.categorical_variables is None:
+      self.categorical_variables = [column for column in df.columns if column not in self.continuous_variables]
+
+    self.snapshot = ProfileSnapshot(self.continuous_variables, self.categorical_variables)
+
+    if self.continuous_variables:
+
+      quantiles = df.loc[:, self.continuous_variables].quantile(np.linspace(0, 1, self.n_bins + 1)[1:-1])
+
+      for variable in self.continuous_variables:
+        self.bin_edges[variable] = np.unique(quantiles[variable].dropna().to_numpy(dtype=np.float64))
+        self.histogram_counts[variable] = np.zeros(len(self.bin_edges[variable]) + 1, dtype=np.int64)
+
+  def __estimates(self):
+    """Değişimleri ölçülen güncel tahminler."""
+
+    snapshot = self.snapshot
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+      std = np.sqrt(snapshot.m2 / (snapshot.counts - 1))
+
+    return {"mean": snapshot.means.copy(),
+            "std": std,
+            "missing_rate": snapshot.missing_counts / max(snapshot.row_count, 1),
+            "histograms": [counts / max(counts.sum(), 1) for counts in self.histogram_counts.values()],
+            "correlation": snapshot.correlation_matrix().to_numpy()}
+
+  def __changes(self, before: dict = None, after: dict = None):
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+
+      scale = np.where(after["std"] > 0, after["std"], np.nan)
+
+      changes = {"mean_change": np.abs(after["mean"] - before["mean"]) / scale,
+                 "std_change": np.abs(after["std"] - before["std"]) / scale,
+                 "missing_change": np.abs(after["missing_rate"] - before["missing_rate"]),
+                 "histogram_change": np.array([0.5 * np.abs(new - old).sum()
+                                               for new, old in zip(after["histograms"], before["histograms"])]),
+                 "correlation_change": np.abs(after["correlation"] - before["correlation"])}
+
+    # değeri olmayan (ör. tamamı kayıp) ölçüler değişim sayılmaz
+    return {name: float(np.nanmax(change)) if np.isfinite(change).any() else 0.0 for name, change in changes.items()}
+
+  def update(self, df: pd.core.frame.DataFrame = None):
+    """Bir veri parçasını profile ekler.
+
+    Returns
+    -------
+    dict
+        parçadan sonra işlenen satır sayısı ve tahminlerdeki değişimler
+    """
+
+    first = self.snapshot is None
+
+    if first:
+      self.__start(df)
+    else:
+      before = self.__estimates()
+
+    self.snapshot.update(df)
+
+    for variable, edges in self.bin_edges.items():
+      values = df[variable].to_numpy(dtype=np.float64, na_value=np.nan)
+      values = values[~np.isnan(values)]
+      self.histogram_counts[variable] += np.bincount(np.searchsorted(edges, values, side="right"), minlength=len(edges) + 1)
+
+    if first:
+      changes = {"mean_change": np.inf, "std_change": np.inf, "missing_change": np.inf,
+                 "histogram_change": np.inf, "correlation_change": np.inf}
+    else:
+      changes = self.__changes(before, self.__estimates())
+
+    changes["max_change"] = max(changes.values())
+
+    self.__stable_chunks = self.__stable_chunks + 1 if changes["max_change"] < self.tol else 0
+
+    return {"rows": self.snapshot.row_count, **changes}
+
+  def iterate(self, chunks=None):
+    """Parçaları işler ve her parçadan sonra profili verir (generator).
+    Tahminler durulduğunda ya da süre dolduğunda durur; sebep stop_reason
+    niteliğine yazılır.
+
+    Parameters
+    ----------
+    chunks : iterable
+        Veri Çerçevesi parçaları (ör. pd.read_csv(..., chunksize=...))
+
+    Yields
+    ------
+    ProgressiveProfile
+        kendisi
+    """
+
+    start = time.perf_counter()
+
+    self.stop_reason = None
+
+    for chunk in chunks:
+
+      step = self.update(chunk)
+      step["elapsed"] = time.perf_counter() - start
+
+      self.history.append(step)
+
+      yield self
+
+      if self.__stable_chunks >= self.patience and step["rows"] >= self.min_rows:
+        self.stop_reason = "converged"
+        return
+
+      if self.time_budget is not None and step["elapsed"] >= self.time_budget:
+        self.stop_reason = "time_budget"
+        return
+
+    self.stop_reason = "exhausted"
+
+  def run(self, chunks=None, callback=None):
+    """Parçaları durma koşuluna kadar işler.
+
+    Parameters
+    ----------
+    chunks : iterable
+        Veri Çerçevesi parçaları
+    callback : callable
+        her parçadan sonra profil ile çağrılacak fonksiyon (ör. ara
+        sonuçları göstermek için)
+
+    Returns
+    -------
+    ProgressiveProfile
+        kendisi
+    """
+
+    for profile in self.iterate(chunks):
+      if callback is not None:
+        callback(profile)
+
+    return self
+
+  def progress(self):
+    """Her parçadan sonraki satır sayıları, süreler ve değişimler.
+
+    Returns
+    -------
+    pd.core.frame.DataFrame
+    """
+
+    return pd.DataFrame(self.history)
+
+  def dispersion_measures(self):
+    """Sürekli değişkenlerin güncel dağılım ölçüleri (bkz.
+    ProfileSnapshot.dispersion_measures).
+    """
+
+    return self.snapshot.dispersion_measures()
+
+  def missing_values(self):
+    """Sütun bazında güncel kayıp hücre sayıları."""
+
+    return self.snapshot.missing_values()
+
+  def correlation_matrix(self):
+    """Sürekli değişkenlerin güncel korelasyon matrisi."""
+
+    return self.snapshot.correlation_matrix()
+
+  def histograms(self):
+    """Sürekli değişkenlerin güncel histogramları. Sepet sınırları ilk
+    parçanın çeyrekliklerinden çıkarılır; ilk ve son sepet açık uçludur.
+
+    Returns
+    -------
+    dict
+        değişken adından, aralıklarla indekslenmiş sayılara (pd.core.series.Series)
+    """
+
+    return {variable: pd.Series(counts, index=pd.IntervalIndex.from_breaks(np.r_[-np.inf, self.bin_edges[variable], np.inf], closed="left"))
+            for variable, counts in self.histogram_counts.items()}
+
+  def standard_errors(self):
+    """Güncel tahminlerin standart hataları: sürekli değişkenler için
+    ortalamanın, tüm değişkenler için kayıp oranının.
+
+    Returns
+    -------
+    pd.core.frame.DataFrame
+        değişken bazında mean, mean_se, missing_rate ve missing_rate_se
+    """
+
+    snapshot = self.snapshot
+
+    n = max(snapshot.row_count, 1)
+
+    missing_rate = snapshot.missing_counts / n
+
+    errors = pd.DataFrame({"missing_rate": missing_rate,
+                           "missing_rate_se": np.sqrt(missing_rate * (1 - missing_rate) / n)},
+                          index=snapshot.variables)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+      counts = snapshot.counts.astype(np.float64)
+      mean_se = np.sqrt(snapshot.m2 / (counts - 1)) / np.sqrt(counts)
+
+    errors.loc[snapshot.continuous_variables, "mean"] = snapshot.means_of_features().to_numpy()
+    errors.loc[snapshot.continuous_variables, "mean_se"] = mean_se
+
+    return errors.loc[:, ["mean", "mean_se", "missing_rate", "missing_rate_se"]]
+
+  def correlation_standard_errors(self):
+    """Korelasyonların yaklaşık standart hataları, (1 - r**2) / sqrt(n - 3).
+
+    Returns
+    -------
+    pd.core.frame.DataFrame
+    """
+
+    correlation = self.snapshot.correlation_matrix()
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+      errors = (1 - correlation.to_numpy() ** 2) / np.sqrt(self.snapshot.pair_counts - 3)
+
+    return pd.DataFrame(errors, index=correlation.index, columns=correlation.columns)
@@ -0,0 +1,333 @@
+"""
+Hızlı, yaklaşık keşifsel analiz için örnekleme.
+
+ReservoirSampler veriyi parça parça (ör. pd.read_csv(chunksize=...) ya da
+Arrow parçaları) bir kez tarayarak sabit boyutlu, düzgün (uniform) bir
+örneklem tutar. Her satıra rastgele bir anahtar atanır ve en küçük
+anahtarlı satırlar saklanır; bu, tüm akıştan iadesiz basit rastgele
+örneklemeye denktir ve parça boyutlarından bağımsızdır.
+
+by verilirse örneklem o sütunun (ör. hedef ya da kategorik bir değişken)
+katmanlarına göre tabakalıdır (stratified). Her katmandan, katmanın
+satır payı kadar (en az min_per_stratum) satır alınır; küçük katmanlar da
+örneklemde temsil edilir. Akış sırasında her katman için en fazla size
+satır saklanır.
+
+estimates, örneklemden kayıp oranı, ortalama, standart sapma ve medyan
+tahminlerini güven aralıklarıyla dönderir:
+  * ortalama ve kayıp oranı : tabakalı örnekleme varyansı (sonlu
+    popülasyon düzeltmesiyle); ortalama için oran tahmincisinin
+    doğrusallaştırılmış varyansı
+  * medyan                  : Woodruff aralığı (dağılım fonksiyonunun
+    medyandaki güven aralığı ters çevrilerek)
+Örneklem tüm veriyi kapsıyorsa aralıkların genişliği sıfırdır.
+"""
+
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+
+def _stratified_variance(values: np.ndarray = None, strata: np.ndarray = None,
+                         sample_counts: np.ndarray = None, population_counts: np.ndarray = None):
+  """Tabakalı basit rastgele örneklemde sum(N_h * ortalama_h) toplam
+  tahmincisinin varyansı.
+  """
+
+  sums = np.bincount(strata, weights=values, minlength=len(sample_counts))
+  squares = np.bincount(strata, weights=values * values, minlength=len(sample_counts))
+
+  n = sample_counts.astype(np.float64)
+  N = population_counts.astype(np.float64)
+
+  with np.errstate(invalid="ignore", divide="ignore"):
+    variances = np.where(n > 1, (squares - sums ** 2 / n) / (n - 1), 0.0)
+    terms = np.where(n > 0, N ** 2 * (1 - n / N) * variances / n, 0.0)
+
+  return float(np.maximum(terms, 0.0).sum())
+
+
+def _weighted_quantile(values: np.ndarray = None, weights: np.ndarray = None, q: float = None):
+  """Sıralı değerlerin ağırlıklı dağılım fonksiyonunda q'ya ulaşılan ilk
+  değer.
+  """
+
+  cumulative = np.cumsum(weights) / weights.sum()
+
+  return values[min(np.searchsorted(cumulative, np.clip(q, 0.0, 1.0) - 1e-12), len(values) - 1)]
+
+
+class ReservoirSampler:
+  """
+  Akış halindeki veriden düzgün ya da tabakalı sabit boyutlu örneklem
+
+  """
+
+  def __init__(self, size: int = 100_000, by: str = None, min_per_stratum: int = 1, random_state: int = 0):
+    """
+    Parameters
+    ----------
+    size : int
+        örneklemdeki satır sayısı
+    by : str
+        tabakalamada kullanılacak sütun. Verilmezse düzgün örneklem.
+    min_per_stratum : int
+        her katmandan alınacak en az satır sayısı (katmanda o kadar satır
+        varsa)
+    random_state : int
+        rastgele anahtarlar için tohum
+    """
+
+    self.size = size
+
+    self.by = by
+
+    self.min_per_stratum = min_per_stratum
+
+    self.row_count = 0
+
+    # katmanlardaki satır sayıları (kayıp değerler ayrı bir katmandır)
+    self.strata_counts = pd.Series(dtype=np.int64)
+
+    self.__rng = np.random.default_rng(random_state)
+
+    # saklanan satırlar, anahtarları ve akıştaki sıraları
+    self.__rows = None
+
+    self.__keys = np.empty(0)
+
+    self.__positions = np.empty(0, dtype=np.int64)
+
+    self.__selection = None
+
+  @classmethod
+  def from_frame(cls, df: pd.core.frame.DataFrame = None, **kwargs):
+    """Bir Veri Çerçevesinden örneklem oluşturur."""
+
+    return cls(**kwargs).update(df)
+
+  @classmethod
+  def from_chunks(cls, chunks=None, **kwargs):
+    """Veri Çerçevesi parçalarından (ör. pd.read_csv(..., chunksize=...))
+    örneklem oluşturur.
+    """
+
+    sampler = cls(**kwargs)
+
+    for chunk in chunks:
+      sampler.update(chunk)
+
+    return sampler
+
+  def __strata(self, df: pd.core.frame.DataFrame = None):
+
+    return pd.factorize(df[self.by], use_na_sentinel=False)
+
+  def __rank_within(self, codes: np.ndarray = None, keys: np.ndarray = None):
+    """Her satırın kendi katmanındaki anahtar sırası (0'dan başlar)."""
+
+    order = np.lexsort((keys, codes))
+
+    sorted_codes = codes[order]
+
+    starts = np.flatnonzero(np.r_[True, sorted_codes[1:] != sorted_codes[:-1]])
+    lengths = np.diff(np.r_[starts, len(order)])
+
+    ranks = np.empty(len(order), dtype=np.int64)
+    ranks[order] = np.arange(len(order)) - np.repeat(starts, lengths)
+
+    return ranks
+
+  def update(self, df: pd.core.frame.DataFrame = None):
+    """Bir veri parçasını örnekleme ekler.
+
+    Returns
+    -------
+    ReservoirSampler
+        kendisi
+    """
+
+    keys = self.__rng.random(len(df))
+
+    positions = np.arange(self.row_count, self.row_count + len(df), dtype=np.int64)
+
+    self.row_count += len(df)
+
+    self.__selection = None
+
+    if self.by is not None:
+      counts = df[self.by].value_counts(dropna=False)
+      self.strata_counts = self.strata_counts.add(counts, fill_value=0).astype(np.int64)
+
+    # dolu rezervuarın en büyük anahtarından büyük anahtarlı satırlar hiç girmez
+    if self.__rows is not None and len(self.__keys):
+
+      if self.by is None:
+        threshold = self.__keys.max() if len(self.__keys) >= self.size else np.inf
+        candidates = keys < threshold
+      else:
+        kept = pd.Series(self.__keys).groupby(self.__rows[self.by].to_numpy(), dropna=False).agg(["max", "size"])
+        thresholds = kept["max"].where(kept["size"] >= self.size, np.inf)
+        candidates = keys < df[self.by].map(thresholds).fillna(np.inf).to_numpy()
+
+      df, keys, positions = df.iloc[np.flatnonzero(candidates)], keys[candidates], positions[candidates]
+
+      rows = pd.concat([self.__rows, df])
+      keys = np.concatenate([self.__keys, keys])
+      positions = np.concatenate([self.__positions, positions])
+
+    else:
+      rows = df
+
+    if self.by is None:
+      keep = np.argpartition(keys, self.size)[:self.size] if len(keys) > self.size else np.arange(len(keys))
+    else:
+      keep = np.flatnonzero(self.__rank_within(self.__strata(rows)[0], keys) < self.size)
+
+    self.__rows = rows.iloc[keep]
+    self.__keys = keys[keep]
+    self.__positions = positions[keep]
+
+    return self
+
+  def __select(self):
+    """Örneklemdeki satırları (saklananlar içindeki sıraları, akış sırasına
+    göre), katman kodlarını, katmanların örneklem ve popülasyon sayılarını
+    dönderir.
+    """
+
+    if self.__selection is not None:
+      return self.__selection
+
+    if self.__rows is None:
+      self.__selection = (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.zeros(1), np.zeros(1))
+      return self.__selection
+
+    if self.by is None:
+
+      keep = np.argsort(self.__positions, kind="stable")
+      codes = np.zeros(len(keep), dtype=np.int64)
+      sample_counts = np.array([len(keep)])
+      population_counts = np.array([self.row_count])
+
+    else:
+
+      codes, strata = self.__strata(self.__rows)
+
+      population_counts = self.strata_counts.reindex(strata).to_numpy(dtype=np.int64)
+
+      # orantılı dağıtım; küçük katmanlar için en az min_per_stratum satır
+      allocation = np.round(self.size * population_counts / max(self.row_count, 1)).astype(np.int64)
+      allocation = np.minimum(np.maximum(allocation, np.minimum(self.min_per_stratum, population_counts)), population_counts)
+
+      selected = np.flatnonzero(self.__rank_within(codes, self.__keys) < allocation[codes])
+
+      keep = selected[np.argsort(self.__positions[selected], kind="stable")]
+      codes = codes[keep]
+      sample_counts = np.bincount(codes, minlength=len(strata))
+
+    self.__selection = (keep, codes, sample_counts, population_counts)
+
+    return self.__selection
+
+  def sample(self):
+    """Örneklemi, satırların akıştaki sırasıyla dönderir.
+
+    Returns
+    -------
+    pd.core.frame.DataFrame
+    """
+
+    keep = self.__select()[0]
+
+    return self.__rows.iloc[keep] if self.__rows is not None else pd.DataFrame()
+
+  def sample_positions(self):
+    """Örneklem satırlarının akıştaki (ya da from_frame ile verilen Veri
+    Çerçevesindeki) sıraları.
+    """
+
+    return self.__positions[self.__select()[0]]
+
+  def weights(self):
+    """Her örneklem satırının temsil ettiği satır sayısı (N_h / n_h)."""
+
+    _, codes, sample_counts, population_counts = self.__select()
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+      return (population_counts / sample_counts)[codes]
+
+  def estimates(self, columns: list = None, confidence: float = 0.95):
+    """Sayısal sütunlar için güven aralıklı tahminler.
+
+    Parameters
+    ----------
+    columns : list
+        sütunlar. Verilmezse örneklemdeki tüm sayısal sütunlar.
+    confidence : float
+        güven düzeyi
+
+    Returns
+    -------
+    pd.core.frame.DataFrame
+        sütun bazında n, missing_rate, mean, std ve median ile
+        missing_rate, mean ve median için _low / _high sınırları
+    """
+
+    sample = self.sample()
+
+    if columns is None:
+      columns = sample.select_dtypes(include="number").columns.tolist()
+
+    _, strata, sample_counts, population_counts = self.__select()
+
+    weights = self.weights()
+
+    z = NormalDist().inv_cdf((1 + confidence) / 2)
+
+    population = float(population_counts.sum())
+
+    rows = {}
+
+    for column in columns:
+
+      values = sample[column].to_numpy(dtype=np.float64, na_value=np.nan)
+
+      present = ~np.isnan(values)
+
+      row = {"n": int(present.sum())}
+
+      missing_rate = (weights * ~present).sum() / population if population else np.nan
+      spread = z * np.sqrt(_stratified_variance((~present).astype(np.float64), strata, sample_counts, population_counts)) / population if population else np.nan
+
+      row.update(missing_rate=missing_rate, missing_rate_low=max(missing_rate - spread, 0.0), missing_rate_high=min(missing_rate + spread, 1.0))
+
+      if not present.any():
+        rows[column] = row
+        continue
+
+      filled = np.where(present, values, 0.0)
+      represented = (weights * present).sum()
+
+      mean = (weights * filled).sum() / represented
+      deviations = np.where(present, values - mean, 0.0)
+      spread = z * np.sqrt(_stratified_variance(deviations, strata, sample_counts, population_counts)) / represented
+
+      row.update(mean=mean, mean_low=mean - spread, mean_high=mean + spread,
+                 std=np.sqrt((weights * deviations ** 2).sum() / represented))
+
+      order = np.argsort(values[present], kind="stable")
+      sorted_values, sorted_weights = values[present][order], weights[present][order]
+
+      median = _weighted_quantile(sorted_values, sorted_weights, 0.5)
+      below = np.where(present, (values <= median) - 0.5, 0.0)
+      spread = z * np.sqrt(_stratified_variance(below, strata, sample_counts, population_counts)) / represented
+
+      row.update(median=median,
+                 median_low=_weighted_quantile(sorted_values, sorted_weights, 0.5 - spread) if spread else median,
+                 median_high=_weighted_quantile(sorted_values, sorted_weights, 0.5 + spread) if spread else median)
+
+      rows[column] = row
+
+    return pd.DataFrame.from_dict(rows, orient="index")
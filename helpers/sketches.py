@@ -0,0 +1,526 @@
+"""
+Birleştirilebilir (mergeable) özet veri yapıları.
+
+Bu yapılar veriyi bir kez tarayarak sabit boyutlu bir özet tutar. İki
+özet birleştirildiğinde, iki veri parçasının birlikte özetlenmesiyle
+(belgelenen hata sınırları içinde) aynı sonuç elde edilir.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def hash_values(values):
+  """Değerleri 64 bitlik özetlere (hash) çevirir. Kayıp değerler atılır.
+
+  Aynı değer her zaman aynı özeti verir; ancak değerin tipi de hesaba
+  katıldığından (ör. 1 ile 1.0) bir sütunun tipi parçalar arasında
+  değişmemelidir.
+  """
+
+  values = pd.Series(values)
+
+  values = values[values.notna()]
+
+  if isinstance(values.dtype, pd.CategoricalDtype):
+    values = values.astype(values.cat.categories.dtype)
+
+  return pd.util.hash_array(values.to_numpy())
+
+
+def _distinct_counts(values=None):
+  """Değerleri bir kez factorize ederek benzersiz değerleri, bunların
+  özetlerini ve sayılarını dönderir. Kayıp değerler atılır. Özetler yalnızca
+  benzersiz değerler için hesaplandığından tekrar eden değerlerde hızlıdır.
+
+  Returns
+  -------
+  özetler (uint64), sayılar ve benzersiz değerler
+  """
+
+  codes, uniques = pd.factorize(values, use_na_sentinel=True)
+
+  counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+
+  if isinstance(uniques, pd.Categorical):
+    uniques = uniques.astype(uniques.categories.dtype)
+
+  # değerler zaten benzersiz; hash_values'taki gibi önce kategorilere ayırmaya gerek yok
+  hashes = pd.util.hash_array(np.asarray(uniques), categorize=False)
+
+  return hashes, counts, uniques
+
+
+def _bit_length(values: np.ndarray = None):
+  """uint64 dizisindeki her sayının bit uzunluğunu vektörel olarak hesaplar."""
+
+  # x = m * 2**e (0.5 <= m < 1) olduğundan bit uzunluğu e'dir. float64'e
+  # çevirirken 2**k'nın hemen altındaki değerler yukarı yuvarlanabilir; bu
+  # yalnızca ~2**-53 olasılıkla olur ve tahmini etkilemez.
+  _, exponent = np.frexp(values.astype(np.float64))
+
+  return np.minimum(exponent, 64).astype(np.int64)
+
+
+class HyperLogLog:
+  """
+  Yaklaşık farklı değer sayısı (distinct count) için HyperLogLog özeti.
+
+  2**precision adet 1 baytlık yazmaç kullanır. Göreli standart hata
+  yaklaşık 1.04 / sqrt(2**precision) kadardır (precision=14 için ~%0.8).
+  Birleştirme yazmaçların eleman bazında en büyüğü alınarak yapılır ve
+  kayıpsızdır.
+  """
+
+  def __init__(self, precision: int = 14):
+    """
+    Parameters
+    ----------
+    precision : int
+        yazmaç sayısının 2 tabanında logaritması (4-18)
+    """
+
+    assert 4 <= precision <= 18, "precision 4 ile 18 arasında olmalıdır."
+
+    self.precision = precision
+
+    self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+  def update(self, values=None):
+    """Değerleri özete ekler. Kayıp değerler sayılmaz."""
+
+    self.update_hashes(hash_values(values))
+
+    return self
+
+  def update_hashes(self, hashes: np.ndarray = None):
+    """hash_values ile özetlenmiş değerleri özete ekler."""
+
+    if hashes.size == 0:
+      return self
+
+    remaining_bits = 64 - self.precision
+
+    buckets = (hashes >> np.uint64(remaining_bits)).astype(np.intp)
+    rest = hashes & np.uint64((1 << remaining_bits) - 1)
+    ranks = (remaining_bits - _bit_length(rest) + 1).astype(np.uint8)
+
+    np.maximum.at(self.registers, buckets, ranks)
+
+    return self
+
+  def merge(self, other: "HyperLogLog" = None):
+    """Başka bir özeti bu özete ekler."""
+
+    assert self.precision == other.precision, "Yalnızca aynı precision değerine sahip özetler birleştirilebilir."
+
+    np.maximum(self.registers, other.registers, out=self.registers)
+
+    return self
+
+  def estimate(self):
+    """Yaklaşık farklı değer sayısını dönderir."""
+
+    m = self.registers.size
+    alpha = 0.7213 / (1 + 1.079 / m)
+
+    raw = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+
+    zeros = np.count_nonzero(self.registers == 0)
+
+    # küçük sayılarda doğrusal sayım daha doğrudur
+    if raw <= 2.5 * m and zeros > 0:
+      return float(m * np.log(m / zeros))
+
+    return float(raw)
+
+  def to_dict(self):
+
+    return {"precision": self.precision, "registers": self.registers.tolist()}
+
+  @classmethod
+  def from_dict(cls, data: dict = None):
+
+    sketch = cls(data["precision"])
+    sketch.registers = np.asarray(data["registers"], dtype=np.uint8)
+
+    return sketch
+
+
+class QuantileSketch:
+  """
+  Yaklaşık çeyreklikler (quantile) için KLL özeti.
+
+  Değerler ağırlıkları 2**seviye olan sıkıştırıcılarda (compactor) tutulur;
+  dolan bir seviye sıralanıp her iki değerden biri bir üst seviyeye
+  aktarılır. Üst seviyenin kapasitesi k, alt seviyelerinki her adımda 2/3
+  oranında azalır. Tahmin edilen bir çeyrekliğin sıra (rank) hatası
+  yüksek olasılıkla 2 / k değerini aşmaz (k=200 için %1; yani 0.50
+  çeyrekliği için dönen değer gerçek verinin 0.49 - 0.51 çeyreklikleri
+  arasındadır). En küçük ve en büyük değerler kesindir.
+  """
+
+  def __init__(self, k: int = 200, seed: int = None):
+    """
+    Parameters
+    ----------
+    k : int
+        en üst seviyenin kapasitesi (doğruluk / bellek dengesi)
+    seed : int
+        sıkıştırmadaki rastgele seçimler için tohum
+    """
+
+    self.k = k
+
+    self.levels = [np.empty(0)]
+
+    self.count = 0
+
+    self.min = np.nan
+
+    self.max = np.nan
+
+    self.__rng = np.random.default_rng(seed)
+
+  def __capacity(self, level: int = None):
+
+    depth = len(self.levels) - 1 - level
+
+    return max(int(np.ceil(self.k * (2 / 3) ** depth)), 2)
+
+  def __compress(self):
+
+    level = 0
+
+    while level < len(self.levels):
+
+      if self.levels[level].size > self.__capacity(level):
+
+        if level + 1 == len(self.levels):
+          self.levels.append(np.empty(0))
+
+        items = np.sort(self.levels[level])
+        even = items.size - items.size % 2
+        offset = self.__rng.integers(2)
+
+        self.levels[level + 1] = np.concatenate([self.levels[level + 1], items[offset:even:2]])
+        self.levels[level] = items[even:]
+
+      level += 1
+
+  def update(self, values=None):
+    """Değerleri özete ekler. Kayıp değerler atılır."""
+
+    values = np.asarray(values, dtype=np.float64)
+    values = values[~np.isnan(values)]
+
+    if values.size == 0:
+      return self
+
+    self.count += values.size
+    self.min = np.fmin(self.min, values.min())
+    self.max = np.fmax(self.max, values.max())
+
+    self.levels[0] = np.concatenate([self.levels[0], values])
+
+    self.__compress()
+
+    return self
+
+  def merge(self, other: "QuantileSketch" = None):
+    """Başka bir özeti bu özete ekler."""
+
+    while len(self.levels) < len(other.levels):
+      self.levels.append(np.empty(0))
+
+    for level, items in enumerate(other.levels):
+      self.levels[level] = np.concatenate([self.levels[level], items])
+
+    self.count += other.count
+    self.min = np.fmin(self.min, other.min)
+    self.max = np.fmax(self.max, other.max)
+
+    self.__compress()
+
+    return self
+
+  def quantile(self, q=None):
+    """Yaklaşık çeyreklik değer(ler)ini dönderir.
+
+    Parameters
+    ----------
+    q : float ya da list
+        0 ile 1 arasındaki çeyreklik oran(lar)ı
+
+    Returns
+    -------
+    float ya da np.ndarray
+    """
+
+    scalar = np.ndim(q) == 0
+    q = np.atleast_1d(np.asarray(q, dtype=np.float64))
+
+    if self.count == 0:
+      result = np.full(q.shape, np.nan)
+      return result[0] if scalar else result
+
+    items = np.concatenate(self.levels)
+    weights = np.concatenate([np.full(items_at_level.size, 2.0 ** level)
+                              for level, items_at_level in enumerate(self.levels)])
+
+    order = np.argsort(items, kind="stable")
+    items = items[order]
+    cumulative = np.cumsum(weights[order])
+
+    positions = np.searchsorted(cumulative, q * cumulative[-1], side="left")
+    result = items[np.clip(positions, 0, items.size - 1)]
+
+    result = np.where(q <= 0, self.min, np.where(q >= 1, self.max, result))
+
+    return result[0] if scalar else result
+
+  def to_dict(self):
+
+    return {"k": self.k, "count": self.count, "min": float(self.min), "max": float(self.max),
+            "levels": [items.tolist() for items in self.levels]}
+
+  @classmethod
+  def from_dict(cls, data: dict = None):
+
+    sketch = cls(data["k"])
+    sketch.count = data["count"]
+    sketch.min = data["min"]
+    sketch.max = data["max"]
+    sketch.levels = [np.asarray(items, dtype=np.float64) for items in data["levels"]]
+
+    return sketch
+
+
+class SpaceSaving:
+  """
+  En sık görülen değerler (heavy hitters) için Space-Saving özeti.
+
+  En fazla capacity adet değer ve sayacı tutar. Tutulan her değerin sayacı
+  gerçek frekansından küçük olamaz ve en fazla error kadar büyüktür
+  (error <= toplam / capacity). Özet hiç dolmadıysa (farklı değer sayısı
+  capacity'yi aşmadıysa) sayaçlar kesindir. Birleştirme, Agarwal ve
+  diğerlerinin birleştirilebilir özetlerindeki gibi yapılır.
+  """
+
+  def __init__(self, capacity: int = 64):
+    """
+    Parameters
+    ----------
+    capacity : int
+        tutulacak en fazla değer sayısı
+    """
+
+    self.capacity = capacity
+
+    self.total = 0
+
+    # tutulan değerlerin özetleri (hash), sayaçları, hata sınırları ve kendileri
+    self.keys = np.empty(0, dtype=np.uint64)
+    self.counts = np.empty(0, dtype=np.int64)
+    self.errors = np.empty(0, dtype=np.int64)
+    self.values = np.empty(0, dtype=object)
+
+    # özet bir kez dolup değer attıysa sayaçlar artık kesin değildir
+    self.overflowed = False
+
+  def minimum(self):
+    """Özette olmayan bir değerin frekansı için üst sınır."""
+
+    return int(self.counts.min()) if self.counts.size >= self.capacity else 0
+
+  def __combine(self, keys, counts, errors, values, other_minimum, overflowed):
+
+    self_minimum = self.minimum()
+
+    all_keys = np.concatenate([self.keys, keys])
+    unique_keys, first, inverse = np.unique(all_keys, return_index=True, return_inverse=True)
+
+    in_self = np.zeros(unique_keys.size, dtype=bool)
+    in_self[inverse[:self.keys.size]] = True
+    in_other = np.zeros(unique_keys.size, dtype=bool)
+    in_other[inverse[self.keys.size:]] = True
+
+    merged_counts = np.bincount(inverse, weights=np.concatenate([self.counts, counts]), minlength=unique_keys.size)
+    merged_errors = np.bincount(inverse, weights=np.concatenate([self.errors, errors]), minlength=unique_keys.size)
+
+    # bir özette olmayan değer, o özette en fazla o özetin en küçük sayacı kadar görülmüş olabilir
+    merged_counts += np.where(in_self, 0, self_minimum) + np.where(in_other, 0, other_minimum)
+    merged_errors += np.where(in_self, 0, self_minimum) + np.where(in_other, 0, other_minimum)
+
+    merged_values = np.concatenate([self.values, values])[first]
+
+    self.overflowed = self.overflowed or overflowed
+
+    if unique_keys.size > self.capacity:
+      keep = np.argsort(-merged_counts, kind="stable")[:self.capacity]
+      self.overflowed = True
+    else:
+      keep = np.arange(unique_keys.size)
+
+    self.keys = unique_keys[keep]
+    self.counts = merged_counts[keep].astype(np.int64)
+    self.errors = merged_errors[keep].astype(np.int64)
+    self.values = merged_values[keep]
+
+  def update(self, values=None):
+    """Değerleri özete ekler. Kayıp değerler sayılmaz."""
+
+    keys, counts, uniques = _distinct_counts(values)
+
+    return self.update_counts(keys, counts, uniques)
+
+  def update_counts(self, keys: np.ndarray = None, counts: np.ndarray = None, values=None):
+    """Bir veri parçasının kesin sayımlarını özete ekler.
+
+    Parameters
+    ----------
+    keys : np.ndarray
+        değerlerin hash_values ile özetleri
+    counts : np.ndarray
+        her değerin parçadaki sayısı
+    values : array-like
+        değerlerin kendileri (keys ile aynı sırada)
+    """
+
+    if keys.size == 0:
+      return self
+
+    # parçanın kesin sayımı en sık capacity değere indirilir; atılan en büyük
+    # sayaç, bu parça özetinin en küçük sayacı gibi davranır
+    if keys.size > self.capacity:
+      keep = np.argpartition(-counts, self.capacity - 1)[:self.capacity]
+      dropped = np.ones(keys.size, dtype=bool)
+      dropped[keep] = False
+      chunk_minimum = int(counts[dropped].max())
+    else:
+      keep = np.arange(keys.size)
+      chunk_minimum = 0
+
+    self.__combine(keys[keep], counts[keep], np.zeros(keep.size, dtype=np.int64),
+                   np.asarray(values, dtype=object)[keep], chunk_minimum, chunk_minimum > 0)
+
+    self.total += int(counts.sum())
+
+    return self
+
+  def merge(self, other: "SpaceSaving" = None):
+    """Başka bir özeti bu özete ekler."""
+
+    self.__combine(other.keys, other.counts, other.errors, other.values, other.minimum(), other.overflowed)
+
+    self.total += other.total
+
+    return self
+
+  def distinct(self):
+    """Özet hiç dolmadıysa kesin farklı değer sayısını, dolduysa None dönderir."""
+
+    return None if self.overflowed else int(self.keys.size)
+
+  def top(self, k: int = 10):
+    """En sık görülen k değeri dönderir.
+
+    Returns
+    -------
+    pd.core.frame.DataFrame
+        value, count (üst sınır) ve error (sayaçtaki en fazla fazlalık)
+    """
+
+    order = np.argsort(-self.counts, kind="stable")[:k]
+
+    return pd.DataFrame({"value": self.values[order], "count": self.counts[order], "error": self.errors[order]})
+
+  def to_dict(self):
+
+    return {"capacity": self.capacity, "total": self.total, "overflowed": self.overflowed,
+            "keys": [str(key) for key in self.keys], "counts": self.counts.tolist(),
+            "errors": self.errors.tolist(),
+            "values": [value.item() if isinstance(value, np.generic) else value for value in self.values]}
+
+  @classmethod
+  def from_dict(cls, data: dict = None):
+
+    sketch = cls(data["capacity"])
+    sketch.total = data["total"]
+    sketch.overflowed = data["overflowed"]
+    sketch.keys = np.asarray([int(key) for key in data["keys"]], dtype=np.uint64)
+    sketch.counts = np.asarray(data["counts"], dtype=np.int64)
+    sketch.errors = np.asarray(data["errors"], dtype=np.int64)
+    sketch.values = np.asarray(data["values"], dtype=object) if data["values"] else np.empty(0, dtype=object)
+
+    return sketch
+
+
+def cardinality_profile(df: pd.core.frame.DataFrame = None, columns: list = None, precision: int = 14,
+                        capacity: int = 64, top_k: int = 5, chunk_size: int = 1_000_000):
+  """Tüm sütunların farklı değer sayılarını (HyperLogLog) ve en sık
+  değerlerini (Space-Saving) veriyi satır parçaları halinde bir kez
+  tarayarak hesaplar. Her parçada sütun bir kez factorize edilir; yalnızca
+  benzersiz değerler özetlenir (hash) ve iki özet aynı özetleri kullanır.
+
+  Farklı değer sayısı capacity'den küçük olan sütunlarda sayım kesindir;
+  diğerlerinde HyperLogLog tahminidir.
+
+  Parameters
+  ----------
+  df : pd.core.frame.DataFrame
+      veri seti
+  columns : list
+      sütunlar. Verilmezse tüm sütunlar.
+  precision : int
+      HyperLogLog hassasiyeti (göreli hata ~ 1.04 / sqrt(2**precision))
+  capacity : int
+      Space-Saving özetinin tuttuğu en fazla değer sayısı
+  top_k : int
+      her sütun için raporlanacak en sık değer sayısı
+  chunk_size : int
+      tek seferde işlenecek satır sayısı
+
+  Returns
+  -------
+  pd.core.frame.DataFrame
+      her sütun için distinct, exact (sayım kesin mi), missing, top_values
+      ve top_share (en sık değerin dolu değerler içindeki payı)
+  """
+
+  if columns is None:
+    columns = df.columns.tolist()
+
+  distinct_sketches = {column: HyperLogLog(precision) for column in columns}
+  frequent_sketches = {column: SpaceSaving(capacity) for column in columns}
+  missing = dict.fromkeys(columns, 0)
+
+  for start in range(0, max(df.shape[0], 1), chunk_size):
+
+    chunk = df.iloc[start:start + chunk_size]
+
+    for column in columns:
+
+      # HyperLogLog tekrarlardan etkilenmez; yalnızca benzersiz değerler özetlenir
+      hashes, counts, uniques = _distinct_counts(chunk[column])
+
+      missing[column] += int(chunk.shape[0] - counts.sum())
+
+      distinct_sketches[column].update_hashes(hashes)
+      frequent_sketches[column].update_counts(hashes, counts, uniques)
+
+  rows = []
+
+  for column in columns:
+
+    frequent = frequent_sketches[column]
+    exact = frequent.distinct()
+    top = frequent.top(top_k)
+
+    rows.append({"distinct": exact if exact is not None else int(round(distinct_sketches[column].estimate())),
+                 "exact": exact is not None,
+                 "missing": missing[column],
+                 "top_values": top["value"].tolist(),
+                 "top_share": top["count"].iloc[0] / frequent.total if frequent.total else np.nan})
+
+  return pd.DataFrame(rows, index=pd.Index(columns))
@@ -0,0 +1,437 @@
+"""
+ProfillingReport istatistikleri için birleştirilebilir, saklanabilir özet.
+
+Her gün yalnızca yeni gelen veri parçası özetlenip önceki özet ile
+birleştirilir; tüm geçmişin yeniden taranması gerekmez.
+
+Hata sınırları (tüm geçmişin tek seferde hesaplanmasına göre):
+  * satır sayısı, kayıp hücre sayıları, en küçük/en büyük değerler ve
+    kategori frekansları kesindir.
+  * ortalama, standart sapma, çarpıklık, basıklık, kovaryans ve korelasyon
+    kayan nokta yuvarlama hatası dışında kesindir. Kovaryans/korelasyon,
+    pandas'taki gibi ikili (pairwise) dolu satırlar üzerinden hesaplanır.
+  * çeyreklikler (25%, 50%, 75%) QuantileSketch ile hesaplanır; sıra (rank)
+    hatası yüksek olasılıkla 2 / quantile_k değerini aşmaz.
+  * farklı değer sayıları HyperLogLog ile hesaplanır; göreli standart hata
+    yaklaşık 1.04 / sqrt(2**hll_precision) kadardır.
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+
+from .sketches import HyperLogLog, QuantileSketch
+
+
+class ProfileSnapshot:
+  """
+  Bir veri setinin ProfillingReport istatistiklerini tutan birleştirilebilir özet
+
+  """
+
+  def __init__(self, continuous_variables: list = None,
+               categorical_variables: list = None,
+               quantile_k: int = 200,
+               hll_precision: int = 14):
+    """
+    Parameters
+    ----------
+    continuous_variables : list
+        sürekli değişkenler (momentler, çeyreklikler ve kovaryans tutulur)
+    categorical_variables : list
+        kategorik değişkenler (kategori frekansları tutulur)
+    quantile_k : int
+        çeyreklik özetinin doğruluk parametresi
+    hll_precision : int
+        farklı değer sayısı özetinin doğruluk parametresi
+    """
+
+    self.continuous_variables = list(continuous_variables or [])
+
+    self.categorical_variables = list(categorical_variables or [])
+
+    self.variables = self.continuous_variables + [variable for variable in self.categorical_variables
+                                                  if variable not in self.continuous_variables]
+
+    self.quantile_k = quantile_k
+
+    self.hll_precision = hll_precision
+
+    p = len(self.continuous_variables)
+
+    self.row_count = 0
+
+    self.missing_counts = np.zeros(len(self.variables), dtype=np.int64)
+
+    # tek değişkenli momentler (Pébay birleştirme formülleri ile güncellenir)
+    self.counts = np.zeros(p, dtype=np.int64)
+    self.means = np.zeros(p)
+    self.m2 = np.zeros(p)
+    self.m3 = np.zeros(p)
+    self.m4 = np.zeros(p)
+
+    # ikili kovaryans toplamları, sayısal kararlılık için shift kadar kaydırılmış değerler üzerinden
+    self.shift = None
+    self.pair_counts = np.zeros((p, p))
+    self.pair_sums = np.zeros((p, p))
+    self.pair_squares = np.zeros((p, p))
+    self.pair_products = np.zeros((p, p))
+
+    self.quantile_sketches = [QuantileSketch(quantile_k) for _ in range(p)]
+
+    self.distinct_sketches = [HyperLogLog(hll_precision) for _ in self.variables]
+
+    self.category_counts = {variable: {} for variable in self.categorical_variables}
+
+  @classmethod
+  def from_frame(cls, df: pd.core.frame.DataFrame = None,
+                 continuous_variables: list = None,
+                 categorical_variables: list = None,
+                 **kwargs):
+    """Bir Veri Çerçevesinin özetini oluşturur. Değişkenler verilmezse
+    sayısal sütunlar sürekli, diğerleri kategorik kabul edilir.
+    """
+
+    if continuous_variables is None:
+      continuous_variables = df.select_dtypes(include="number").columns.tolist()
+
+    if categorical_variables is None:
+      categorical_variables = [column for column in df.columns if column not in continuous_variables]
+
+    return cls(continuous_variables, categorical_variables, **kwargs).update(df)
+
+  def __batch_moments(self, values: np.ndarray = None):
+    """Bir parçanın sütun bazında sayı, ortalama ve merkezi moment toplamları."""
+
+    present = ~np.isnan(values)
+    counts = present.sum(axis=0)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+      means = np.where(counts > 0, np.nansum(values, axis=0) / counts, 0.0)
+
+    deviations = np.where(present, values - means, 0.0)
+    squares = deviations ** 2
+
+    return counts, means, squares.sum(axis=0), (squares * deviations).sum(axis=0), (squares ** 2).sum(axis=0)
+
+  def __merge_moments(self, counts, means, m2, m3, m4):
+    """Bir parçanın momentlerini mevcut momentlerle birleştirir."""
+
+    n_a, n_b = self.counts.astype(np.float64), counts.astype(np.float64)
+    n = n_a + n_b
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+
+      delta = means - self.means
+
+      new_means = np.where(n > 0, self.means + delta * n_b / n, 0.0)
+
+      new_m2 = self.m2 + m2 + delta ** 2 * n_a * n_b / n
+
+      new_m3 = (self.m3 + m3 + delta ** 3 * n_a * n_b * (n_a - n_b) / n ** 2
+                + 3 * delta * (n_a * m2 - n_b * self.m2) / n)
+
+      new_m4 = (self.m4 + m4 + delta ** 4 * n_a * n_b * (n_a ** 2 - n_a * n_b + n_b ** 2) / n ** 3
+                + 6 * delta ** 2 * (n_a ** 2 * m2 + n_b ** 2 * self.m2) / n ** 2
+                + 4 * delta * (n_a * m3 - n_b * self.m3) / n)
+
+    empty = n == 0
+
+    self.counts = self.counts + counts
+    self.means = new_means
+    self.m2 = np.where(empty, 0.0, new_m2)
+    self.m3 = np.where(empty, 0.0, new_m3)
+    self.m4 = np.where(empty, 0.0, new_m4)
+
+  def __merge_pairs(self, shift, pair_counts, pair_sums, pair_squares, pair_products):
+    """İkili kovaryans toplamlarını, gerekirse kendi shift değerine
+    taşıyarak mevcut toplamlarla birleştirir.
+    """
+
+    if self.shift is None:
+      self.shift = shift
+
+    # (x - b) toplamları (x - a) toplamlarına : x - a = (x - b) + d
+    d = shift - self.shift
+
+    pair_products = (pair_products + d[None, :] * pair_sums + d[:, None] * pair_sums.T
+                     + np.outer(d, d) * pair_counts)
+    pair_squares = pair_squares + 2 * d[:, None] * pair_sums + (d ** 2)[:, None] * pair_counts
+    pair_sums = pair_sums + d[:, None] * pair_counts
+
+    self.pair_counts += pair_counts
+    self.pair_sums += pair_sums
+    self.pair_squares += pair_squares
+    self.pair_products += pair_products
+
+  def update(self, df: pd.core.frame.DataFrame = None):
+    """Yeni bir veri parçasını özete ekler.
+
+    Parameters
+    ----------
+    df : pd.core.frame.DataFrame
+        özetteki değişkenleri içeren yeni veri parçası
+
+    Returns
+    -------
+    ProfileSnapshot
+        güncellenmiş özet (kendisi)
+    """
+
+    self.row_count += df.shape[0]
+
+    self.missing_counts += df.loc[:, self.variables].isna().sum().to_numpy()
+
+    if self.continuous_variables:
+
+      values = df.loc[:, self.continuous_variables].to_numpy(dtype=np.float64)
+
+      self.__merge_moments(*self.__batch_moments(values))
+
+      present = ~np.isnan(values)
+      shift = self.means.copy() if self.shift is None else self.shift
+      shifted = np.where(present, values - shift, 0.0)
+      weights = present.astype(np.float64)
+
+      # S[i, j] : j'nin de dolu olduğu satırlarda (x_i - shift_i) toplamı
+      self.__merge_pairs(shift, weights.T @ weights, shifted.T @ weights,
+                         (shifted ** 2).T @ weights, shifted.T @ shifted)
+
+      for position in range(len(self.continuous_variables)):
+        self.quantile_sketches[position].update(values[:, position])
+
+    for position, variable in enumerate(self.variables):
+      self.distinct_sketches[position].update(df.loc[:, variable])
+
+    for variable in self.categorical_variables:
+      counts = self.category_counts[variable]
+      for category, count in df.loc[:, variable].value_counts(dropna=True).items():
+        counts[category] = counts.get(category, 0) + int(count)
+
+    return self
+
+  def merge(self, other: "ProfileSnapshot" = None):
+    """Aynı değişkenlere sahip başka bir özeti bu özete ekler.
+
+    Assertions
+    ------
+    AssertionError
+        özetlerin değişkenleri farklıysa.
+
+    Returns
+    -------
+    ProfileSnapshot
+        birleştirilmiş özet (kendisi)
+    """
+
+    assert (self.continuous_variables == other.continuous_variables
+            and self.categorical_variables == other.categorical_variables), "Yalnızca aynı değişkenlere sahip özetler birleştirilebilir."
+
+    self.row_count += other.row_count
+
+    self.missing_counts += other.missing_counts
+
+    self.__merge_moments(other.counts, other.means, other.m2, other.m3, other.m4)
+
+    if other.shift is not None:
+      self.__merge_pairs(other.shift, other.pair_counts, other.pair_sums,
+                         other.pair_squares, other.pair_products)
+
+    for sketch, other_sketch in zip(self.quantile_sketches, other.quantile_sketches):
+      sketch.merge(other_sketch)
+
+    for sketch, other_sketch in zip(self.distinct_sketches, other.distinct_sketches):
+      sketch.merge(other_sketch)
+
+    for variable, other_counts in other.category_counts.items():
+      counts = self.category_counts[variable]
+      for category, count in other_counts.items():
+        counts[category] = counts.get(category, 0) + count
+
+    return self
+
+  def missing_values(self):
+    """Sütun bazında kayıp hücre sayısı.
+
+    Returns
+    -------
+    pd.core.series.Series
+    """
+
+    return pd.Series(self.missing_counts, index=self.variables)
+
+  def distinct_counts(self):
+    """Sütun bazında yaklaşık farklı değer sayısı.
+
+    Returns
+    -------
+    pd.core.series.Series
+    """
+
+    return pd.Series([sketch.estimate() for sketch in self.distinct_sketches], index=self.variables)
+
+  def category_frequencies(self, feature: str = None):
+    """Kategorik bir değişkenin kategori frekansları (azalan sırada).
+
+    Returns
+    -------
+    pd.core.series.Series
+    """
+
+    return pd.Series(self.category_counts[feature], dtype=np.int64).sort_values(ascending=False)
+
+  def dispersion_measures(self):
+    """Sürekli değişkenlerin dağılım ölçüleri. Satırlar ProfillingReport'taki
+    dağılım ölçüleri ile aynıdır (count, std, min, 25%, 50%, 75%, max,
+    Skewness, Kurtosis); çarpıklık ve basıklık pandas gibi örneklem
+    düzeltmeli hesaplanır.
+
+    Returns
+    -------
+    pd.core.frame.DataFrame
+        sütunları sürekli değişkenler olan tablo
+    """
+
+    n = self.counts.astype(np.float64)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+
+      std = np.sqrt(self.m2 / (n - 1))
+
+      m2, m3, m4 = self.m2 / n, self.m3 / n, self.m4 / n
+
+      # m2 sıfıra çok yakınsa (sabit sütun) pandas gibi 0 dönderilir
+      constant = self.m2 <= 1e-14 * np.maximum(self.means ** 2, 1) * n
+
+      skewness = np.sqrt(n * (n - 1)) / (n - 2) * m3 / m2 ** 1.5
+      skewness = np.where(n < 3, np.nan, np.where(constant, 0.0, skewness))
+
+      kurtosis = ((n + 1) * (m4 / m2 ** 2 - 3) + 6) * (n - 1) / ((n - 2) * (n - 3))
+      kurtosis = np.where(n < 4, np.nan, np.where(constant, 0.0, kurtosis))
+
+    quartiles = np.array([sketch.quantile([0.25, 0.5, 0.75]) for sketch in self.quantile_sketches]).reshape(-1, 3)
+
+    return pd.DataFrame({"count": n,
+                         "std": std,
+                         "min": [sketch.min for sketch in self.quantile_sketches],
+                         "25%": quartiles[:, 0],
+                         "50%": quartiles[:, 1],
+                         "75%": quartiles[:, 2],
+                         "max": [sketch.max for sketch in self.quantile_sketches],
+                         "Skewness": skewness,
+                         "Kurtosis": kurtosis},
+                        index=self.continuous_variables).T
+
+  def means_of_features(self):
+    """Sürekli değişkenlerin ortalamaları.
+
+    Returns
+    -------
+    pd.core.series.Series
+    """
+
+    return pd.Series(np.where(self.counts > 0, self.means, np.nan), index=self.continuous_variables)
+
+  def covariance_matrix(self):
+    """Sürekli değişkenlerin ikili dolu satırlar üzerinden kovaryans matrisi.
+
+    Returns
+    -------
+    pd.core.frame.DataFrame
+    """
+
+    n = self.pair_counts
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+      covariance = (self.pair_products - self.pair_sums * self.pair_sums.T / n) / (n - 1)
+
+    return pd.DataFrame(covariance, index=self.continuous_variables, columns=self.continuous_variables)
+
+  def correlation_matrix(self):
+    """Sürekli değişkenlerin ikili dolu satırlar üzerinden korelasyon matrisi.
+
+    Returns
+    -------
+    pd.core.frame.DataFrame
+    """
+
+    n = self.pair_counts
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+      centered_products = self.pair_products - self.pair_sums * self.pair_sums.T / n
+      centered_squares = self.pair_squares - self.pair_sums ** 2 / n
+      correlation = centered_products / np.sqrt(centered_squares * centered_squares.T)
+
+    correlation = np.clip(correlation, -1, 1)
+    np.fill_diagonal(correlation, np.where(np.diag(n) > 1, 1.0, np.nan))
+
+    return pd.DataFrame(correlation, index=self.continuous_variables, columns=self.continuous_variables)
+
+  def to_dict(self):
+    """Özeti JSON ile saklanabilir bir sözlüğe çevirir."""
+
+    return {
+      "continuous_variables": self.continuous_variables,
+      "categorical_variables": self.categorical_variables,
+      "quantile_k": self.quantile_k,
+      "hll_precision": self.hll_precision,
+      "row_count": self.row_count,
+      "missing_counts": self.missing_counts.tolist(),
+      "counts": self.counts.tolist(),
+      "means": self.means.tolist(),
+      "m2": self.m2.tolist(),
+      "m3": self.m3.tolist(),
+      "m4": self.m4.tolist(),
+      "shift": None if self.shift is None else self.shift.tolist(),
+      "pair_counts": self.pair_counts.tolist(),
+      "pair_sums": self.pair_sums.tolist(),
+      "pair_squares": self.pair_squares.tolist(),
+      "pair_products": self.pair_products.tolist(),
+      "quantile_sketches": [sketch.to_dict() for sketch in self.quantile_sketches],
+      "distinct_sketches": [sketch.to_dict() for sketch in self.distinct_sketches],
+      # JSON anahtarları metin olduğundan kategoriler [kategori, sayı] çiftleri olarak saklanır
+      "category_counts": {variable: [[category, count] for category, count in counts.items()]
+                          for variable, counts in self.category_counts.items()},
+    }
+
+  @classmethod
+  def from_dict(cls, data: dict = None):
+    """to_dict ile oluşturulmuş sözlükten özeti geri yükler."""
+
+    snapshot = cls(data["continuous_variables"], data["categorical_variables"],
+                   data["quantile_k"], data["hll_precision"])
+
+    snapshot.row_count = data["row_count"]
+    snapshot.missing_counts = np.asarray(data["missing_counts"], dtype=np.int64)
+    snapshot.counts = np.asarray(data["counts"], dtype=np.int64)
+
+    for name in ("means", "m2", "m3", "m4"):
+      setattr(snapshot, name, np.asarray(data[name], dtype=np.float64))
+
+    p = len(snapshot.continuous_variables)
+
+    snapshot.shift = None if data["shift"] is None else np.asarray(data["shift"], dtype=np.float64)
+
+    for name in ("pair_counts", "pair_sums", "pair_squares", "pair_products"):
+      setattr(snapshot, name, np.asarray(data[name], dtype=np.float64).reshape(p, p))
+
+    snapshot.quantile_sketches = [QuantileSketch.from_dict(sketch) for sketch in data["quantile_sketches"]]
+    snapshot.distinct_sketches = [HyperLogLog.from_dict(sketch) for sketch in data["distinct_sketches"]]
+    snapshot.category_counts = {variable: {category: count for category, count in counts}
+                                for variable, counts in data["category_counts"].items()}
+
+    return snapshot
+
+  def save(self, path: str = None):
+    """Özeti JSON dosyası olarak saklar."""
+
+    with open(path, "w") as file:
+      json.dump(self.to_dict(), file)
+
+  @classmethod
+  def load(cls, path: str = None):
+    """save ile saklanmış özeti yükler."""
+
+    with open(path) as file:
+      return cls.from_dict(json.load(file))